@@ -0,0 +1,86 @@
+"""Benchmark the throughput of the API server modes.
+
+Usage::
+
+    python benchmarks/api_throughput.py [clients ...]
+
+For each number of concurrent clients, every client sends requests to a
+small JSON endpoint, reusing its connection when the server keeps it alive.
+The requests per second are printed for the ``threading`` mode, the
+threaded server of Werkzeug that closes the connection after each response,
+and for the ``asyncio`` mode served by AsyncWSGIServer.
+"""
+import sys
+from http.client import HTTPConnection
+from threading import Thread
+from time import perf_counter
+
+from flask import Flask, jsonify
+from werkzeug.serving import make_server
+
+from kytos.core.async_api_server import AsyncWSGIServer
+
+REQUESTS_PER_CLIENT = 500
+
+
+def create_app():
+    """Return an app with an endpoint like /api/kytos/core/status."""
+    app = Flask(__name__)
+    app.add_url_rule('/status', 'status',
+                     lambda: jsonify({'response': 'running'}))
+    return app
+
+
+def start_threading():
+    """Start the threaded server and return its port and stop function."""
+    server = make_server('127.0.0.1', 0, create_app(), threaded=True)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server.server_port, server.shutdown
+
+
+def start_asyncio():
+    """Start the asyncio server and return its port and stop function."""
+    server = AsyncWSGIServer(create_app(), '127.0.0.1', 0)
+    thread = Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.sockets:
+        thread.join(0.01)
+    return server.port, server.stop_threadsafe
+
+
+def client(port):
+    """Send the requests of a client."""
+    connection = HTTPConnection('127.0.0.1', port)
+    for _ in range(REQUESTS_PER_CLIENT):
+        connection.request('GET', '/status')
+        response = connection.getresponse()
+        assert response.status == 200, response.status
+        response.read()
+    connection.close()
+
+
+def run(start, clients):
+    """Return the requests per second of a server mode."""
+    port, stop = start()
+    threads = [Thread(target=client, args=(port,)) for _ in range(clients)]
+    begin = perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - begin
+    stop()
+    return clients * REQUESTS_PER_CLIENT / elapsed
+
+
+def main(sizes):
+    """Print the throughput of both modes for each number of clients."""
+    print(f"{'clients':>8} {'req/s threading':>16} {'req/s asyncio':>14}")
+    for clients in sizes:
+        threaded = run(start_threading, clients)
+        asynchronous = run(start_asyncio, clients)
+        print(f'{clients:>8} {threaded:>16.1f} {asynchronous:>14.1f}')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1, 8, 32])
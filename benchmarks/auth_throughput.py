@@ -0,0 +1,66 @@
+"""Benchmark the throughput of requests to an authenticated endpoint.
+
+Usage::
+
+    python benchmarks/auth_throughput.py [requests]
+
+The same token is sent in every request, as automation clients do. The
+requests per second are printed with the verified token cache and the
+cached JWT secret, and without them, when every request parsed kytos.conf
+and decoded the token.
+"""
+import datetime
+import sys
+from time import perf_counter
+from unittest.mock import patch
+
+from flask import Flask
+
+from kytos.core.auth import Auth, TokenCache, authenticated
+from kytos.core.config import KytosConfig
+
+
+def uncached_jwt_secret():
+    """Return the JWT secret parsing the configuration, as before."""
+    return KytosConfig().options['daemon'].jwt_secret
+
+
+def create_client():
+    """Return a test client of an app with an authenticated endpoint."""
+    app = Flask(__name__)
+    app.add_url_rule('/protected', 'protected',
+                     authenticated(lambda: 'ok'))
+    return app.test_client()
+
+
+def run(client, header, requests):
+    """Return the requests per second."""
+    start = perf_counter()
+    for _ in range(requests):
+        response = client.get('/protected', headers=header)
+        assert response.status_code == 200, response.data
+    return requests / (perf_counter() - start)
+
+
+def main(requests):
+    """Print the throughput with and without caches."""
+    client = create_client()
+    expiration = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+    # pylint: disable=protected-access
+    token = Auth._generate_token('benchmark', expiration).decode()
+    header = {'Authorization': f'Bearer {token}'}
+
+    cached = run(client, header, requests)
+    with patch('kytos.core.auth.TOKEN_CACHE', TokenCache(size=0)), \
+            patch.object(Auth, 'get_jwt_secret', uncached_jwt_secret):
+        uncached = run(client, header, requests)
+
+    print(f"{'requests':>10} {'req/s cached':>14} {'req/s uncached':>16}")
+    print(f'{requests:>10} {cached:>14.1f} {uncached:>16.1f}')
+
+
+if __name__ == '__main__':
+    REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    # The command line is also parsed by KytosConfig
+    del sys.argv[1:]
+    main(REQUESTS)
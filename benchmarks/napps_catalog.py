@@ -0,0 +1,76 @@
+"""Benchmark the REST endpoints of the NApps with the NApp catalog.
+
+Usage::
+
+    python benchmarks/napps_catalog.py [napps ...]
+
+For each number of installed NApps, half of them enabled, the enable,
+metadata and list endpoints of the NApps are requested. The requests per
+second are printed with the catalog of NAppsManager, and with the catalog
+invalidated before every request, so the NApps dir is globbed and every
+kytos.json parsed again, as before the catalog.
+"""
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from unittest.mock import patch
+
+from kytos.core.api_server import APIServer
+from kytos.core.napps import NAppsManager
+
+REQUESTS = 200
+URLS = ('/api/kytos/core/napps/kytos/napp0/enable',
+        '/api/kytos/core/napps/kytos/napp0/metadata/version',
+        '/api/kytos/core/napps_enabled',
+        '/api/kytos/core/napps_installed')
+
+
+def create_napps(path, napps):
+    """Install ``napps`` NApps in ``path`` and enable half of them."""
+    for number in range(napps):
+        name = f'napp{number}'
+        installed = path / '.installed' / 'kytos' / name
+        installed.mkdir(parents=True)
+        meta = {'username': 'kytos', 'name': name, 'version': '1.0',
+                'description': 'Benchmark NApp', 'napp_dependencies': []}
+        (installed / 'kytos.json').write_text(json.dumps(meta))
+        if number % 2 == 0:
+            enabled = path / 'kytos' / name
+            enabled.parent.mkdir(exist_ok=True)
+            enabled.symlink_to(installed)
+
+
+def run(client):
+    """Return the requests per second of the NApps endpoints."""
+    start = perf_counter()
+    for number in range(REQUESTS):
+        response = client.get(URLS[number % len(URLS)])
+        assert response.status_code == 200, response.status_code
+    return REQUESTS / (perf_counter() - start)
+
+
+def main(sizes):
+    """Print the throughput with and without the catalog."""
+    print(f"{'napps':>6} {'req/s catalog':>14} {'req/s uncached':>15}")
+    for napps in sizes:
+        path = Path(tempfile.mkdtemp())
+        try:
+            create_napps(path, napps)
+            manager = NAppsManager(base_path=path)
+            with patch.object(APIServer, 'update_web_ui'):
+                api_server = APIServer('benchmark', napps_manager=manager)
+            api_server.register_core_napp_services()
+            client = api_server.app.test_client()
+            cached = run(client)
+            api_server.app.before_request(manager.invalidate_catalog)
+            uncached = run(client)
+            print(f'{napps:>6} {cached:>14.1f} {uncached:>15.1f}')
+        finally:
+            shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10, 50, 200])
@@ -0,0 +1,91 @@
+"""Benchmark the startup of the controller with many NApps.
+
+Usage::
+
+    python benchmarks/napps_startup.py [napps] [setup_seconds]
+
+NApps are installed and enabled in a temporary NApps dir. Each of them
+sleeps in ``setup``, like NApps that wait for storehouse or for another
+service, and depends on one of the previous NApps, so they form a tree. The
+seconds ``Controller.load_napps`` takes are printed for several
+``napps_load_workers``; 1 loads the NApps one at a time, as before.
+"""
+import asyncio
+import json
+import logging
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from kytos.core import Controller
+from kytos.core.config import KytosConfig
+
+MAIN = '''
+import time
+
+from kytos.core import KytosNApp
+
+
+class Main(KytosNApp):
+
+    def setup(self):
+        time.sleep({seconds})
+
+    def execute(self):
+        pass
+
+    def shutdown(self):
+        pass
+'''
+
+
+def create_napps(path, napps, seconds):
+    """Install and enable ``napps`` NApps in ``path``."""
+    for number in range(napps):
+        name = f'napp{number}'
+        installed = path / '.installed' / 'bench' / name
+        installed.mkdir(parents=True)
+        dependencies = [f'bench/napp{(number - 1) // 3}'] if number else []
+        meta = {'username': 'bench', 'name': name,
+                'napp_dependencies': dependencies}
+        (installed / 'kytos.json').write_text(json.dumps(meta))
+        (installed / 'main.py').write_text(MAIN.format(seconds=seconds))
+        enabled = path / 'bench' / name
+        enabled.parent.mkdir(exist_ok=True)
+        enabled.symlink_to(installed)
+
+
+def run(path, workers):
+    """Return the seconds to load the NApps in ``path``."""
+    options = KytosConfig().options['daemon']
+    options.napps = str(path)
+    options.napps_load_workers = workers
+    controller = Controller(options, loop=asyncio.new_event_loop())
+    controller.log = logging.getLogger('benchmark')
+    start = perf_counter()
+    controller.load_napps()
+    elapsed = perf_counter() - start
+    for napp in controller.napps.values():
+        napp.join()
+    return elapsed
+
+
+def main(napps, seconds):
+    """Print the startup seconds for each number of workers."""
+    logging.disable(logging.WARNING)
+    path = Path(tempfile.mkdtemp())
+    try:
+        create_napps(path, napps, seconds)
+        print(f"{'workers':>8} {'seconds':>8}")
+        for workers in 1, 4, 8, 16:
+            print(f'{workers:>8} {run(path, workers):>8.3f}')
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    ARGS = sys.argv[1:]
+    main(int(ARGS[0]) if ARGS else 30,
+         float(ARGS[1]) if len(ARGS) > 1 else 0.1)
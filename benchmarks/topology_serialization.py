@@ -0,0 +1,92 @@
+"""Benchmark the serialization of a topology, as in a GET topology request.
+
+Usage::
+
+    python benchmarks/topology_serialization.py [switches ...]
+
+For each topology size, a ring of switches with 4 interfaces each is
+serialized to JSON with a cold cache (every entity changed since the last
+request) and with a warm cache (no changes since the last request).
+"""
+import sys
+from functools import partial
+from timeit import repeat
+from unittest.mock import Mock, patch
+
+from pyof.v0x04.common.port import PortFeatures
+
+from kytos.core.interface import Interface
+from kytos.core.link import Link
+from kytos.core.switch import Switch
+
+INTERFACES = 4
+REPEAT = 5
+
+
+# VLAN pools are not serialized and would dominate the setup time
+@patch.object(Interface, 'set_available_tags', Mock())
+def create_topology(size):
+    """Return the switches and links of a ring topology."""
+    switches = []
+    for number in range(size):
+        dpid = '00:00:00:00:00:{:02x}:{:02x}'.format(*divmod(number, 256))
+        switch = Switch(dpid)
+        switch.connection = Mock(address='127.0.0.1', port=number)
+        switch.connection.protocol.version = 0x04
+        for port in range(1, INTERFACES + 1):
+            switch.update_interface(Interface(f's{number}-eth{port}', port,
+                                              switch,
+                                              features=PortFeatures.
+                                              OFPPF_10GB_FD))
+        switches.append(switch)
+    links = []
+    for number, switch in enumerate(switches):
+        neighbor = switches[(number + 1) % size]
+        link = Link(switch.interfaces[1], neighbor.interfaces[2])
+        switch.interfaces[1].update_link(link)
+        links.append(link)
+    return switches, links
+
+
+def topology_json(switches, links):
+    """Return the topology JSON as built by the topology NApp."""
+    switches_json = ', '.join(f'"{switch.id}": {switch.as_json()}'
+                              for switch in switches)
+    links_json = ', '.join(f'"{link.id}": {link.as_json()}'
+                           for link in links)
+    return ('{"topology": {"switches": {' + switches_json +
+            '}, "links": {' + links_json + '}}}')
+
+
+def invalidate(switches, links):
+    """Discard the cached serialization of every entity."""
+    for switch in switches:
+        switch.invalidate_cache()
+    for link in links:
+        link.__dict__.pop('_id', None)
+
+
+def cold_request(switches, links):
+    """Serialize the topology after changing every entity."""
+    invalidate(switches, links)
+    return topology_json(switches, links)
+
+
+def main(sizes):
+    """Print the cold and warm cache latency for each topology size."""
+    print(f"{'switches':>10} {'cold (ms)':>12} {'warm (ms)':>12}")
+    for size in sizes:
+        switches, links = create_topology(size)
+        cold = partial(cold_request, switches, links)
+        warm = partial(topology_json, switches, links)
+        cold_time = min(repeat(cold, number=1, repeat=REPEAT))
+        warm_time = min(repeat(warm, number=1, repeat=REPEAT))
+        print(f'{size:>10} {cold_time * 1000:>12.1f} '
+              f'{warm_time * 1000:>12.1f}')
+
+
+if __name__ == '__main__':
+    SIZES = [int(arg) for arg in sys.argv[1:]] or [500, 5000]
+    # The command line is also parsed by KytosConfig
+    del sys.argv[1:]
+    main(SIZES)
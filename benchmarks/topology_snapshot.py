@@ -0,0 +1,104 @@
+"""Benchmark topology reads from snapshots while a writer churns ports.
+
+Usage::
+
+    python benchmarks/topology_snapshot.py [switches ...]
+
+Reader threads repeatedly take a snapshot of the topology and visit every
+interface of every switch, as a GET topology request would, while a writer
+thread removes and adds interfaces. The number of full topology reads and
+port changes per second are printed for each topology size.
+"""
+import sys
+from threading import Event, Thread
+from time import sleep
+from unittest.mock import Mock, patch
+
+from kytos.core.interface import Interface
+from kytos.core.registry import EntityRegistry
+from kytos.core.switch import Switch
+
+INTERFACES = 4
+READERS = 2
+DURATION = 2
+
+
+# VLAN pools are not read and would dominate the setup time
+@patch.object(Interface, 'set_available_tags', Mock())
+def create_registry(size):
+    """Return a registry with ``size`` switches."""
+    registry = EntityRegistry()
+    for number in range(size):
+        switch = Switch('00:00:00:00:00:00:{:02x}:{:02x}'.format(
+            *divmod(number, 256)))
+        for port in range(1, INTERFACES + 1):
+            switch.update_interface(Interface(f'eth{port}', port, switch))
+        registry.add_switch(switch)
+    return registry
+
+
+def read(registry, stop, counts):
+    """Visit every interface of a snapshot until ``stop`` is set."""
+    while not stop.is_set():
+        snapshot = registry.snapshot
+        for interfaces in snapshot.interfaces.values():
+            for interface in interfaces.values():
+                interface.is_active()
+        counts.append(1)
+
+
+def churn(replacements, stop, counts):
+    """Swap the last port of each switch until ``stop`` is set.
+
+    Interfaces are created beforehand, since creating entities parses the
+    configuration and would dominate the write time.
+    """
+    while not stop.is_set():
+        for index, interface in enumerate(replacements):
+            switch = interface.switch
+            replacements[index] = switch.interfaces[INTERFACES]
+            switch.remove_interface(replacements[index])
+            switch.update_interface(interface)
+            counts.append(1)
+            if stop.is_set():
+                break
+
+
+def run(registry, writer):
+    """Return the reads and writes per second, with or without a writer."""
+    stop = Event()
+    reads, writes = [], []
+    threads = [Thread(target=read, args=(registry, stop, reads))
+               for _ in range(READERS)]
+    if writer:
+        with patch.object(Interface, 'set_available_tags', Mock()):
+            replacements = [Interface('eth', INTERFACES, switch)
+                            for switch in registry.snapshot.switches.values()]
+        threads.append(Thread(target=churn,
+                              args=(replacements, stop, writes)))
+    for thread in threads:
+        thread.start()
+    sleep(DURATION)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return len(reads) / DURATION, len(writes) / DURATION
+
+
+def main(sizes):
+    """Print the read and write throughput for each topology size."""
+    print(f"{'switches':>10} {'reads/s idle':>14} {'reads/s churn':>14} "
+          f"{'writes/s':>10}")
+    for size in sizes:
+        registry = create_registry(size)
+        idle_reads, _ = run(registry, writer=False)
+        churn_reads, writes = run(registry, writer=True)
+        print(f'{size:>10} {idle_reads:>14.1f} {churn_reads:>14.1f} '
+              f'{writes:>10.1f}')
+
+
+if __name__ == '__main__':
+    SIZES = [int(arg) for arg in sys.argv[1:]] or [500, 5000]
+    # The command line is also parsed by KytosConfig
+    del sys.argv[1:]
+    main(SIZES)
@@ -0,0 +1,142 @@
+"""Module with the CPU and wall time used by the listeners of each NApp.
+
+Every listener decorated with :func:`~kytos.core.helpers.listen_to` runs in
+its own thread, so the CPU time of the thread (:func:`time.thread_time`) is
+the CPU time of the listener. :data:`ACCOUNTING` sums it, with the wall
+time, the number of calls and errors and the peak number of concurrent
+calls, for each listener and for each NApp, to find the NApps that keep the
+controller busy without running a profiler.
+"""
+from threading import Lock
+
+__all__ = ('ACCOUNTING', 'ListenerAccounting', 'ListenerStats')
+
+#: Columns that :meth:`ListenerAccounting.top` can sort by.
+SORT_KEYS = ('cpu', 'wall', 'calls', 'errors', 'running', 'peak')
+
+
+class ListenerStats:
+    """Totals of the calls of a listener or of all listeners of a NApp."""
+
+    __slots__ = ('cpu', 'wall', 'calls', 'errors', 'running', 'peak')
+
+    def __init__(self):
+        """Create stats without calls."""
+        #: float: CPU seconds used by the finished calls
+        self.cpu = 0.0
+        #: float: Wall seconds spent by the finished calls
+        self.wall = 0.0
+        #: int: Number of finished calls
+        self.calls = 0
+        #: int: Number of calls that raised an exception
+        self.errors = 0
+        #: int: Number of calls running now
+        self.running = 0
+        #: int: Highest number of calls running at the same time
+        self.peak = 0
+
+    def as_dict(self):
+        """Return the stats as a dictionary."""
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+class ListenerAccounting:
+    """CPU and wall time of each listener and NApp."""
+
+    def __init__(self):
+        """Create an accounting without listeners."""
+        self._lock = Lock()
+        self._listeners = {}
+        self._napps = {}
+
+    def _stats(self, listener, napp):
+        """Return the stats of the listener and of its NApp."""
+        stats = self._listeners.get(listener)
+        if stats is None:
+            stats = self._listeners[listener] = ListenerStats()
+        napp_stats = self._napps.get(napp)
+        if napp_stats is None:
+            napp_stats = self._napps[napp] = ListenerStats()
+        return stats, napp_stats
+
+    def started(self, listener, napp):
+        """Count a call of ``listener`` that started running."""
+        with self._lock:
+            for stats in self._stats(listener, napp):
+                stats.running += 1
+                stats.peak = max(stats.peak, stats.running)
+
+    # pylint: disable=too-many-arguments
+    def finished(self, listener, napp, cpu, wall, error=False):
+        """Add a finished call of ``listener`` to the totals.
+
+        Args:
+            listener (str): Full name of the listener.
+            napp (str): NApp id, or module name for listeners of the core.
+            cpu (float): CPU seconds used by the call.
+            wall (float): Wall seconds spent by the call.
+            error (bool): Whether the call raised an exception.
+        """
+        with self._lock:
+            for stats in self._stats(listener, napp):
+                stats.running -= 1
+                stats.calls += 1
+                stats.errors += error
+                stats.cpu += cpu
+                stats.wall += wall
+
+    def clear(self):
+        """Discard the totals of all listeners."""
+        with self._lock:
+            self._listeners.clear()
+            self._napps.clear()
+
+    def top(self, sort_by='cpu', by_napp=False, limit=None):
+        """Return the listeners or NApps with the highest totals.
+
+        Args:
+            sort_by (str): One of :data:`SORT_KEYS`.
+            by_napp (bool): Whether to return NApps instead of listeners.
+            limit (int): Maximum number of rows returned.
+
+        Returns:
+            list: Dicts with the ``name`` and the totals, highest first.
+
+        Raises:
+            ValueError: If ``sort_by`` is not a valid column.
+
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f'Cannot sort by {sort_by}, use one of '
+                             f'{", ".join(SORT_KEYS)}')
+        with self._lock:
+            rows = [dict(name=name, **stats.as_dict()) for name, stats in
+                    (self._napps if by_napp else self._listeners).items()]
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows[:limit]
+
+
+#: Accounting of the listeners decorated with listen_to.
+ACCOUNTING = ListenerAccounting()
+
+
+def napp_of(module):
+    """Return the NApp id of a module or the module itself.
+
+    NApps are imported as ``napps.<username>.<napp_name>...``.
+    """
+    parts = module.split('.')
+    if parts[0] == 'napps' and len(parts) > 2:
+        return f'{parts[1]}/{parts[2]}'
+    return module
+
+
+def format_top(rows):
+    """Return the rows of :meth:`ListenerAccounting.top` as a text table."""
+    lines = [f"{'cpu s':>10} {'wall s':>10} {'calls':>8} {'errors':>7} "
+             f"{'running':>7} {'peak':>5}  name"]
+    for row in rows:
+        lines.append(f"{row['cpu']:>10.3f} {row['wall']:>10.3f} "
+                     f"{row['calls']:>8} {row['errors']:>7} "
+                     f"{row['running']:>7} {row['peak']:>5}  {row['name']}")
+    return '\n'.join(lines)
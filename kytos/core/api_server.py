@@ -1,4 +1,5 @@
 """Module used to handle a API Server."""
+import gzip
 import json
 import logging
 import os
@@ -6,19 +7,62 @@ import shutil
 import sys
 import warnings
 import zipfile
+import zlib
 from datetime import datetime
-from glob import glob
 from http import HTTPStatus
 from urllib.error import HTTPError, URLError
+from urllib.parse import quote
 from urllib.request import urlopen, urlretrieve
 
-from flask import Blueprint, Flask, jsonify, request, send_file
+from flask import (Blueprint, Flask, Response, abort, g, jsonify, request,
+                   send_file)
 from flask_cors import CORS
 from flask_socketio import SocketIO, join_room, leave_room
 from werkzeug.exceptions import HTTPException
+from werkzeug.http import generate_etag
 
+from kytos.core.async_api_server import (DEFAULT_KEEP_ALIVE_TIMEOUT,
+                                         DEFAULT_MAX_CONCURRENCY,
+                                         AsyncWSGIServer)
 from kytos.core.auth import authenticated
 from kytos.core.config import KytosConfig
+from kytos.core.ui_manifest import UIManifest
+
+#: Minimum size of a response body to compress it, in bytes.
+COMPRESS_MIN_SIZE = 1024
+#: Compression level of gzip and deflate, from 1 (fastest) to 9 (smallest).
+COMPRESS_LEVEL = 6
+#: Mimetypes of the responses that are compressed.
+COMPRESS_MIMETYPES = frozenset(('application/json', 'application/javascript',
+                                'text/css', 'text/csv', 'text/html',
+                                'text/javascript', 'text/plain',
+                                'image/svg+xml'))
+#: Content codings in order of preference and their compress functions.
+_ENCODINGS = (('gzip', gzip.compress), ('deflate', zlib.compress))
+#: Seconds the browsers may use the UI files of the NApps without asking.
+UI_CACHE_MAX_AGE = 60
+#: Values of the ``api_server_mode`` option.
+API_SERVER_MODES = ('threading', 'asyncio')
+
+
+def conditional(etag):
+    """Answer 304 (Not Modified) if the client has the current ``etag``.
+
+    Call it in an endpoint before building the response, with a tag made
+    from the version counters of the resource, so an unchanged resource is
+    not serialized again. The tag is also the ETag of the response returned
+    by the endpoint, instead of a hash of its content.
+
+    Raises:
+        werkzeug.exceptions.HTTPException: With the 304 response, if the
+            ``If-None-Match`` header of the request has ``etag``.
+
+    """
+    g.etag = etag
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=HTTPStatus.NOT_MODIFIED.value)
+        response.set_etag(etag, weak=True)
+        abort(response)
 
 
 class APIServer:
@@ -31,7 +75,9 @@ class APIServer:
 
     # pylint: disable=too-many-arguments
     def __init__(self, app_name, listen='0.0.0.0', port=8181,
-                 napps_manager=None, napps_dir=None):
+                 napps_manager=None, napps_dir=None, mode='threading',
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 keep_alive_timeout=DEFAULT_KEEP_ALIVE_TIMEOUT):
         """Start a Flask+SocketIO server.
 
         Require controller to get NApps dir and NAppsManager
@@ -41,19 +87,41 @@ class APIServer:
             listen (string): host name used by api server instance
             port (int): Port number used by api server instance
             controller(kytos.core.controller): A controller instance.
+            mode (str): ``threading`` to serve with the threaded server of
+                Werkzeug or ``asyncio`` to serve with
+                :class:`~kytos.core.async_api_server.AsyncWSGIServer`.
+            max_concurrency (int): Maximum number of requests handled at the
+                same time in ``asyncio`` mode.
+            keep_alive_timeout (float): Seconds an idle connection is kept
+                open in ``asyncio`` mode.
+
+        Raises:
+            ValueError: If ``mode`` is neither ``threading`` nor ``asyncio``.
         """
+        if mode not in API_SERVER_MODES:
+            raise ValueError(f'Invalid API server mode {mode!r}, expected one '
+                             f'of {", ".join(API_SERVER_MODES)}')
         dirname = os.path.dirname(os.path.abspath(__file__))
         self.napps_manager = napps_manager
         self.napps_dir = napps_dir
+        #: UIManifest: UI components and files of the NApps.
+        self.ui_manifest = UIManifest(napps_dir)
 
         self.flask_dir = os.path.join(dirname, '../web-ui')
         self.log = logging.getLogger(__name__)
 
         self.listen = listen
         self.port = port
-
+        self.mode = mode
+        self.max_concurrency = max_concurrency
+        self.keep_alive_timeout = keep_alive_timeout
         self.app = Flask(app_name, root_path=self.flask_dir,
                          static_folder="dist", static_url_path="/dist")
+        #: AsyncWSGIServer: Server of ``asyncio`` mode, ``None`` otherwise.
+        self.async_server = None
+        if mode == 'asyncio':
+            self.async_server = AsyncWSGIServer(
+                self.app, listen, port, max_concurrency, keep_alive_timeout)
         self.server = SocketIO(self.app, async_mode='threading')
         self._enable_websocket_rooms()
         # ENABLE CROSS ORIGIN RESOURCE SHARING
@@ -62,6 +130,8 @@ class APIServer:
         # Disable trailing slash
         self.app.url_map.strict_slashes = False
 
+        self.app.after_request(self._finish_response)
+
         # Update web-ui if necessary
         self.update_web_ui(force=False)
 
@@ -81,15 +151,52 @@ class APIServer:
             })
             return response, exception.code
 
+    @staticmethod
+    def _finish_response(response):
+        """Tag GET responses, answer 304 if unchanged and compress them.
+
+        Applies to the endpoints of the core and of the NApps. Files sent
+        with ``send_file`` and streamed responses are left untouched.
+        """
+        if response.direct_passthrough or response.is_streamed:
+            return response
+        if request.method in ('GET', 'HEAD') and \
+                response.status_code == HTTPStatus.OK.value:
+            if 'etag' in g:
+                response.set_etag(g.etag, weak=True)
+            elif 'ETag' not in response.headers:
+                response.set_etag(generate_etag(response.get_data()),
+                                  weak=True)
+            response.make_conditional(request)
+        if response.status_code in (HTTPStatus.NO_CONTENT.value,
+                                    HTTPStatus.NOT_MODIFIED.value) or \
+                response.status_code < HTTPStatus.OK.value or \
+                'Content-Encoding' in response.headers or \
+                response.mimetype not in COMPRESS_MIMETYPES:
+            return response
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.vary.add('Accept-Encoding')
+        for encoding, compress in _ENCODINGS:
+            if request.accept_encodings[encoding]:
+                response.set_data(compress(data, COMPRESS_LEVEL))
+                response.headers['Content-Encoding'] = encoding
+                break
+        return response
+
     def _enable_websocket_rooms(self):
         socket = self.server
         socket.on_event('join', join_room)
         socket.on_event('leave', leave_room)
 
     def run(self):
-        """Run the Flask API Server."""
+        """Run the Flask API Server until it is stopped."""
         try:
-            self.server.run(self.app, self.listen, self.port)
+            if self.async_server is not None:
+                self.async_server.run()
+            else:
+                self.server.run(self.app, self.listen, self.port)
         except OSError as exception:
             msg = "Couldn't start API Server: {}".format(exception)
             self.log.critical(msg)
@@ -122,6 +229,7 @@ class APIServer:
 
         self.register_core_napp_services()
 
+        self.ui_manifest.scan()
         self._register_web_ui()
 
     def register_core_endpoint(self, rule, function, **options):
@@ -148,7 +256,14 @@ class APIServer:
         return '{"response": "running"}', HTTPStatus.OK.value
 
     def stop_api_server(self):
-        """Send a shutdown request to stop API Server."""
+        """Stop the API Server.
+
+        In ``asyncio`` mode the server is stopped directly. Otherwise, a
+        shutdown request is sent to the server.
+        """
+        if self.async_server is not None:
+            self.async_server.stop_threadsafe()
+            return
         try:
             url = f'http://127.0.0.1:{self.port}/api/kytos/core/_shutdown'
             urlopen(url)
@@ -171,11 +286,24 @@ class APIServer:
         return 'API Server shutting down...', HTTPStatus.OK.value
 
     def static_web_ui(self, username, napp_name, filename):
-        """Serve static files from installed napps."""
-        path = f"{self.napps_dir}/{username}/{napp_name}/ui/{filename}"
-        if os.path.exists(path):
-            return send_file(path)
-        return "", HTTPStatus.NOT_FOUND.value
+        """Serve static files from installed napps.
+
+        The files are found in :attr:`ui_manifest` and the small ones are
+        served from memory. Responses have a precomputed ETag and may be
+        cached by the browsers for :data:`UI_CACHE_MAX_AGE` seconds.
+        """
+        static = self.ui_manifest.get_file(username, napp_name, filename)
+        if static is None:
+            return "", HTTPStatus.NOT_FOUND.value
+        if static.data is None:
+            response = send_file(static.path, static.mimetype,
+                                 add_etags=False)
+        else:
+            response = Response(static.data, mimetype=static.mimetype)
+        response.set_etag(static.etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = UI_CACHE_MAX_AGE
+        return response.make_conditional(request)
 
     def get_ui_components(self, section_name):
         """Return all napps ui components from an specific section.
@@ -190,18 +318,9 @@ class APIServer:
             str: Json with a list of all components found.
 
         """
-        section_name = '*' if section_name == "all" else section_name
-        path = f"{self.napps_dir}/*/*/ui/{section_name}/*.kytos"
-        components = []
-        for name in glob(path):
-            dirs_name = name.split('/')
-            dirs_name.remove('ui')
-
-            component_name = '-'.join(dirs_name[-4:]).replace('.kytos', '')
-            url = f'ui/{"/".join(dirs_name[-4:])}'
-            component = {'name': component_name, 'url': url}
-            components.append(component)
-        return jsonify(components)
+        conditional(f'ui-{self.ui_manifest.version}-'
+                    f'{quote(section_name, safe="/")}')
+        return jsonify(self.ui_manifest.get_components(section_name))
 
     def web_ui(self):
         """Serve the index.html page for the admin-ui."""
@@ -0,0 +1,427 @@
+"""Module with an asyncio HTTP/1.1 server for the Flask app of the API.
+
+The default API server is the threaded development server of Werkzeug,
+which starts a thread for each connection and closes the connection after
+each response. :class:`AsyncWSGIServer` accepts and parses the requests in
+an asyncio loop instead, keeps the connections alive between requests and
+runs the WSGI app in a bounded pool of threads, so the existing ``@rest``
+endpoints work unchanged while the number of requests handled at the same
+time is limited. It is stopped by calling :meth:`AsyncWSGIServer.stop`,
+without an HTTP request to itself.
+
+WebSockets are not served by this server, so the Socket.IO clients fall
+back to long polling.
+"""
+import asyncio
+import errno
+import io
+import logging
+import socket
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http import HTTPStatus
+from urllib.parse import unquote_to_bytes
+
+__all__ = ('AsyncWSGIServer',)
+
+#: Maximum number of requests handled by the WSGI app at the same time.
+DEFAULT_MAX_CONCURRENCY = 64
+#: Seconds an idle connection is kept open waiting for the next request.
+DEFAULT_KEEP_ALIVE_TIMEOUT = 15
+#: Maximum size of the request line and headers, in bytes.
+MAX_HEADER_SIZE = 64 * 1024
+#: Maximum size of a request body, in bytes.
+MAX_BODY_SIZE = 64 * 1024 * 1024
+#: Seconds :meth:`AsyncWSGIServer.stop_threadsafe` waits for the server.
+DEFAULT_STOP_TIMEOUT = 10
+#: Seconds to wait before accepting again when out of file descriptors.
+ACCEPT_RETRY_DELAY = 1
+#: Errors of ``accept`` that persist until connections are closed.
+_ACCEPT_RESOURCE_ERRORS = (errno.EMFILE, errno.ENFILE, errno.ENOBUFS,
+                           errno.ENOMEM)
+
+LOG = logging.getLogger(__name__)
+
+
+class HTTPError(Exception):
+    """Request that cannot be handled. The connection is closed."""
+
+    def __init__(self, status):
+        """Store the HTTP status answered to the client."""
+        super().__init__(status.phrase)
+        self.status = status
+
+
+class AsyncWSGIServer:
+    """HTTP/1.1 server that runs a WSGI app from an asyncio loop."""
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, app, host='0.0.0.0', port=8181,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 keep_alive_timeout=DEFAULT_KEEP_ALIVE_TIMEOUT):
+        """Create a server that is started by :meth:`start`.
+
+        Args:
+            app: WSGI app, like a :class:`flask.Flask` instance.
+            host (str): Address to listen on.
+            port (int): Port to listen on. Use 0 for any free port.
+            max_concurrency (int): Maximum number of requests handled by the
+                app at the same time. Other requests wait for their turn.
+            keep_alive_timeout (float): Seconds an idle connection is kept.
+        """
+        self.app = app
+        self.host = host
+        self.port = port
+        self.max_concurrency = max_concurrency
+        self.keep_alive_timeout = keep_alive_timeout
+        self._loop = None
+        self._socket = None
+        self._accepting = None
+        self._stopped = None
+        self._semaphore = None
+        self._executor = None
+        self._connections = set()
+        self._closing = False
+        self._closing_lock = threading.Lock()
+
+    @property
+    def sockets(self):
+        """Return the listening sockets, after the server is started."""
+        return [self._socket] if self._socket else []
+
+    async def start(self):
+        """Start listening for connections in the running loop."""
+        self._loop = asyncio.get_event_loop()
+        self._stopped = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix='api_server')
+        self._socket = listen(self.host, self.port)
+        self.port = self._socket.getsockname()[1]
+        self._accepting = self._loop.create_task(self._accept())
+        LOG.info('API Server listening on %s:%s', self.host, self.port)
+
+    async def serve_until_stopped(self):
+        """Wait until :meth:`stop` is called."""
+        await self._stopped.wait()
+
+    def run(self):
+        """Run the server in a new loop until :meth:`stop` is called.
+
+        If :meth:`stop_threadsafe` was called before, return at once.
+        """
+        loop = asyncio.new_event_loop()
+        with self._closing_lock:
+            if self._closing:
+                loop.close()
+                return
+            self._loop = loop
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.start())
+            loop.run_until_complete(self.serve_until_stopped())
+            # Let the closed connections release their sockets
+            loop.run_until_complete(asyncio.sleep(0))
+        finally:
+            loop.close()
+
+    async def stop(self):
+        """Stop listening, close the connections and wake up the server."""
+        if self._socket is None:
+            return
+        self._accepting.cancel()
+        await asyncio.gather(self._accepting, return_exceptions=True)
+        self._socket.close()
+        self._socket = None
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        self._executor.shutdown(wait=False)
+        self._stopped.set()
+        LOG.info('API Server stopped')
+
+    def stop_threadsafe(self, timeout=DEFAULT_STOP_TIMEOUT):
+        """Stop the server from a thread other than the one of its loop.
+
+        A server that is not running yet will not start when :meth:`run` is
+        called.
+
+        Args:
+            timeout (float): Seconds to wait for the server to stop.
+
+        Returns:
+            bool: Whether the server was running and has stopped.
+
+        """
+        with self._closing_lock:
+            self._closing = True
+            loop = self._loop
+        if loop is None or loop.is_closed():
+            return False
+        future = asyncio.run_coroutine_threadsafe(self.stop(), loop)
+        try:
+            future.result(timeout)
+        except FutureTimeoutError:
+            LOG.warning('API Server did not stop in %s seconds', timeout)
+            return False
+        return True
+
+    async def _accept(self):
+        """Accept connections and start a task to answer each of them.
+
+        The streams are opened before the next connection is accepted, so
+        every open connection has a task in ``_connections`` when the
+        server is stopped. Errors are logged and the server keeps accepting,
+        after :data:`ACCEPT_RETRY_DELAY` if it is out of file descriptors.
+        """
+        while True:
+            try:
+                conn, _ = await self._loop.sock_accept(self._socket)
+            except OSError as error:
+                LOG.warning('Error accepting a connection: %s', error)
+                if error.errno in _ACCEPT_RESOURCE_ERRORS:
+                    await asyncio.sleep(ACCEPT_RETRY_DELAY)
+                continue
+            try:
+                reader, writer = await asyncio.open_connection(
+                    sock=conn, limit=MAX_HEADER_SIZE)
+            except OSError as error:
+                LOG.warning('Error opening a connection: %s', error)
+                conn.close()
+                continue
+            task = self._loop.create_task(
+                self._handle_connection(reader, writer))
+            self._connections.add(task)
+            task.add_done_callback(self._connections.discard)
+            task.add_done_callback(lambda _, writer=writer: writer.close())
+
+    async def _handle_connection(self, reader, writer):
+        """Answer the requests of a connection until it is closed."""
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b'\r\n\r\n'), self.keep_alive_timeout)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError,
+                        ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._write_error(
+                        writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+                    break
+                try:
+                    keep_alive = await self._handle_request(head, reader,
+                                                            writer)
+                except HTTPError as error:
+                    await self._write_error(writer, error.status)
+                    break
+                except Exception:  # pylint: disable=broad-except
+                    LOG.exception('Error answering a request')
+                    await self._write_error(
+                        writer, HTTPStatus.INTERNAL_SERVER_ERROR)
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    # pylint: disable=too-many-locals
+    async def _handle_request(self, head, reader, writer):
+        """Answer a request and return whether to keep the connection."""
+        method, target, version, headers = parse_head(head)
+        if headers.get('EXPECT', '').lower() == '100-continue':
+            writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+        body = await read_body(reader, headers)
+        environ = self._environ(method, target, version, headers, body,
+                                writer.get_extra_info('peername'))
+
+        async with self._semaphore:
+            status, response_headers, content = \
+                await self._loop.run_in_executor(self._executor,
+                                                 call_app, self.app, environ)
+
+        connection = headers.get('CONNECTION', '').lower()
+        if version == 'HTTP/1.1':
+            keep_alive = connection != 'close'
+        else:
+            keep_alive = connection == 'keep-alive'
+        names = {name.lower(): value for name, value in response_headers}
+        if 'content-length' not in names:
+            response_headers.append(('Content-Length', str(len(content))))
+        if 'connection' in names:
+            keep_alive = keep_alive and names['connection'].lower() != 'close'
+        else:
+            response_headers.append(
+                ('Connection', 'keep-alive' if keep_alive else 'close'))
+
+        lines = [f'HTTP/1.1 {status}']
+        lines.extend(f'{name}: {value}' for name, value in response_headers)
+        head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+        # A single write, so the body is not delayed by Nagle's algorithm
+        writer.write(head if method == 'HEAD' else head + content)
+        await writer.drain()
+        return keep_alive
+
+    def _environ(self, method, target, version, headers, body, peer):
+        """Return the WSGI environ of a request."""
+        path, _, query = target.partition('?')
+        environ = {
+            'REQUEST_METHOD': method,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': unquote_to_bytes(path).decode('latin-1'),
+            'QUERY_STRING': query,
+            'SERVER_NAME': self.host,
+            'SERVER_PORT': str(self.port),
+            'SERVER_PROTOCOL': version,
+            'REMOTE_ADDR': peer[0] if peer else '',
+            'REMOTE_PORT': str(peer[1]) if peer else '',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in headers.items():
+            key = name.replace('-', '_')
+            if key == 'CONTENT_TYPE':
+                environ[key] = value
+            elif key not in ('CONTENT_LENGTH', 'TRANSFER_ENCODING'):
+                environ['HTTP_' + key] = value
+        return environ
+
+    @staticmethod
+    async def _write_error(writer, status):
+        """Answer an error and close the connection."""
+        body = status.phrase.encode()
+        writer.write(f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+                     f'Content-Type: text/plain\r\n'
+                     f'Content-Length: {len(body)}\r\n'
+                     f'Connection: close\r\n\r\n'.encode() + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+def parse_head(head):
+    """Return the method, target, version and headers of a request.
+
+    Header names are upper case and repeated headers are joined by commas.
+
+    Raises:
+        HTTPError: If the request line or a header is malformed.
+
+    """
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST) from None
+    if version not in ('HTTP/1.0', 'HTTP/1.1'):
+        raise HTTPError(HTTPStatus.HTTP_VERSION_NOT_SUPPORTED)
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, separator, value = line.partition(':')
+        if not separator or not name or name != name.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST) from None
+        name = name.upper()
+        value = value.strip()
+        headers[name] = f'{headers[name]},{value}' if name in headers \
+            else value
+    return method, target, version, headers
+
+
+async def read_body(reader, headers):
+    """Return the body of a request, sized or chunked.
+
+    Requests with both ``Content-Length`` and ``Transfer-Encoding``, or
+    with a transfer coding other than ``chunked``, are rejected, so a proxy
+    in front of the server cannot read a different body than the server.
+
+    Raises:
+        HTTPError: If the body is too large or its framing is invalid.
+
+    """
+    encoding = headers.get('TRANSFER-ENCODING')
+    if encoding is not None:
+        if 'CONTENT-LENGTH' in headers:
+            raise HTTPError(HTTPStatus.BAD_REQUEST)
+        if encoding.strip().lower() != 'chunked':
+            raise HTTPError(HTTPStatus.NOT_IMPLEMENTED)
+        body = bytearray()
+        while True:
+            line = await reader.readuntil(b'\r\n')
+            try:
+                size = int(line.split(b';')[0], 16)
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST) from None
+            if size == 0:
+                # Trailer headers are ignored
+                while await reader.readuntil(b'\r\n') != b'\r\n':
+                    pass
+                return bytes(body)
+            if len(body) + size > MAX_BODY_SIZE:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+    length = headers.get('CONTENT-LENGTH', '0')
+    # Only digits, so "+1", "1_0" and repeated values joined by commas fail
+    if not length.isdigit():
+        raise HTTPError(HTTPStatus.BAD_REQUEST)
+    try:
+        length = int(length)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST) from None
+    if length > MAX_BODY_SIZE:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    return await reader.readexactly(length) if length else b''
+
+
+def listen(host, port, backlog=128):
+    """Return a non-blocking socket listening on ``host`` and ``port``.
+
+    ``socket.create_server`` does the same from Python 3.8.
+    """
+    family, kind, proto, _, address = socket.getaddrinfo(
+        host, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE)[0]
+    sock = socket.socket(family, kind, proto)
+    try:
+        if hasattr(socket, 'SO_REUSEADDR') and sys.platform != 'win32':
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(address)
+        sock.listen(backlog)
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def call_app(app, environ):
+    """Call a WSGI app and return its status, headers and whole body."""
+    response = {}
+    chunks = []
+
+    def start_response(status, headers, exc_info=None):
+        if exc_info and response:
+            raise exc_info[1].with_traceback(exc_info[2])
+        response['status'] = status
+        response['headers'] = list(headers)
+        return chunks.append
+
+    result = app(environ, start_response)
+    try:
+        for data in result:
+            if data:
+                chunks.append(data)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return response['status'], response['headers'], b''.join(chunks)
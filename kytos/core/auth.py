@@ -2,21 +2,192 @@
 import datetime
 import getpass
 import hashlib
+import hmac
 import logging
 import time
+from collections import OrderedDict
+from concurrent import futures
 from functools import wraps
 from http import HTTPStatus
+from threading import Lock
 
 import jwt
 from flask import jsonify, request
 
 from kytos.core.config import KytosConfig
 from kytos.core.events import KytosEvent
+from kytos.core.rpc import call_event
 
 __all__ = ['authenticated']
 
 LOG = logging.getLogger(__name__)
 
+#: Seconds to wait for storehouse to answer a request.
+STOREHOUSE_TIMEOUT = 10
+STOREHOUSE_TIMEOUT_ANSWER = "Storehouse did not answer in time"
+
+#: Number of verified tokens kept by :data:`TOKEN_CACHE`.
+TOKEN_CACHE_SIZE = 1024
+
+
+class TokenCache:
+    """Bounded LRU cache of verified tokens, each kept until it expires.
+
+    Tokens are stored by their SHA-256 digest along with the secret that
+    verified them, so a token is verified again if the secret changes.
+    """
+
+    def __init__(self, size=TOKEN_CACHE_SIZE):
+        """Create an empty cache.
+
+        Args:
+            size (int): Maximum number of tokens; the least recently used
+                token is discarded when a new one is added to a full cache.
+        """
+        self.size = size
+        self._lock = Lock()
+        self._tokens = OrderedDict()
+
+    def __len__(self):
+        return len(self._tokens)
+
+    @staticmethod
+    def _key(token):
+        """Return the digest of a token."""
+        return hashlib.sha256(token.encode()).digest()
+
+    def is_verified(self, token, secret):
+        """Return whether ``token`` was verified with ``secret``.
+
+        Expired tokens are removed and are not verified.
+        """
+        key = self._key(token)
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is None:
+                return False
+            expiration, verified_secret = entry
+            if verified_secret != secret or (expiration is not None and
+                                             expiration <= time.time()):
+                del self._tokens[key]
+                return False
+            self._tokens.move_to_end(key)
+            return True
+
+    def add(self, token, secret, expiration=None):
+        """Store a token verified with ``secret``.
+
+        Args:
+            token (str): Verified token.
+            secret (str): Secret used to verify the token.
+            expiration (float): Unix time of the token ``exp`` claim, if any.
+        """
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._tokens[self._key(token)] = (expiration, secret)
+            self._tokens.move_to_end(self._key(token))
+            while len(self._tokens) > self.size:
+                self._tokens.popitem(last=False)
+
+    def clear(self):
+        """Remove all the tokens."""
+        with self._lock:
+            self._tokens.clear()
+
+
+#: Tokens already verified by :func:`authenticated`.
+TOKEN_CACHE = TokenCache()
+
+#: Number of users kept by :class:`UserCache`.
+USER_CACHE_SIZE = 256
+#: Seconds a user is kept by :class:`UserCache` before it is retrieved
+#: from storehouse again, even if it was not invalidated.
+USER_CACHE_TTL = 60
+
+
+class UserCache:
+    """Bounded LRU cache of the user data retrieved from storehouse.
+
+    Users are kept for at most ``ttl`` seconds, so changes made to
+    storehouse by other processes are eventually seen. Every invalidation
+    increments :attr:`generation`; data retrieved before an invalidation is
+    not stored, since it may be older than the invalidated user.
+    """
+
+    def __init__(self, size=USER_CACHE_SIZE, ttl=USER_CACHE_TTL):
+        """Create an empty cache.
+
+        Args:
+            size (int): Maximum number of users; the least recently used
+                user is discarded when a new one is added to a full cache.
+            ttl (float): Seconds a user is kept in the cache.
+        """
+        self.size = size
+        self.ttl = ttl
+        #: Number of invalidations so far.
+        self.generation = 0
+        self._lock = Lock()
+        self._users = OrderedDict()
+
+    def __len__(self):
+        return len(self._users)
+
+    def get(self, uid):
+        """Return a copy of the data of a user or ``None``.
+
+        Expired users are removed and ``None`` is returned.
+        """
+        with self._lock:
+            entry = self._users.get(uid)
+            if entry is None:
+                return None
+            expiration, data = entry
+            if expiration <= time.monotonic():
+                del self._users[uid]
+                return None
+            self._users.move_to_end(uid)
+            return dict(data)
+
+    def set(self, uid, data, generation=None):
+        """Store a copy of the data of a user.
+
+        Args:
+            uid (str): User id.
+            data (dict): User data retrieved from storehouse.
+            generation (int): Value of :attr:`generation` read before
+                retrieving ``data``. If the cache was invalidated since
+                then, ``data`` may be stale and it is not stored.
+        """
+        if self.size <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._users[uid] = (time.monotonic() + self.ttl, dict(data))
+            self._users.move_to_end(uid)
+            while len(self._users) > self.size:
+                self._users.popitem(last=False)
+
+    def invalidate(self, uid):
+        """Remove a user, so it is retrieved from storehouse again."""
+        with self._lock:
+            self.generation += 1
+            self._users.pop(uid, None)
+
+    def clear(self):
+        """Remove all the users."""
+        with self._lock:
+            self.generation += 1
+            self._users.clear()
+
+
+def _to_bytes(value):
+    """Return ``value`` as bytes, encoding anything else than bytes."""
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
 
 def authenticated(func):
     """Handle tokens from requests."""
@@ -29,7 +200,10 @@ def authenticated(func):
                 raise ValueError("The attribute 'content' has an invalid "
                                  "value 'None'.")
             token = content.split("Bearer ")[1]
-            jwt.decode(token, key=Auth.get_jwt_secret())
+            secret = Auth.get_jwt_secret()
+            if not TOKEN_CACHE.is_verified(token, secret):
+                payload = jwt.decode(token, key=secret)
+                TOKEN_CACHE.add(token, secret, payload.get('exp'))
         except (
             ValueError,
             IndexError,
@@ -46,6 +220,9 @@ def authenticated(func):
 class Auth:
     """Module used to provide Kytos authentication routes."""
 
+    #: str: JWT secret read from kytos.conf once per process.
+    _jwt_secret = None
+
     def __init__(self, controller):
         """Init method of Auth class takes the parameters below.
 
@@ -55,6 +232,9 @@ class Auth:
         """
         self.controller = controller
         self.namespace = "kytos.core.auth.users"
+        #: UserCache: Users found in storehouse, invalidated when changed
+        #: through this class.
+        self.users = UserCache()
         self.token_expiration_minutes = self.get_token_expiration()
         if self.controller.options.create_superuser is True:
             self._create_superuser()
@@ -67,9 +247,13 @@ class Auth:
 
     @classmethod
     def get_jwt_secret(cls):
-        """Return JWT secret defined in kytos conf."""
-        options = KytosConfig().options['daemon']
-        return options.jwt_secret
+        """Return JWT secret defined in kytos conf.
+
+        The configuration is parsed only the first time.
+        """
+        if cls._jwt_secret is None:
+            cls._jwt_secret = KytosConfig().options['daemon'].jwt_secret
+        return cls._jwt_secret
 
     @classmethod
     def _generate_token(cls, username, time_exp):
@@ -148,13 +332,38 @@ class Auth:
             "auth/users/<uid>", self._update_user, methods=["PATCH"]
         )
 
+    def _request_storehouse(self, name, content):
+        """Send a storehouse event and wait for its callback.
+
+        Args:
+            name (str): Name of the storehouse event.
+            content (dict): Event content without the namespace.
+
+        Returns:
+            tuple: Box (or boxes) and error passed to the callback, or
+                ``None`` if storehouse did not answer in time.
+
+        """
+        content = dict(content, namespace=self.namespace)
+        try:
+            return call_event(self.controller.buffers.app, name, content,
+                              timeout=STOREHOUSE_TIMEOUT)
+        except futures.TimeoutError:
+            LOG.error('Storehouse did not answer %s in %s s', name,
+                      STOREHOUSE_TIMEOUT)
+            return None
+
     def _authenticate_user(self):
         """Authenticate a user using Storehouse."""
         username = request.authorization["username"]
         password = request.authorization["password"].encode()
+        digest = hashlib.sha512(password).hexdigest().encode()
+        answer, code = self._find_user(username)
+        if code == HTTPStatus.GATEWAY_TIMEOUT.value:
+            return answer, code
         try:
-            user = self._find_user(username)[0].get("data")
-            if user.get("password") != hashlib.sha512(password).hexdigest():
+            user = answer.get("data")
+            if not hmac.compare_digest(_to_bytes(user["password"]), digest):
                 raise KeyError
             time_exp = datetime.datetime.utcnow() + datetime.timedelta(
                 minutes=self.token_expiration_minutes
@@ -166,39 +375,23 @@ class Auth:
             return result, HTTPStatus.UNAUTHORIZED.value
 
     def _find_user(self, uid):
-        """Find a specific user using Storehouse."""
-        response = {}
-
-        def _find_user_callback(_event, box, error):
-            nonlocal response
-            if not box:
-                response = {
-                    "answer": f'User with uid {uid} not found',
-                    "code": HTTPStatus.NOT_FOUND.value
-                }
-            elif error:
-                response = {
-                    "answer": "User data cannot be shown",
-                    "code": HTTPStatus.INTERNAL_SERVER_ERROR.value,
-                }
-            else:
-                response = {
-                    "answer": {"data": box.data},
-                    "code": HTTPStatus.OK.value,
-                }
-
-        content = {
-            "box_id": uid,
-            "namespace": self.namespace,
-            "callback": _find_user_callback,
-        }
-        event = KytosEvent(name="kytos.storehouse.retrieve", content=content)
-        self.controller.buffers.app.put(event)
-        while True:
-            time.sleep(0.1)
-            if response:
-                break
-        return response["answer"], response["code"]
+        """Find a specific user in the cache or using Storehouse."""
+        user = self.users.get(uid)
+        if user is not None:
+            return {"data": user}, HTTPStatus.OK.value
+        generation = self.users.generation
+        response = self._request_storehouse("kytos.storehouse.retrieve",
+                                            {"box_id": uid})
+        if response is None:
+            return STOREHOUSE_TIMEOUT_ANSWER, HTTPStatus.GATEWAY_TIMEOUT.value
+        box, error = response
+        if not box:
+            return f'User with uid {uid} not found', HTTPStatus.NOT_FOUND.value
+        if error:
+            return ("User data cannot be shown",
+                    HTTPStatus.INTERNAL_SERVER_ERROR.value)
+        self.users.set(uid, box.data, generation)
+        return {"data": dict(box.data)}, HTTPStatus.OK.value
 
     @authenticated
     def _list_user(self, uid):
@@ -211,56 +404,18 @@ class Auth:
     @authenticated
     def _list_users(self):
         """List all users using Storehouse."""
-        response = {}
-
-        def _list_users_callback(_event, boxes, error):
-            nonlocal response
-            if error:
-                response = {
-                    "answer": "Users cannot be listed",
-                    "code": HTTPStatus.INTERNAL_SERVER_ERROR.value,
-                }
-            else:
-                response = {
-                    "answer": {"users": boxes},
-                    "code": HTTPStatus.OK.value,
-                }
-
-        content = {
-            "namespace": self.namespace,
-            "callback": _list_users_callback,
-        }
-        event = KytosEvent(name="kytos.storehouse.list", content=content)
-        self.controller.buffers.app.put(event)
-        while True:
-            time.sleep(0.1)
-            if response:
-                break
-        return response["answer"], response["code"]
+        response = self._request_storehouse("kytos.storehouse.list", {})
+        if response is None:
+            return STOREHOUSE_TIMEOUT_ANSWER, HTTPStatus.GATEWAY_TIMEOUT.value
+        boxes, error = response
+        if error:
+            return ("Users cannot be listed",
+                    HTTPStatus.INTERNAL_SERVER_ERROR.value)
+        return {"users": boxes}, HTTPStatus.OK.value
 
     @authenticated
     def _create_user(self):
         """Save a user using Storehouse."""
-        response = {}
-
-        def _create_user_callback(_event, box, error):
-            nonlocal response
-            if not box:
-                response = {
-                    "answer": f'User already exists',
-                    "code": HTTPStatus.CONFLICT.value,
-                }
-            elif error:
-                response = {
-                    "answer": "User has not been created",
-                    "code": HTTPStatus.INTERNAL_SERVER_ERROR.value,
-                }
-            else:
-                response = {
-                    "answer": "User successfully created",
-                    "code": HTTPStatus.OK.value,
-                }
-
         req = request.json
         password = req["password"].encode()
         data = {
@@ -268,79 +423,40 @@ class Auth:
             "email": req["email"],
             "password": hashlib.sha512(password).hexdigest(),
         }
-        content = {
-            "namespace": self.namespace,
-            "box_id": data["username"],
-            "data": data,
-            "callback": _create_user_callback,
-        }
-        event = KytosEvent(name="kytos.storehouse.create", content=content)
-        self.controller.buffers.app.put(event)
-        while True:
-            time.sleep(0.1)
-            if response:
-                break
-        return response["answer"], response["code"]
+        response = self._request_storehouse("kytos.storehouse.create",
+                                            {"box_id": data["username"],
+                                             "data": data})
+        # Also after timeouts, since storehouse may still change the user
+        self.users.invalidate(data["username"])
+        if response is None:
+            return STOREHOUSE_TIMEOUT_ANSWER, HTTPStatus.GATEWAY_TIMEOUT.value
+        box, error = response
+        if not box:
+            return "User already exists", HTTPStatus.CONFLICT.value
+        if error:
+            return ("User has not been created",
+                    HTTPStatus.INTERNAL_SERVER_ERROR.value)
+        return "User successfully created", HTTPStatus.OK.value
 
     @authenticated
     def _delete_user(self, uid):
         """Delete a user using Storehouse."""
-        response = {}
-
-        def _delete_user_callback(_event, box, error):
-            nonlocal response
-            if not box:
-                response = {
-                    "answer": f'User with uid {uid} not found',
-                    "code": HTTPStatus.NOT_FOUND.value
-                }
-            elif error:
-                response = {
-                    "answer": "User has not been deleted",
-                    "code": HTTPStatus.INTERNAL_SERVER_ERROR.value,
-                }
-            else:
-                response = {
-                    "answer": "User successfully deleted",
-                    "code": HTTPStatus.OK.value,
-                }
-
-        content = {
-            "box_id": uid,
-            "namespace": self.namespace,
-            "callback": _delete_user_callback,
-        }
-        event = KytosEvent(name="kytos.storehouse.delete", content=content)
-        self.controller.buffers.app.put(event)
-        while True:
-            time.sleep(0.1)
-            if response:
-                break
-        return response["answer"], response["code"]
+        response = self._request_storehouse("kytos.storehouse.delete",
+                                            {"box_id": uid})
+        self.users.invalidate(uid)
+        if response is None:
+            return STOREHOUSE_TIMEOUT_ANSWER, HTTPStatus.GATEWAY_TIMEOUT.value
+        box, error = response
+        if not box:
+            return f'User with uid {uid} not found', HTTPStatus.NOT_FOUND.value
+        if error:
+            return ("User has not been deleted",
+                    HTTPStatus.INTERNAL_SERVER_ERROR.value)
+        return "User successfully deleted", HTTPStatus.OK.value
 
     @authenticated
     def _update_user(self, uid):
         """Update user data using Storehouse."""
-        response = {}
-
-        def _update_user_callback(_event, box, error):
-            nonlocal response
-            if not box:
-                response = {
-                    "answer": f'User with uid {uid} not found',
-                    "code": HTTPStatus.NOT_FOUND.value
-                }
-            elif error:
-                response = {
-                    "answer": "User has not been updated",
-                    "code": HTTPStatus.INTERNAL_SERVER_ERROR.value,
-                }
-            else:
-                response = {
-                    "answer": "User successfully updated",
-                    "code": HTTPStatus.OK.value,
-                }
-
         req = request.json
         allowed = ["username", "email", "password"]
 
@@ -349,16 +465,15 @@ class Auth:
             if key in allowed:
                 data[key] = value
 
-        content = {
-            "namespace": self.namespace,
-            "box_id": uid,
-            "data": data,
-            "callback": _update_user_callback,
-        }
-        event = KytosEvent(name="kytos.storehouse.update", content=content)
-        self.controller.buffers.app.put(event)
-        while True:
-            time.sleep(0.1)
-            if response:
-                break
-        return response["answer"], response["code"]
+        response = self._request_storehouse("kytos.storehouse.update",
+                                            {"box_id": uid, "data": data})
+        self.users.invalidate(uid)
+        if response is None:
+            return STOREHOUSE_TIMEOUT_ANSWER, HTTPStatus.GATEWAY_TIMEOUT.value
+        box, error = response
+        if not box:
+            return f'User with uid {uid} not found', HTTPStatus.NOT_FOUND.value
+        if error:
+            return ("User has not been updated",
+                    HTTPStatus.INTERNAL_SERVER_ERROR.value)
+        return "User successfully updated", HTTPStatus.OK.value
@@ -5,11 +5,18 @@ import logging
 from janus import Queue
 
 from kytos.core.events import KytosEvent
+from kytos.core.metrics import METRICS
+from kytos.core.tracing import mark
 
 __all__ = ('KytosBuffers', )
 
 LOG = logging.getLogger(__name__)
 
+EVENTS_PUT = METRICS.counter('kytos_buffer_events_put_total',
+                             'Events put in each buffer.', ['buffer', 'event'])
+EVENTS_GOT = METRICS.counter('kytos_buffer_events_got_total',
+                             'Events removed from each buffer.', ['buffer'])
+
 
 class KytosEventBuffer:
     """KytosEventBuffer represents a queue to store a set of KytosEvents."""
@@ -38,7 +45,9 @@ class KytosEventBuffer:
                 KytosEvent sent to queue.
         """
         if not self._reject_new_events:
+            mark(event, f'put:{self.name}')
             self._queue.sync_q.put(event)
+            EVENTS_PUT.inc(self.name, event.name)
             LOG.debug('[buffer: %s] Added: %s', self.name, event.name)
 
         if event.name == "kytos/core.shutdown":
@@ -59,7 +68,9 @@ class KytosEventBuffer:
         # qsize = self._queue.async_q.qsize()
         # print('qsize before:', qsize)
         if not self._reject_new_events:
+            mark(event, f'put:{self.name}')
             await self._queue.async_q.put(event)
+            EVENTS_PUT.inc(self.name, event.name)
             LOG.debug('[buffer: %s] Added: %s', self.name, event.name)
 
         # qsize = self._queue.async_q.qsize()
@@ -79,6 +90,8 @@ class KytosEventBuffer:
 
         """
         event = self._queue.sync_q.get()
+        mark(event, f'get:{self.name}')
+        EVENTS_GOT.inc(self.name)
 
         LOG.debug('[buffer: %s] Removed: %s', self.name, event.name)
 
@@ -93,6 +106,8 @@ class KytosEventBuffer:
 
         """
         event = await self._queue.async_q.get()
+        mark(event, f'get:{self.name}')
+        EVENTS_GOT.inc(self.name)
 
         LOG.debug('[buffer: %s] Removed: %s', self.name, event.name)
 
@@ -152,6 +167,10 @@ class KytosBuffers:
         self.msg_out = KytosEventBuffer('msg_out_event', loop=self._loop)
         self.app = KytosEventBuffer('app_event', loop=self._loop)
 
+    def __iter__(self):
+        """Iterate over the four buffers."""
+        return iter((self.raw, self.msg_in, self.msg_out, self.app))
+
     def send_stop_signal(self):
         """Send a ``kytos/core.shutdown`` event to each buffer."""
         LOG.info('Stop signal received by Kytos buffers.')
@@ -1,9 +1,10 @@
 """Module with common classes for the controller."""
+import json
 from enum import Enum
 
 from kytos.core.config import KytosConfig
 
-__all__ = ('GenericEntity',)
+__all__ = ('CachedAttribute', 'GenericEntity', 'parse_fields')
 
 
 class EntityStatus(Enum):
@@ -14,8 +15,41 @@ class EntityStatus(Enum):
     DOWN = 3
 
 
+class CachedAttribute:
+    """Attribute of an entity that is part of its cached serialization.
+
+    Assigning it calls :meth:`GenericEntity.invalidate_cache`. The descriptor
+    has no ``__get__``, so reading the attribute is a plain lookup in the
+    instance dict, and other attributes are assigned without any overhead.
+    """
+
+    def __init__(self):
+        """Create the descriptor, named by the class attribute."""
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = value
+        instance.invalidate_cache()
+
+    def __delete__(self, instance):
+        del instance.__dict__[self.name]
+        instance.invalidate_cache()
+
+
 class GenericEntity:
-    """Generic class that represents any Entity."""
+    """Generic class that represents any Entity.
+
+    Every state change made through the methods of an entity increments its
+    :attr:`version` and, if the entity belongs to a controller, is recorded
+    in the :class:`~kytos.core.registry.ChangeJournal` of the controller.
+
+    The serialization of an entity is cached until one of its
+    :class:`CachedAttribute` attributes is assigned. Attributes mutated in
+    place must call :meth:`invalidate_cache` instead.
+    """
 
     def __init__(self):
         """Create the GenericEntity object with empty metadata dictionary."""
@@ -24,6 +58,102 @@ class GenericEntity:
 
         self._active: bool = True
         self._enabled: bool = options.enable_entities_by_default
+        self._version: int = 0
+
+    def invalidate_cache(self):
+        """Discard the cached serialization of this entity."""
+        self.__dict__.pop('_cache', None)
+
+    def _get_cached(self, name, build):
+        """Return the cached value ``name``, calling ``build`` if missing.
+
+        A value built while the cache is invalidated is stored in the
+        discarded cache, so stale values are never kept.
+        """
+        cache = self.__dict__.get('_cache')
+        if cache is None:
+            cache = self.__dict__['_cache'] = {}
+        try:
+            return cache[name]
+        except KeyError:
+            value = cache[name] = build()
+            return value
+
+    def _cached_dict(self, build):
+        """Return a copy of the cached dict returned by ``build``."""
+        return dict(self._get_cached('dict', build))
+
+    def _cached_json(self, build, dynamic):
+        """Return a JSON object from cached and ``dynamic`` members.
+
+        Args:
+            build (callable): Return the dict to be cached, as in
+                :meth:`_cached_dict`. Its values are encoded only once.
+            dynamic (dict): Keys whose values change without invalidating
+                the cache, mapped to their JSON encoded values. Keys missing
+                in the cached dict are appended to the object.
+
+        Returns:
+            string: Same result as ``json.dumps`` of the whole dict.
+
+        """
+        def encode():
+            return [(key, json.dumps(key) + ': ', json.dumps(value))
+                    for key, value in self._get_cached('dict', build).items()]
+
+        members = []
+        for key, prefix, value in self._get_cached('json', encode):
+            members.append(prefix + dynamic.pop(key, value))
+        for key, value in dynamic.items():
+            members.append(json.dumps(key) + ': ' + value)
+        return '{' + ', '.join(members) + '}'
+
+    def _project(self, fields, build, dynamic):
+        """Return a dict with only the requested fields.
+
+        Only the values of the requested fields are computed, so the cost is
+        proportional to the size of the result.
+
+        Args:
+            fields (dict): Field names mapped to the fields requested from
+                their value, as returned by :func:`parse_fields`. Unknown
+                names are ignored.
+            build (callable): Return the dict to be cached, as in
+                :meth:`_cached_dict`.
+            dynamic (dict): Keys whose values change without invalidating
+                the cache, mapped to functions that receive the requested
+                subfields and return the value.
+
+        """
+        cached = self._get_cached('dict', build)
+        result = {}
+        for key, subfields in fields.items():
+            if key in dynamic:
+                result[key] = dynamic[key](subfields)
+            elif key in cached:
+                result[key] = cached[key]
+        return result
+
+    @property
+    def version(self) -> int:
+        """Return how many times this entity was changed."""
+        return self._version
+
+    def _get_registry(self):
+        """Return the EntityRegistry this entity belongs to, if any."""
+        return getattr(self, 'registry', None)
+
+    def _notify_change(self, action, **data):
+        """Increment the version and record a change in the journal.
+
+        Args:
+            action (str): What happened to the entity, e.g. ``enabled``.
+            data: JSON serializable details of the change.
+        """
+        self._version += 1
+        registry = self._get_registry()
+        if registry is not None:
+            registry.journal.record(self, action, data)
 
     def is_enabled(self) -> bool:
         """Return the *administrative* status of the entity."""
@@ -36,10 +166,12 @@ class GenericEntity:
     def activate(self):
         """Activate the entity."""
         self._active = True
+        self._notify_change('activated')
 
     def deactivate(self):
         """Deactivate the entity."""
         self._active = False
+        self._notify_change('deactivated')
 
     @property
     def status(self):
@@ -62,6 +194,7 @@ class GenericEntity:
         behavior in the future.
         """
         self._enabled = True
+        self._notify_change('enabled')
 
     def disable(self):
         """Administratively disable the Entity.
@@ -70,6 +203,23 @@ class GenericEntity:
         rewrite it on the child classes.
         """
         self._enabled = False
+        self._notify_change('disabled')
+
+    def _update_metadata_index(self, removed=None, added=None):
+        """Update the metadata index of the registry, if enabled.
+
+        Args:
+            removed (dict): Metadata removed or replaced, with old values.
+            added (dict): Metadata added or replaced, with new values.
+        """
+        registry = self._get_registry()
+        index = getattr(registry, 'metadata_index', None)
+        if index is None:
+            return
+        if removed:
+            index.remove(self, removed)
+        if added:
+            index.add(self, added)
 
     def add_metadata(self, key, value):
         """Add a new metadata (key, value)."""
@@ -77,15 +227,35 @@ class GenericEntity:
             return False
 
         self.metadata[key] = value
+        self._update_metadata_index(added={key: value})
+        self._notify_change('metadata_added', keys=[key])
         return True
 
     def remove_metadata(self, key):
         """Try to remove a specific metadata."""
         try:
-            del self.metadata[key]
-            return True
+            value = self.metadata.pop(key)
         except KeyError:
             return False
+        self._update_metadata_index(removed={key: value})
+        self._notify_change('metadata_removed', keys=[key])
+        return True
+
+    def remove_metadata_keys(self, keys):
+        """Remove many metadata keys at once.
+
+        Keys not in the metadata are ignored.
+
+        Returns:
+            list: The keys removed.
+
+        """
+        removed = {key: self.metadata.pop(key)
+                   for key in keys if key in self.metadata}
+        if removed:
+            self._update_metadata_index(removed=removed)
+            self._notify_change('metadata_removed', keys=list(removed))
+        return list(removed)
 
     def get_metadata(self, key):
         """Try to get a specific metadata."""
@@ -101,11 +271,17 @@ class GenericEntity:
 
     def update_metadata(self, key, value):
         """Overwrite a specific metadata."""
+        removed = {key: self.metadata[key]} if key in self.metadata else None
         self.metadata[key] = value
+        self._update_metadata_index(removed, {key: value})
+        self._notify_change('metadata_updated', keys=[key])
 
     def clear_metadata(self):
         """Remove all metadata information."""
+        removed = self.metadata
         self.metadata = {}
+        self._update_metadata_index(removed=removed)
+        self._notify_change('metadata_removed', keys=list(removed))
 
     def extend_metadata(self, metadatas, force=True):
         """Extend the metadata information.
@@ -113,8 +289,50 @@ class GenericEntity:
         If force is True any existing value is overwritten.
         """
         if force:
-            self.metadata.update(metadatas)
-            return
+            removed = {key: self.metadata[key]
+                       for key in metadatas if key in self.metadata}
+            added = metadatas
+        else:
+            removed = None
+            added = {key: value for key, value in metadatas.items()
+                     if key not in self.metadata}
+            if not added:
+                return
+        self.metadata.update(added)
+        self._update_metadata_index(removed, added)
+        action = 'metadata_updated' if force else 'metadata_added'
+        self._notify_change(action, keys=list(added))
+
+
+def parse_fields(fields):
+    """Return the fields of a projection as a tree of dicts.
+
+    Nested fields are separated by dots, so ``'id,interfaces.name'``
+    returns ``{'id': None, 'interfaces': {'name': None}}``. ``None`` means
+    all the fields of a value.
+
+    Args:
+        fields (str, list or dict): Comma separated string or list of field
+            names. A dict is returned unchanged.
+
+    Returns:
+        dict: Field names mapped to their requested subfields.
 
-        for key, value in metadatas.items():
-            self.add_metadata(key, value)
+    """
+    if isinstance(fields, dict):
+        return fields
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    tree = {}
+    for field in fields:
+        node = tree
+        parts = [part.strip() for part in field.split('.')]
+        if not all(parts):
+            continue
+        for part in parts[:-1]:
+            if node.get(part, {}) is None:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = None
+    return tree
@@ -109,6 +109,19 @@ class KytosConfig():
                         'protocol_name': '',
                         'enable_entities_by_default': False,
                         'token_expiration_minutes': 180,
+                        'metadata_index': False,
+                        'loop_monitor': True,
+                        'loop_lag_interval': 0.25,
+                        'loop_lag_threshold': 1.0,
+                        'tracing': False,
+                        'tracing_sample_rate': 0.01,
+                        'tracing_file': '/var/lib/kytos/trace.json',
+                        'api_server_mode': 'threading',
+                        'api_max_concurrency': 64,
+                        'api_keep_alive_timeout': 15,
+                        'changes_push_interval': 1.0,
+                        'changes_room_intervals': {},
+                        'napps_load_workers': 1,
                         'debug': False}
 
         """
@@ -131,6 +144,20 @@ class KytosConfig():
                     'authenticate_urls': [],
                     'vlan_pool': {},
                     'token_expiration_minutes': 180,
+                    'metadata_index': False,
+                    'loop_monitor': True,
+                    'loop_lag_interval': 0.25,
+                    'loop_lag_threshold': 1.0,
+                    'tracing': False,
+                    'tracing_sample_rate': 0.01,
+                    'tracing_file': os.path.join(BASE_ENV,
+                                                 'var/lib/kytos/trace.json'),
+                    'api_server_mode': 'threading',
+                    'api_max_concurrency': 64,
+                    'api_keep_alive_timeout': 15,
+                    'changes_push_interval': 1.0,
+                    'changes_room_intervals': {},
+                    'napps_load_workers': 1,
                     'debug': False}
 
         options, argv = self.conf_parser.parse_known_args()
@@ -175,6 +202,16 @@ class KytosConfig():
                                                token_expiration_minutes)
         result = options.enable_entities_by_default in ['True', True]
         options.enable_entities_by_default = result
+        options.metadata_index = options.metadata_index in ['True', True]
+        options.loop_monitor = options.loop_monitor in ['True', True]
+        options.loop_lag_interval = float(options.loop_lag_interval)
+        options.loop_lag_threshold = float(options.loop_lag_threshold)
+        options.tracing = options.tracing in ['True', True]
+        options.tracing_sample_rate = float(options.tracing_sample_rate)
+        options.api_max_concurrency = int(options.api_max_concurrency)
+        options.api_keep_alive_timeout = float(options.api_keep_alive_timeout)
+        options.changes_push_interval = float(options.changes_push_interval)
+        options.napps_load_workers = int(options.napps_load_workers)
 
         def _parse_json(value):
             """Parse JSON lists and dicts from the config file."""
@@ -185,6 +222,8 @@ class KytosConfig():
         options.napps_pre_installed = _parse_json(options.napps_pre_installed)
         options.vlan_pool = _parse_json(options.vlan_pool)
         options.authenticate_urls = _parse_json(options.authenticate_urls)
+        options.changes_room_intervals = _parse_json(
+            options.changes_room_intervals)
 
         return options
 
@@ -6,3 +6,13 @@ instantiation.
 CONNECTION_TIMEOUT = 70
 # FLOOD_TIMEOUT in microseconds
 FLOOD_TIMEOUT = 100000
+# Maximum number of entries in each generation of the flood table
+FLOOD_TABLE_CAPACITY = 4096
+# Maximum number of mac addresses learned by each switch
+MAC_TABLE_CAPACITY = 8192
+# MAC_TABLE_TTL in seconds
+MAC_TABLE_TTL = 300
+# ENDPOINT_TTL in seconds, used when expiring interface endpoints
+ENDPOINT_TTL = 300
+# Number of entity changes kept by the controller change journal
+CHANGE_JOURNAL_SIZE = 10000
@@ -13,6 +13,7 @@ Basic usage:
     controller = Controller(config.options)
     controller.start()
 """
+# pylint: disable=too-many-lines
 import asyncio
 import atexit
 import json
@@ -22,12 +23,18 @@ import re
 import sys
 import threading
 from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
 from importlib import import_module
 from importlib import reload as reload_module
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
+from time import perf_counter
 
-from kytos.core.api_server import APIServer
+from flask import request
+from werkzeug.http import generate_etag
+
+from kytos.core.accounting import ACCOUNTING
+from kytos.core.api_server import APIServer, conditional
 # from kytos.core.tcp_server import KytosRequestHandler, KytosServer
 from kytos.core.atcp_server import KytosServer, KytosServerProtocol
 from kytos.core.auth import Auth
@@ -35,16 +42,34 @@ from kytos.core.buffers import KytosBuffers
 from kytos.core.config import KytosConfig
 from kytos.core.connection import ConnectionState
 from kytos.core.events import KytosEvent
+from kytos.core.exceptions import KytosMemoryTracingDisabled
 from kytos.core.helpers import now
 from kytos.core.interface import Interface
 from kytos.core.logs import LogManager
+from kytos.core.loop_monitor import LoopMonitor
+from kytos.core.memory import MemoryInspector, container_sizes, object_counts
+from kytos.core.metrics import CONTENT_TYPE, METRICS
 from kytos.core.napps.base import NApp
+from kytos.core.napps.dependencies import (dependency_graph,
+                                           run_in_dependency_order)
 from kytos.core.napps.manager import NAppsManager
 from kytos.core.napps.napp_dir_listener import NAppDirListener
+from kytos.core.pagination import DEFAULT_LIMIT, paginate
+from kytos.core.profiler import SamplingProfiler
+from kytos.core.registry import EntityRegistry
 from kytos.core.switch import Switch
+from kytos.core.tracing import CURRENT_EVENT, TRACER, mark
+from kytos.core.websocket import ChangePublisher
 
 __all__ = ('Controller',)
 
+EVENTS_DISPATCHED = METRICS.counter('kytos_events_dispatched_total',
+                                    'Events dispatched to the listeners.',
+                                    ['event'])
+
+#: Longest profile, in seconds, that can be requested in the REST API.
+MAX_PROFILE_SECONDS = 60
+
 
 def exc_handler(_, exc, __):
     """Log uncaught exceptions.
@@ -111,6 +136,10 @@ class Controller:
         #: The key is the napp name (string), while the value is the napp
         #: instance itself.
         self.napps = {}
+        #: dict: Seconds to import, set up and start each loaded NApp.
+        self.napps_load_times = {}
+        #: Lock: Serializes the registration of the NApps being loaded.
+        self._napps_lock = threading.Lock()
         #: Object generated by ParseArgs on config.py file
         self.options = options
         #: KytosServer: Instance of KytosServer that will be listening to TCP
@@ -120,9 +149,20 @@ class Controller:
         #:
         #: The key is the switch dpid, while the value is a Switch object.
         self.switches = {}  # dpid: Switch()
+        #: Lock: Serializes the writers that replace :attr:`switches`.
+        self._switches_lock = threading.Lock()
+        #: EntityRegistry: Indexes of interfaces, links and mac addresses of
+        #: the switches added to the controller.
+        self.registry = EntityRegistry(self.options.metadata_index)
 
         #: datetime.datetime: Time when the controller finished starting.
         self.started_at = None
+        #: LoopMonitor: Lag monitor of the asyncio loop, if enabled.
+        self.loop_monitor = None
+        #: ChangePublisher: Push of the topology changes, if enabled.
+        self.change_publisher = None
+        #: MemoryInspector: Traced allocations grouped by NApp and module.
+        self.memory = MemoryInspector()
 
         #: logging.Logger: Logger instance used by Kytos.
         self.log = None
@@ -135,7 +175,10 @@ class Controller:
         #: API Server used to expose rest endpoints.
         self.api_server = APIServer(__name__, self.options.listen,
                                     self.options.api_port,
-                                    self.napps_manager, self.options.napps)
+                                    self.napps_manager, self.options.napps,
+                                    self.options.api_server_mode,
+                                    self.options.api_max_concurrency,
+                                    self.options.api_keep_alive_timeout)
 
         self.auth = Auth(self)
 
@@ -146,6 +189,19 @@ class Controller:
         sys.path.append(os.path.join(self.options.napps, os.pardir))
         sys.excepthook = exc_handler
 
+        self._register_metrics()
+
+    def _register_metrics(self):
+        """Collect the buffer, thread and topology gauges when exposed."""
+        METRICS.gauge('kytos_buffer_size', 'Events waiting in each buffer.',
+                      ['buffer']).set_function(
+                          lambda: {(buffer.name,): buffer.qsize()
+                                   for buffer in self.buffers})
+        METRICS.gauge('kytos_threads', 'Threads alive.').set_function(
+            threading.active_count)
+        METRICS.gauge('kytos_switches', 'Switches known by the controller.'
+                      ).set_function(lambda: len(self.switches))
+
     def enable_logs(self):
         """Register kytos log and enable the logs."""
         LogManager.load_config_file(self.options.logging, self.options.debug)
@@ -308,6 +364,20 @@ class Controller:
 
         self.log.info("ThreadPool started: %s", self._pool)
 
+        TRACER.configure(self.options.tracing,
+                         self.options.tracing_sample_rate)
+        if self.options.loop_monitor:
+            self.loop_monitor = LoopMonitor(self._loop,
+                                            self.options.loop_lag_interval,
+                                            self.options.loop_lag_threshold)
+            self.loop_monitor.start()
+        if self.options.changes_push_interval > 0:
+            self.change_publisher = ChangePublisher(
+                self.api_server.server, self.registry,
+                self.options.changes_push_interval,
+                self.options.changes_room_intervals)
+            self.change_publisher.start()
+
         # ASYNC TODO: ensure all threads started correctly
         # This is critical, if any of them failed starting we should exit.
         # sys.exit(error_msg.format(thread, exception))
@@ -337,6 +407,41 @@ class Controller:
             self.rest_reload_napp)
         self.api_server.register_core_endpoint('reload/all',
                                                self.rest_reload_all_napps)
+        self.api_server.register_core_endpoint('changes/',
+                                               self.rest_changes)
+        self.api_server.register_core_endpoint('changes/<int:version>',
+                                               self.rest_changes)
+        self.api_server.register_core_endpoint('switches',
+                                               self.rest_switches)
+        self.api_server.register_core_endpoint('interfaces',
+                                               self.rest_interfaces)
+        self.api_server.register_core_endpoint('links', self.rest_links)
+        self.api_server.register_core_endpoint('metrics',
+                                               self.rest_metrics)
+        self.api_server.register_core_endpoint('traces',
+                                               self.rest_traces)
+        self.api_server.register_core_endpoint('profile/',
+                                               self.rest_profile)
+        self.api_server.register_core_endpoint('profile/<int:seconds>',
+                                               self.rest_profile)
+        self.api_server.register_core_endpoint('listeners/',
+                                               self.rest_listeners)
+        self.api_server.register_core_endpoint('listeners/<sort_by>',
+                                               self.rest_listeners)
+        self.api_server.register_core_endpoint('listeners/napps/',
+                                               self.rest_listeners_by_napp)
+        self.api_server.register_core_endpoint('listeners/napps/<sort_by>',
+                                               self.rest_listeners_by_napp)
+        self.api_server.register_core_endpoint('memory/',
+                                               self.rest_memory)
+        self.api_server.register_core_endpoint('memory/diff',
+                                               self.rest_memory_diff)
+        self.api_server.register_core_endpoint('memory/baseline',
+                                               self.rest_memory_baseline,
+                                               methods=['POST'])
+        self.api_server.register_core_endpoint('memory/tracing/<action>',
+                                               self.rest_memory_tracing,
+                                               methods=['POST'])
         self.auth.register_core_auth_services()
 
     def register_rest_endpoint(self, url, function, methods):
@@ -356,6 +461,237 @@ class Controller:
         metadata = dict(re.findall(r"(__[a-z]+__)\s*=\s*'([^']+)'", meta_file))
         return json.dumps(metadata)
 
+    def get_changes(self, version=0):
+        """Return the entity changes made after a given version.
+
+        Args:
+            version (int): Version of the last change known by the caller.
+
+        Returns:
+            list: Changes in ascending version order, or ``None`` if the
+                caller must fetch the whole topology again.
+
+        """
+        return self.registry.journal.changes_since(version)
+
+    @staticmethod
+    def rest_metrics():
+        """Return the metrics of the controller in Prometheus text format."""
+        return (METRICS.expose(), HTTPStatus.OK.value,
+                {'Content-Type': CONTENT_TYPE})
+
+    @staticmethod
+    def rest_traces():
+        """Return the event traces recorded in Chrome trace format."""
+        return json.dumps(TRACER.chrome_trace()), HTTPStatus.OK.value
+
+    @staticmethod
+    def profile(seconds=5, interval=0.005):
+        """Sample the stacks of all threads for some seconds.
+
+        Args:
+            seconds (float): How long the threads are sampled.
+            interval (float): Seconds between two samples.
+
+        Returns:
+            ~kytos.core.profiler.SamplingProfiler: Profiler with the counts
+                of the sampled stacks.
+
+        """
+        return SamplingProfiler(interval).run(seconds)
+
+    def rest_profile(self, seconds=5):
+        """Return the stacks of all threads sampled for some seconds.
+
+        The response is in collapsed stack format, which can be rendered by
+        flamegraph.pl or speedscope. At most ``MAX_PROFILE_SECONDS`` seconds
+        can be sampled.
+        """
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            return (f'seconds must be between 1 and {MAX_PROFILE_SECONDS}',
+                    HTTPStatus.BAD_REQUEST.value)
+        return (self.profile(seconds).collapsed(), HTTPStatus.OK.value,
+                {'Content-Type': 'text/plain; charset=utf-8'})
+
+    @staticmethod
+    def listener_stats(sort_by='cpu', by_napp=False, limit=None):
+        """Return the CPU and wall time used by listeners or NApps.
+
+        Args:
+            sort_by (str): Column to sort by, highest first: ``cpu``,
+                ``wall``, ``calls``, ``errors``, ``running`` or ``peak``.
+            by_napp (bool): Whether to sum the listeners of each NApp.
+            limit (int): Maximum number of rows returned.
+
+        Returns:
+            list: Dicts with the name and the totals of each listener or
+                NApp.
+
+        """
+        return ACCOUNTING.top(sort_by, by_napp, limit)
+
+    def rest_listeners(self, sort_by='cpu', by_napp=False):
+        """Return the CPU and wall time used by each listener."""
+        try:
+            rows = self.listener_stats(sort_by, by_napp)
+        except ValueError as exception:
+            return str(exception), HTTPStatus.BAD_REQUEST.value
+        return json.dumps(rows), HTTPStatus.OK.value
+
+    def rest_listeners_by_napp(self, sort_by='cpu'):
+        """Return the CPU and wall time used by the listeners of each NApp."""
+        return self.rest_listeners(sort_by, by_napp=True)
+
+    def memory_usage(self, limit=20):
+        """Return the memory used by the controller.
+
+        Args:
+            limit (int): Number of owners of allocations returned.
+
+        Returns:
+            dict: Whether allocations are traced, the number of alive core
+                objects, the number of items in the controller tables and,
+                when tracing, the owners with most memory allocated.
+
+        """
+        usage = {'tracing': self.memory.tracing,
+                 'objects': object_counts(),
+                 'containers': container_sizes(self)}
+        if self.memory.tracing:
+            usage['allocations'] = self.memory.allocations(limit)
+        return usage
+
+    def rest_memory(self):
+        """Return the memory used by the controller in JSON."""
+        return json.dumps(self.memory_usage()), HTTPStatus.OK.value
+
+    def rest_memory_tracing(self, action):
+        """Start or stop tracing the memory allocations."""
+        if action == 'start':
+            self.memory.start()
+        elif action == 'stop':
+            self.memory.stop()
+        else:
+            return (f'Unknown action {action}, use start or stop',
+                    HTTPStatus.NOT_FOUND.value)
+        return json.dumps({'tracing': self.memory.tracing}), \
+            HTTPStatus.OK.value
+
+    def rest_memory_baseline(self):
+        """Store the current allocations to be compared later."""
+        try:
+            self.memory.set_baseline()
+        except KytosMemoryTracingDisabled as exception:
+            return str(exception), HTTPStatus.CONFLICT.value
+        return json.dumps({'tracing': True}), HTTPStatus.OK.value
+
+    def rest_memory_diff(self):
+        """Return how the allocations changed since the baseline."""
+        try:
+            diff = self.memory.diff()
+        except KytosMemoryTracingDisabled as exception:
+            return str(exception), HTTPStatus.CONFLICT.value
+        return json.dumps(diff), HTTPStatus.OK.value
+
+    def snapshot(self):
+        """Return a read-only view of the current topology.
+
+        Getting a snapshot takes no locks and no copies, and it does not
+        change while switches, interfaces and links are added or removed, so
+        it can be iterated in any thread.
+
+        Returns:
+            ~kytos.core.registry.TopologySnapshot: Current topology.
+
+        """
+        return self.registry.snapshot
+
+    def rest_switches(self):
+        """Return a page of the switches with the requested fields.
+
+        The query arguments are described in :meth:`get_entity_page`.
+        """
+        return self._rest_entity_page('switches')
+
+    def rest_interfaces(self):
+        """Return a page of the interfaces with the requested fields."""
+        return self._rest_entity_page('interfaces')
+
+    def rest_links(self):
+        """Return a page of the links with the requested fields."""
+        return self._rest_entity_page('links')
+
+    def _rest_entity_page(self, kind):
+        """Answer a request for a page of entities.
+
+        If the page is the same the client got before, the response status
+        is 304 (Not Modified). The page is tagged by its content and query,
+        not by the journal version, because values like ``active`` and the
+        interface speed change without a journal entry.
+        """
+        try:
+            limit = int(request.args.get('limit', DEFAULT_LIMIT))
+            page = self.get_entity_page(kind, request.args.get('fields'),
+                                        request.args.get('cursor'), limit)
+        except ValueError as error:
+            return (json.dumps({'error': str(error)}),
+                    HTTPStatus.BAD_REQUEST.value)
+        result = json.dumps(page, default=str)
+        conditional(generate_etag(request.full_path.encode() +
+                                  result.encode()))
+        return result, HTTPStatus.OK.value
+
+    def get_entity_page(self, kind, fields=None, cursor=None,
+                        limit=DEFAULT_LIMIT):
+        """Return a page of the switches, interfaces or links by id.
+
+        Args:
+            kind (str): ``switches``, ``interfaces`` or ``links``.
+            fields (str): Comma separated fields of each entity, like
+                ``id,active,interfaces.name``. All fields by default.
+            cursor (str): ``next_cursor`` of the previous page.
+            limit (int): Maximum number of entities in the page.
+
+        Returns:
+            dict: The entities in the ``kind`` key and the cursor of the next
+                page in ``next_cursor``, which is ``None`` in the last page.
+
+        Raises:
+            ValueError: If the cursor or the limit is invalid.
+
+        """
+        snapshot = self.snapshot()
+        if kind == 'interfaces':
+            entities = {interface.id: interface
+                        for interfaces in snapshot.interfaces.values()
+                        for interface in interfaces.values()}
+        else:
+            entities = getattr(snapshot, kind)
+        entities, next_cursor = paginate(entities, cursor, limit)
+        return {kind: [entity.as_dict(fields) for entity in entities],
+                'next_cursor': next_cursor}
+
+    def rest_changes(self, version=0):
+        """Return the entity changes made after a given version.
+
+        Clients should store the returned ``version`` and use it in the next
+        request. If the version is too old or unknown, the response status is
+        410 (Gone) and the client must fetch the whole topology again. If
+        there are no changes since the last request with the same version,
+        the response status is 304 (Not Modified).
+
+        Returns:
+            string: Json with the current version and the list of changes.
+
+        """
+        conditional(f'changes-{version}-{self.registry.journal.version}')
+        changes = self.get_changes(version)
+        result = json.dumps({'version': self.registry.journal.version,
+                             'changes': changes}, default=str)
+        if changes is None:
+            return result, HTTPStatus.GONE.value
+        return result, HTTPStatus.OK.value
+
     def configuration_endpoint(self):
         """Return the configuration options used by Kytos.
 
@@ -388,6 +724,14 @@ class Controller:
         if self.started_at:
             self.stop_controller(graceful)
 
+    def export_traces(self):
+        """Write the event traces to the configured tracing file."""
+        try:
+            TRACER.export(self.options.tracing_file)
+        except OSError as exception:
+            self.log.error('Could not export the event traces to %s: %s',
+                           self.options.tracing_file, exception)
+
     def stop_controller(self, graceful=True):
         """Stop the controller.
 
@@ -405,6 +749,12 @@ class Controller:
         self.buffers.send_stop_signal()
         self.api_server.stop_api_server()
         self.napp_dir_listener.stop()
+        if self.loop_monitor:
+            self.loop_monitor.stop()
+        if self.change_publisher:
+            self.change_publisher.stop()
+        if self.options.tracing:
+            self.export_traces()
 
         self.log.info("Stopping threadpool: %s", self._pool)
 
@@ -484,17 +834,24 @@ class Controller:
             event (~kytos.core.KytosEvent): An instance of a KytosEvent.
         """
         self.log.debug("looking for listeners for %s", event)
-        for event_regex, listeners in dict(self.events_listeners).items():
-            # self.log.debug("listeners found for %s: %r => %s", event,
-            #                event_regex, [l.__qualname__ for l in listeners])
-            # Do not match if the event has more characters
-            # e.g. "shutdown" won't match "shutdown.kytos/of_core"
-            if event_regex[-1] != '$' or event_regex[-2] == '\\':
-                event_regex += '$'
-            if re.match(event_regex, event.name):
-                # self.log.debug('Calling listeners for %s', event)
-                for listener in listeners:
-                    listener(event)
+        EVENTS_DISPATCHED.inc(event.name)
+        mark(event, 'dispatch')
+        token = CURRENT_EVENT.set(event)
+        try:
+            for event_regex, listeners in dict(self.events_listeners).items():
+                # self.log.debug("listeners found for %s: %r => %s", event,
+                #                event_regex,
+                #                [l.__qualname__ for l in listeners])
+                # Do not match if the event has more characters
+                # e.g. "shutdown" won't match "shutdown.kytos/of_core"
+                if event_regex[-1] != '$' or event_regex[-2] == '\\':
+                    event_regex += '$'
+                if re.match(event_regex, event.name):
+                    # self.log.debug('Calling listeners for %s', event)
+                    for listener in listeners:
+                        listener(event)
+        finally:
+            CURRENT_EVENT.reset(token)
 
     async def raw_event_handler(self):
         """Handle raw events.
@@ -548,6 +905,7 @@ class Controller:
                     not destination.state == ConnectionState.FINISHED):
                 packet = message.pack()
                 destination.send(packet)
+                mark(triggered_event, 'sent')
                 self.log.debug('Connection %s: OUT OFP, '
                                'version: %s, type: %s, xid: %s - %s',
                                destination.id,
@@ -589,8 +947,13 @@ class Controller:
         if interface_id is None:
             return None
 
-        switch_id = ":".join(interface_id.split(":")[:-1])
-        interface_number = int(interface_id.split(":")[-1])
+        interface = self.registry.get_interface(interface_id)
+        if interface is not None:
+            return interface
+
+        # Interfaces stored directly in Switch.interfaces are not indexed
+        switch_id, _, interface_number = interface_id.rpartition(":")
+        interface_number = int(interface_number)
 
         switch = self.switches.get(switch_id)
 
@@ -599,6 +962,83 @@ class Controller:
 
         return switch.interfaces.get(interface_number, None)
 
+    def get_interface_by_mac(self, mac):
+        """Return the Interface with the given mac address.
+
+        Args:
+            mac (str, |hw_address|): mac address of the interface.
+
+        Returns:
+            Interface: Instance of Interface or None.
+
+        """
+        return self.registry.get_interface_by_mac(mac)
+
+    def get_link_by_id(self, link_id):
+        """Return a Link attached to the interfaces of the controller.
+
+        Args:
+            link_id (str): Link Identifier.
+
+        Returns:
+            :class:`~kytos.core.link.Link`: Instance of Link or None.
+
+        """
+        return self.registry.get_link(link_id)
+
+    def get_links_by_dpid(self, dpid):
+        """Return the list of links with an endpoint in a switch.
+
+        Args:
+            dpid (|DPID|): dpid object used to identify a switch.
+
+        """
+        return self.registry.get_links(dpid)
+
+    def get_neighbors(self, dpid):
+        """Return the set of dpids of the switches linked to a switch.
+
+        Args:
+            dpid (|DPID|): dpid object used to identify a switch.
+
+        """
+        return self.registry.get_neighbors(dpid)
+
+    def get_entities_by_metadata(self, key, value=None):
+        """Return the switches, interfaces and links with a metadata.
+
+        The ``metadata_index`` option must be enabled in kytos.conf.
+
+        Args:
+            key (str): Metadata key.
+            value: If not ``None``, only entities with this value are
+                returned.
+
+        Returns:
+            list: Entities with the metadata.
+
+        Raises:
+            KytosMetadataIndexDisabled: If the metadata index is disabled.
+
+        """
+        return self.registry.find_by_metadata(key, value)
+
+    def apply_metadata(self, entities, metadata=None, remove=(), force=True):
+        """Add and remove metadata of many entities in one call.
+
+        Args:
+            entities (iterable): Switches, interfaces and links to change.
+            metadata (dict): Metadata to add to every entity.
+            remove (iterable): Metadata keys to remove from every entity.
+            force (bool): Whether existing keys in ``metadata`` are
+                overwritten.
+
+        Returns:
+            int: Number of entities changed.
+
+        """
+        return self.registry.apply_metadata(entities, metadata, remove, force)
+
     def get_switch_by_dpid(self, dpid):
         """Return a specific switch by dpid.
 
@@ -725,10 +1165,14 @@ class Controller:
             switch (:class:`~kytos.core.switch.Switch`):
                 Instance of switch that will be removed.
         """
-        try:
-            del self.switches[switch.dpid]
-        except KeyError:
-            return False
+        with self._switches_lock:
+            switches = dict(self.switches)
+            try:
+                del switches[switch.dpid]
+            except KeyError:
+                return False
+            self.switches = switches
+            self.registry.remove_switch(switch)
         return True
 
     def new_connection(self, event):
@@ -760,10 +1204,18 @@ class Controller:
     def add_new_switch(self, switch):
         """Add a new switch on the controller.
 
+        The :attr:`switches` dict is replaced, not modified, so it can be
+        iterated while switches are added. Writers replace it one at a time,
+        so concurrent additions are not lost.
+
         Args:
             switch (Switch): A Switch object
         """
-        self.switches[switch.dpid] = switch
+        with self._switches_lock:
+            switches = dict(self.switches)
+            switches[switch.dpid] = switch
+            self.switches = switches
+            self.registry.add_switch(switch)
 
     def _import_napp(self, username, napp_name):
         """Import a NApp module.
@@ -785,6 +1237,9 @@ class Controller:
     def load_napp(self, username, napp_name):
         """Load a single NApp.
 
+        NApps can be loaded from several threads at the same time. They are
+        imported and set up concurrently, but registered one at a time.
+
         Args:
             username (str): NApp username (makes up NApp's path).
             napp_name (str): Name of the NApp to be loaded.
@@ -794,6 +1249,9 @@ class Controller:
             self.log.warning(message, username, napp_name)
             return
 
+        self.api_server.ui_manifest.refresh_napp(username, napp_name)
+        times = {}
+        begin = perf_counter()
         try:
             napp_module = self._import_napp(username, napp_name)
         except ModuleNotFoundError as err:
@@ -804,24 +1262,35 @@ class Controller:
             msg = "NApp module not found, assuming it's a meta-napp: %s"
             self.log.warning(msg, err.filename)
             return
+        times['import'] = perf_counter() - begin
 
+        begin = perf_counter()
         try:
             napp = napp_module.Main(controller=self)
         except:  # noqa pylint: disable=bare-except
             self.log.critical("NApp initialization failed: %s/%s",
                               username, napp_name, exc_info=True)
             return
+        times['setup'] = perf_counter() - begin
 
-        self.napps[(username, napp_name)] = napp
+        begin = perf_counter()
+        with self._napps_lock:
+            if (username, napp_name) in self.napps:
+                message = 'NApp %s/%s was already loaded'
+                self.log.warning(message, username, napp_name)
+                return
+            self.napps[(username, napp_name)] = napp
 
-        napp.start()
-        self.api_server.authenticate_endpoints(napp)
-        self.api_server.register_napp_endpoints(napp)
+            napp.start()
+            self.api_server.authenticate_endpoints(napp)
+            self.api_server.register_napp_endpoints(napp)
 
-        # pylint: disable=protected-access
-        for event, listeners in napp._listeners.items():
-            self.events_listeners.setdefault(event, []).extend(listeners)
-        # pylint: enable=protected-access
+            # pylint: disable=protected-access
+            for event, listeners in napp._listeners.items():
+                self.events_listeners.setdefault(event, []).extend(listeners)
+            # pylint: enable=protected-access
+        times['start'] = perf_counter() - begin
+        self.napps_load_times[(username, napp_name)] = times
 
     def pre_install_napps(self, napps, enable=True):
         """Pre install and enable NApps.
@@ -838,14 +1307,54 @@ class Controller:
             self.napps_manager.install(napp, enable=enable)
 
     def load_napps(self):
-        """Load all NApps enabled on the NApps dir."""
-        for napp in self.napps_manager.get_enabled_napps():
+        """Load all NApps enabled on the NApps dir.
+
+        Each NApp is loaded after the NApps in its ``napp_dependencies``,
+        and NApps that do not depend on each other are loaded at the same
+        time by up to ``napps_load_workers`` threads. A table with the
+        seconds each NApp took to load is logged at the end.
+        """
+        napps = {napp.id: napp
+                 for napp in self.napps_manager.get_enabled_napps()}
+        begin = perf_counter()
+
+        def load(napp_id):
+            napp = napps[napp_id]
+            started = perf_counter() - begin
             try:
                 self.log.info("Loading NApp %s", napp.id)
                 self.load_napp(napp.username, napp.name)
             except FileNotFoundError as exception:
                 self.log.error("Could not load NApp %s: %s",
                                napp.id, exception)
+            except Exception:  # pylint: disable=broad-except
+                self.log.exception("Could not load NApp %s", napp.id)
+            return started, perf_counter() - begin
+
+        spans = run_in_dependency_order(
+            dependency_graph(list(napps.values())), load,
+            max_workers=self.options.napps_load_workers)
+        if spans:
+            self._log_napps_load_times(napps, spans,
+                                       perf_counter() - begin)
+
+    def _log_napps_load_times(self, napps, spans, elapsed):
+        """Log the seconds each NApp took to load, slowest first."""
+        lines = [f"{'NApp':<32} {'begin':>7} {'import':>7} {'setup':>7} "
+                 f"{'start':>7} {'total':>7}"]
+        for napp_id, (started, finished) in sorted(
+                spans.items(), key=lambda item: item[1][0] - item[1][1]):
+            napp = napps[napp_id]
+            times = self.napps_load_times.get((napp.username, napp.name))
+            if times is None:
+                phases = f"{'-':>7} {'-':>7} {'not loaded':>15}"
+            else:
+                phases = (f"{times['import']:>7.3f} {times['setup']:>7.3f} "
+                          f"{times['start']:>7.3f}")
+            lines.append(f'{napp_id:<32} {started:>7.3f} {phases} '
+                         f'{finished - started:>7.3f}')
+        self.log.info("Loaded %d NApps in %.3f seconds:\n%s",
+                      len(self.napps), elapsed, '\n'.join(lines))
 
     def unload_napp(self, username, napp_name):
         """Unload a specific NApp.
@@ -855,6 +1364,8 @@ class Controller:
             napp_name (str): Name of the NApp to be unloaded.
         """
         napp = self.napps.pop((username, napp_name), None)
+        self.napps_load_times.pop((username, napp_name), None)
+        self.api_server.ui_manifest.refresh_napp(username, napp_name)
 
         if napp is None:
             self.log.warning('NApp %s/%s was not loaded', username, napp_name)
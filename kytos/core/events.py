@@ -1,6 +1,7 @@
 """Module with Kytos Events."""
 
 from kytos.core.helpers import now
+from kytos.core.tracing import TRACER
 
 
 class KytosEvent:
@@ -21,6 +22,8 @@ class KytosEvent:
         self.name = name
         self.content = content if content is not None else {}
         self.timestamp = now()
+        #: EventTrace: stages of the event, if it is traced
+        self.trace = TRACER.start(self)
 
     def __str__(self):
         return self.name
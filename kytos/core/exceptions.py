@@ -81,6 +81,24 @@ class KytosLinkCreationError(Exception):
     """Exception thrown when the link has an empty endpoint."""
 
 
+class KytosMetadataIndexDisabled(Exception):
+    """Exception thrown when the metadata index is disabled in kytos.conf."""
+
+    def __str__(self):
+        """Return how to enable the metadata index."""
+        return ('The metadata index is disabled. Set metadata_index = True '
+                'in kytos.conf to enable it.')
+
+
+class KytosMemoryTracingDisabled(Exception):
+    """Exception thrown when memory allocations are not being traced."""
+
+    def __str__(self):
+        """Return how to start tracing the allocations."""
+        return ('Memory allocations are not being traced. Start tracing with '
+                'POST /api/kytos/core/memory/tracing/start.')
+
+
 # Exceptions related  to NApps
 
 
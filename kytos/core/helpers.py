@@ -1,12 +1,33 @@
 """Utilities functions used in Kytos."""
 from datetime import datetime, timezone
 from threading import Thread
+from time import perf_counter
+
+from kytos.core.accounting import ACCOUNTING, napp_of
+from kytos.core.metrics import METRICS
+from kytos.core.tracing import CURRENT_EVENT, mark
+
+try:
+    from time import thread_time
+except ImportError:  # Python 3.6
+    import time
+
+    def thread_time():
+        """Return the CPU time of the current thread, in seconds."""
+        clock = getattr(time, 'CLOCK_THREAD_CPUTIME_ID', None)
+        if clock is None:
+            return time.process_time()
+        return time.clock_gettime(clock)
 
 __all__ = ['listen_to', 'now', 'run_on_thread', 'get_time']
 
 
 # APP_MSG = "[App %s] %s | ID: %02d | R: %02d | P: %02d | F: %s"
 
+LISTENER_DURATION = METRICS.histogram(
+    'kytos_listener_duration_seconds',
+    'Duration of the listeners decorated with listen_to.', ['listener'])
+
 
 def listen_to(event, *events):
     """Decorate Event Listener methods.
@@ -64,10 +85,31 @@ def listen_to(event, *events):
             and also decorated to run on a new thread.
 
         """
+        listener = f'{handler.__module__}.{handler.__qualname__}'
+        napp = napp_of(handler.__module__)
+
         @run_on_thread
         def threaded_handler(*args):
             """Decorate the handler to run from a new thread."""
-            handler(*args)
+            # Events created by the handler are caused by the handled event
+            kytos_event = args[-1] if args else None
+            token = CURRENT_EVENT.set(kytos_event)
+            mark(kytos_event, f'listener_start:{listener}')
+            ACCOUNTING.started(listener, napp)
+            error = False
+            start, start_cpu = perf_counter(), thread_time()
+            try:
+                handler(*args)
+            except BaseException:
+                error = True
+                raise
+            finally:
+                wall = perf_counter() - start
+                ACCOUNTING.finished(listener, napp, thread_time() - start_cpu,
+                                    wall, error)
+                LISTENER_DURATION.observe(wall, listener)
+                mark(kytos_event, f'listener_end:{listener}')
+                CURRENT_EVENT.reset(token)
 
         threaded_handler.events = [event]
         threaded_handler.events.extend(events)
@@ -2,13 +2,15 @@
 import json
 import logging
 from enum import IntEnum
+from time import monotonic
 
 from pyof.v0x01.common.phy_port import Port as PortNo01
 from pyof.v0x01.common.phy_port import PortFeatures as PortFeatures01
 from pyof.v0x04.common.port import PortFeatures as PortFeatures04
 from pyof.v0x04.common.port import PortNo as PortNo04
 
-from kytos.core.common import GenericEntity
+from kytos.core.common import CachedAttribute, GenericEntity, parse_fields
+from kytos.core.constants import ENDPOINT_TTL
 from kytos.core.helpers import now
 
 __all__ = ('Interface',)
@@ -58,10 +60,20 @@ class TAG:
         return f"TAG({self.tag_type!r}, {self.value!r})"
 
 
-class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
+# pylint: disable=too-many-instance-attributes, too-many-public-methods
+class Interface(GenericEntity):
     """Interface Class used to abstract the network interfaces."""
 
-    # pylint: disable=too-many-arguments, too-many-public-methods
+    # The speed is not cached, as it depends on the state of the switch
+    # connection, which changes without assignments to the interface.
+    name = CachedAttribute()
+    port_number = CachedAttribute()
+    switch = CachedAttribute()
+    nni = CachedAttribute()
+    link = CachedAttribute()
+    lldp = CachedAttribute()
+
+    # pylint: disable=too-many-arguments
     def __init__(self, name, port_number, switch, address=None, state=None,
                  features=None, speed=None, config=None):
         """Assign the parameters to instance attributes.
@@ -92,7 +104,8 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
         self.features = features
         self.config = config
         self.nni = False
-        self.endpoints = []
+        #: dict: endpoint key -> (endpoint, datetime, monotonic timestamp)
+        self._endpoints = {}
         self.stats = None
         self.link = None
         self.lldp = True
@@ -104,6 +117,13 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
     def __repr__(self):
         return f"Interface('{self.name}', {self.port_number}, {self.switch!r})"
 
+    def invalidate_cache(self):
+        """Discard the cached serialization of the interface and its link."""
+        super().invalidate_cache()
+        link = self.__dict__.get('link')
+        if link is not None:
+            link.invalidate_cache()
+
     def __eq__(self, other):
         """Compare Interface class with another instance."""
         if isinstance(other, str):
@@ -123,6 +143,24 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
         """
         return "{}:{}".format(self.switch.dpid, self.port_number)
 
+    def _get_registry(self):
+        return getattr(self.switch, 'registry', None)
+
+    @property
+    def address(self):
+        """|hw_address|: Port address from this interface."""
+        return self._address
+
+    @address.setter
+    def address(self, address):
+        """Change the address and re-index it in the registry, if any."""
+        old_address = self.__dict__.get('_address')
+        self._address = address
+        self.invalidate_cache()
+        registry = self._get_registry()
+        if registry is not None:
+            registry.update_address(self, old_address)
+
     @property
     def uni(self):
         """Return if an interface is a user-to-network Interface."""
@@ -148,6 +186,7 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
         """
         self.switch.enable()
         self._enabled = True
+        self._notify_change('enabled')
 
     def use_tag(self, tag):
         """Remove a specific tag from available_tags if it is there.
@@ -183,6 +222,47 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
             return True
         return False
 
+    @property
+    def endpoints(self):
+        """Return a list of (endpoint, time of last update) tuples.
+
+        The list is a new copy built from the endpoints map, in insertion
+        order, so changing it does not change the endpoints of the
+        interface. Use :meth:`add_endpoint`, :meth:`update_endpoint` and
+        :meth:`delete_endpoint` to change them, and :attr:`endpoints_view`
+        to get them as an immutable tuple.
+        """
+        return [entry[:2] for entry in self._endpoints.values()]
+
+    @endpoints.setter
+    def endpoints(self, endpoints):
+        """Replace the endpoints using a list of (endpoint, time) tuples."""
+        self._endpoints = {}
+        for endpoint, timestamp in endpoints:
+            self._endpoints[self._endpoint_key(endpoint)] = (endpoint,
+                                                             timestamp,
+                                                             monotonic())
+
+    @property
+    def endpoints_view(self):
+        """Return a tuple of (endpoint, time of last update) tuples.
+
+        Same as :attr:`endpoints`, but immutable, so ``append`` and
+        ``remove`` on it raise ``AttributeError`` instead of being lost.
+        """
+        return tuple(entry[:2] for entry in self._endpoints.values())
+
+    @staticmethod
+    def _endpoint_key(endpoint):
+        """Return a hashable key for an endpoint.
+
+        Interfaces are identified by their id and hardware addresses by their
+        value, so a |hw_address| and its string have the same key.
+        """
+        if isinstance(endpoint, Interface):
+            return ('interface', endpoint.id)
+        return getattr(endpoint, 'value', endpoint)
+
     def get_endpoint(self, endpoint):
         """Return a tuple with existent endpoint, None otherwise.
 
@@ -193,10 +273,8 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
             tuple: A tuple with endpoint and time of last update.
 
         """
-        for item in self.endpoints:
-            if endpoint == item[0]:
-                return item
-        return None
+        entry = self._endpoints.get(self._endpoint_key(endpoint))
+        return entry[:2] if entry else None
 
     def add_endpoint(self, endpoint):
         """Create a new endpoint to Interface instance.
@@ -204,9 +282,9 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
         Args:
             endpoint(|hw_address|, :class:`.Interface`): A target endpoint.
         """
-        exists = self.get_endpoint(endpoint)
-        if not exists:
-            self.endpoints.append((endpoint, now()))
+        key = self._endpoint_key(endpoint)
+        if key not in self._endpoints:
+            self._endpoints[key] = (endpoint, now(), monotonic())
 
     def delete_endpoint(self, endpoint):
         """Delete a existent endpoint in Interface instance.
@@ -214,20 +292,34 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
         Args:
             endpoint (|hw_address|, :class:`.Interface`): A target endpoint.
         """
-        exists = self.get_endpoint(endpoint)
-        if exists:
-            self.endpoints.remove(exists)
+        self._endpoints.pop(self._endpoint_key(endpoint), None)
 
     def update_endpoint(self, endpoint):
         """Update or create new endpoint to Interface instance.
 
+        The updated endpoint is moved to the end of :attr:`endpoints`.
+
         Args:
             endpoint(|hw_address|, :class:`.Interface`): A target endpoint.
         """
-        exists = self.get_endpoint(endpoint)
-        if exists:
-            self.delete_endpoint(endpoint)
-        self.add_endpoint(endpoint)
+        key = self._endpoint_key(endpoint)
+        self._endpoints.pop(key, None)
+        self._endpoints[key] = (endpoint, now(), monotonic())
+
+    def expire_endpoints(self, max_age=ENDPOINT_TTL):
+        """Remove the endpoints not updated in the last ``max_age`` seconds.
+
+        Args:
+            max_age (int, float): Maximum age of an endpoint, in seconds.
+
+        Returns:
+            list: The removed endpoints.
+
+        """
+        deadline = monotonic() - max_age
+        expired = [key for key, entry in self._endpoints.items()
+                   if entry[2] < deadline]
+        return [self._endpoints.pop(key)[0] for key in expired]
 
     def update_link(self, link):
         """Update link for this interface in a consistent way.
@@ -241,7 +333,12 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
         if self not in (link.endpoint_a, link.endpoint_b):
             return False
 
-        if self.link is None or self.link != link:
+        registry = self._get_registry()
+        if self.link is not None and self.link != link and registry:
+            registry.remove_link(self.link)
+
+        changed = self.link is None or self.link != link
+        if changed:
             self.link = link
 
         if link.endpoint_a == self:
@@ -251,6 +348,12 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
 
         if endpoint.link is None or endpoint.link != link:
             endpoint.link = link
+            changed = True
+
+        if registry:
+            registry.add_link(link)
+        if changed:
+            self._notify_change('link_updated', link=link.id)
 
         return True
 
@@ -373,7 +476,7 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
             return '{} Gbps'.format(round(speed / 10**9))
         return '{} Mbps'.format(round(speed / 10**6))
 
-    def as_dict(self):
+    def as_dict(self, fields=None):
         """Return a dictionary with Interface attributes.
 
         Speed is in bytes/sec. Example of output (100 Gbps):
@@ -396,28 +499,50 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
              'link': ""
             }
 
+        Args:
+            fields (str, list or dict): Fields to return, as accepted by
+                :func:`~kytos.core.common.parse_fields`, e.g.
+                ``'id,active'``. All fields by default.
+
         Returns:
             dict: Dictionary filled with interface attributes.
 
         """
-        iface_dict = {'id': self.id,
-                      'name': self.name,
-                      'port_number': self.port_number,
-                      'mac': self.address,
-                      'switch': self.switch.dpid,
-                      'type': 'interface',
-                      'nni': self.nni,
-                      'uni': self.uni,
-                      'speed': self.speed,
-                      'metadata': self.metadata,
-                      'lldp': self.lldp,
-                      'active': self.is_active(),
-                      'enabled': self.is_enabled(),
-                      'link': self.link.id if self.link else ""}
+        if fields is not None:
+            dynamic = {'speed': lambda _: self.speed,
+                       'metadata': lambda _: self.metadata,
+                       'active': lambda _: self.is_active(),
+                       'enabled': lambda _: self.is_enabled()}
+            if self.stats:
+                dynamic['stats'] = lambda _: self.stats.as_dict()
+            return self._project(parse_fields(fields), self._build_dict,
+                                 dynamic)
+        iface_dict = self._cached_dict(self._build_dict)
+        iface_dict['speed'] = self.speed
+        iface_dict['metadata'] = self.metadata
+        iface_dict['active'] = self.is_active()
+        iface_dict['enabled'] = self.is_enabled()
         if self.stats:
             iface_dict['stats'] = self.stats.as_dict()
         return iface_dict
 
+    def _build_dict(self):
+        """Return the interface dict with only the attributes to be cached."""
+        return {'id': self.id,
+                'name': self.name,
+                'port_number': self.port_number,
+                'mac': self.address,
+                'switch': self.switch.dpid,
+                'type': 'interface',
+                'nni': self.nni,
+                'uni': self.uni,
+                'speed': None,
+                'metadata': None,
+                'lldp': self.lldp,
+                'active': None,
+                'enabled': None,
+                'link': self.link.id if self.link else ""}
+
     @classmethod
     def from_dict(cls, interface_dict):
         """Return a Interface instance from python dictionary."""
@@ -448,7 +573,13 @@ class Interface(GenericEntity):  # pylint: disable=too-many-instance-attributes
             string: Json filled with interface attributes.
 
         """
-        return json.dumps(self.as_dict())
+        dynamic = {'speed': json.dumps(self.speed),
+                   'metadata': json.dumps(self.metadata),
+                   'active': json.dumps(self.is_active()),
+                   'enabled': json.dumps(self.is_enabled())}
+        if self.stats:
+            dynamic['stats'] = json.dumps(self.stats.as_dict())
+        return self._cached_json(self._build_dict, dynamic)
 
 
 class UNI:
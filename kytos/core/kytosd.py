@@ -13,8 +13,10 @@ from IPython.terminal.prompts import Prompts, Token
 from traitlets.config.loader import Config
 
 from kytos.core import Controller
+from kytos.core.accounting import ACCOUNTING, format_top
 from kytos.core.config import KytosConfig
 from kytos.core.metadata import __version__
+from kytos.core.profiler import SamplingProfiler
 
 BASE_ENV = Path(os.environ.get('VIRTUAL_ENV', '/'))
 
@@ -84,9 +86,45 @@ def create_shell(controller=None):
                                     banner1=banner1,
                                     exit_msg=exit_msg)
     ipshell.prompts = KytosPrompt(ipshell)
+    ipshell.register_magic_function(profile_magic, magic_name='profile_kytos')
+    ipshell.register_magic_function(top_magic, magic_name='top_kytos')
     return ipshell
 
 
+def profile_magic(line):
+    """Sample all threads and print the busiest NApps and stacks.
+
+    Usage: ``%profile_kytos [seconds] [file]``. When a file is given, all
+    the stacks are saved to it in collapsed stack format.
+    """
+    args = line.split()
+    seconds = float(args[0]) if args else 5
+    profiler = SamplingProfiler().run(seconds)
+    if len(args) > 1:
+        with open(args[1], 'w') as profile_file:
+            profile_file.write(profiler.collapsed())
+        print(f'Stacks saved to {args[1]}')
+    print(f'{profiler.samples} samples in {seconds} s')
+    for napp, count in profiler.by_napp().most_common():
+        print(f'{count:>8} {napp}')
+    for stack, count in profiler.stacks.most_common(10):
+        print(f'{count:>8} {stack}')
+
+
+def top_magic(line):
+    """Print the listeners or NApps that used more CPU or wall time.
+
+    Usage: ``%top_kytos [cpu|wall|calls|errors|running|peak] [napps]``.
+    """
+    args = line.split()
+    sort_by = args[0] if args else 'cpu'
+    by_napp = 'napps' in args[1:]
+    try:
+        print(format_top(ACCOUNTING.top(sort_by, by_napp, limit=20)))
+    except ValueError as exception:
+        print(exception)
+
+
 # def disable_threadpool_exit():
 #     """Avoid traceback when ThreadPool tries to shut down threads again."""
 #     import atexit
@@ -8,14 +8,21 @@ import hashlib
 import json
 import random
 
-from kytos.core.common import GenericEntity
+from kytos.core.common import CachedAttribute, GenericEntity, parse_fields
 from kytos.core.exceptions import (KytosLinkCreationError,
                                    KytosNoTagAvailableError)
 from kytos.core.interface import TAGType
 
 
 class Link(GenericEntity):
-    """Define a link between two Endpoints."""
+    """Define a link between two Endpoints.
+
+    The cached serialization of a link holds its id. It is discarded when an
+    endpoint is replaced or when the cache of an endpoint is discarded.
+    """
+
+    endpoint_a = CachedAttribute()
+    endpoint_b = CachedAttribute()
 
     def __init__(self, endpoint_a, endpoint_b):
         """Create a Link instance and set its attributes.
@@ -33,6 +40,9 @@ class Link(GenericEntity):
     def __hash__(self):
         return hash(self.id)
 
+    def _get_registry(self):
+        return getattr(self.endpoint_a.switch, 'registry', None)
+
     def is_enabled(self):
         """Override the is_enabled method.
 
@@ -82,8 +92,14 @@ class Link(GenericEntity):
         else:
             elements = (dpid_b, port_b, dpid_a, port_a)
 
-        str_id = "%s:%s:%s:%s" % elements
-        return hashlib.sha256(str_id.encode('utf-8')).hexdigest()
+        # The hash is only computed again if an endpoint changes
+        cached = self.__dict__.get('_id')
+        if cached is None or cached[0] != elements:
+            str_id = "%s:%s:%s:%s" % elements
+            cached = (elements,
+                      hashlib.sha256(str_id.encode('utf-8')).hexdigest())
+            self.__dict__['_id'] = cached
+        return cached[1]
 
     @property
     def available_tags(self):
@@ -158,18 +174,47 @@ class Link(GenericEntity):
         tags = endpoint.available_tags
         return [tag for tag in tags if tag.tag_type == TAGType.VLAN]
 
-    def as_dict(self):
-        """Return the Link as a dictionary."""
+    def as_dict(self, fields=None):
+        """Return the Link as a dictionary.
+
+        Args:
+            fields (str, list or dict): Fields to return, as accepted by
+                :func:`~kytos.core.common.parse_fields`, e.g.
+                ``'id,endpoint_a.id'``. All fields by default.
+        """
+        if fields is not None:
+            return self._project(parse_fields(fields), self._build_dict, {
+                'endpoint_a': self.endpoint_a.as_dict,
+                'endpoint_b': self.endpoint_b.as_dict,
+                'metadata': lambda _: self.get_metadata_as_dict(),
+                'active': lambda _: self.is_active(),
+                'enabled': lambda _: self.is_enabled()})
+        link_dict = self._cached_dict(self._build_dict)
+        link_dict['endpoint_a'] = self.endpoint_a.as_dict()
+        link_dict['endpoint_b'] = self.endpoint_b.as_dict()
+        link_dict['metadata'] = self.get_metadata_as_dict()
+        link_dict['active'] = self.is_active()
+        link_dict['enabled'] = self.is_enabled()
+        return link_dict
+
+    def _build_dict(self):
+        """Return the link dict with only the attributes to be cached."""
         return {'id': self.id,
-                'endpoint_a': self.endpoint_a.as_dict(),
-                'endpoint_b': self.endpoint_b.as_dict(),
-                'metadata': self.get_metadata_as_dict(),
-                'active': self.is_active(),
-                'enabled': self.is_enabled()}
+                'endpoint_a': None,
+                'endpoint_b': None,
+                'metadata': None,
+                'active': None,
+                'enabled': None}
 
     def as_json(self):
         """Return the Link as a JSON string."""
-        return json.dumps(self.as_dict())
+        # Reuse the cached JSON of the endpoints instead of encoding them
+        members = {'endpoint_a': self.endpoint_a.as_json(),
+                   'endpoint_b': self.endpoint_b.as_json(),
+                   'metadata': json.dumps(self.get_metadata_as_dict()),
+                   'active': json.dumps(self.is_active()),
+                   'enabled': json.dumps(self.is_enabled())}
+        return self._cached_json(self._build_dict, members)
 
     @classmethod
     def from_dict(cls, link_dict):
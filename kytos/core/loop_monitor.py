@@ -0,0 +1,99 @@
+"""Module to detect when the asyncio loop of the controller is blocked.
+
+The loop runs the TCP server and the buffer handlers, so a listener or a
+send that blocks it delays every switch connection. The
+:class:`LoopMonitor` measures how late the loop wakes up from a short sleep
+and a watchdog thread logs the stack of the loop thread when it is blocked
+for longer than a threshold.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import traceback
+from time import monotonic
+
+from kytos.core.metrics import METRICS
+
+__all__ = ('LoopMonitor',)
+
+LOG = logging.getLogger(__name__)
+
+LOOP_LAG = METRICS.histogram(
+    'kytos_loop_lag_seconds', 'Delay of the asyncio loop to run a callback.',
+    buckets=(.001, .005, .01, .05, .1, .5, 1, 5, 10))
+LOOP_STALLS = METRICS.counter(
+    'kytos_loop_stalls_total',
+    'Times the asyncio loop was blocked for longer than the threshold.')
+
+
+class LoopMonitor:
+    """Sample the lag of an asyncio loop and log the stack when blocked."""
+
+    def __init__(self, loop, interval=0.25, threshold=1.0):
+        """Create a monitor for ``loop``.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): Loop to be monitored.
+            interval (float): Seconds between two lag samples.
+            threshold (float): Lag, in seconds, after which the stack of the
+                loop thread is logged.
+        """
+        self.loop = loop
+        self.interval = interval
+        self.threshold = threshold
+        self._task = None
+        self._watchdog = None
+        self._stopped = threading.Event()
+        self._loop_thread_id = None
+        #: float: monotonic time of the last time the loop woke up
+        self._last_wakeup = None
+
+    def start(self):
+        """Start sampling the loop and the watchdog thread.
+
+        Must be called from the loop thread.
+        """
+        self._loop_thread_id = threading.get_ident()
+        self._last_wakeup = monotonic()
+        self._stopped.clear()
+        self._task = self.loop.create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch,
+                                          name='loop_monitor', daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        """Stop the sampling task and the watchdog thread."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sample(self):
+        """Record the delay of every wake up after ``interval`` seconds."""
+        while True:
+            start = monotonic()
+            await asyncio.sleep(self.interval)
+            self._last_wakeup = monotonic()
+            LOOP_LAG.observe(max(self._last_wakeup - start - self.interval, 0))
+
+    def _watch(self):
+        """Log the loop thread stack once per stall longer than threshold."""
+        stalled = False
+        while not self._stopped.wait(self.threshold / 2):
+            lag = monotonic() - self._last_wakeup - self.interval
+            if lag < self.threshold:
+                stalled = False
+            elif not stalled:
+                stalled = True
+                LOOP_STALLS.inc()
+                LOG.warning('Asyncio loop blocked for %.3f s in:\n%s', lag,
+                            self.loop_stack())
+
+    def loop_stack(self):
+        """Return the formatted stack of the loop thread."""
+        frame = sys._current_frames().get(  # pylint: disable=protected-access
+            self._loop_thread_id)
+        if frame is None:
+            return 'loop thread not found'
+        return ''.join(traceback.format_stack(frame))
@@ -0,0 +1,180 @@
+"""Module to find out where the memory of the controller is used.
+
+The :class:`MemoryInspector` wraps :mod:`tracemalloc`: while tracing is
+started, the allocations still alive are grouped by owner, which is the
+NApp id for NApp files and the module name for the other Python files, and
+compared to a baseline snapshot to find what keeps growing.
+:func:`object_counts` and :func:`container_sizes` complete the picture with
+the number of core objects alive and the number of items in the tables of
+the controller and its switches and interfaces.
+"""
+import gc
+import tracemalloc
+from collections import Counter
+from pathlib import PurePath
+
+from kytos.core.connection import Connection
+from kytos.core.events import KytosEvent
+from kytos.core.exceptions import KytosMemoryTracingDisabled
+from kytos.core.interface import TAG, Interface
+from kytos.core.link import Link
+from kytos.core.profiler import napp_id
+from kytos.core.switch import Switch
+
+__all__ = ('MemoryInspector', 'container_sizes', 'object_counts')
+
+#: Core classes counted by :func:`object_counts`.
+CORE_CLASSES = (Switch, Interface, Link, TAG, KytosEvent, Connection)
+
+# Allocations made to trace the allocations are not reported
+_FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'))
+
+
+class MemoryInspector:
+    """Group the traced allocations by owner and compare them."""
+
+    def __init__(self):
+        """Create an inspector without a baseline snapshot."""
+        self._baseline = None
+
+    @property
+    def tracing(self):
+        """Return whether the allocations are traced."""
+        return tracemalloc.is_tracing()
+
+    def start(self, frames=1):
+        """Start tracing the allocations.
+
+        Args:
+            frames (int): Number of frames stored for each allocation.
+                Allocations are grouped by the innermost frame only.
+        """
+        if not self.tracing:
+            tracemalloc.start(frames)
+
+    def stop(self):
+        """Stop tracing the allocations and discard the baseline."""
+        tracemalloc.stop()
+        self._baseline = None
+
+    def take_snapshot(self):
+        """Return a snapshot of the allocations still alive.
+
+        Raises:
+            KytosMemoryTracingDisabled: If tracing is not started.
+
+        """
+        if not self.tracing:
+            raise KytosMemoryTracingDisabled()
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def set_baseline(self):
+        """Store the current snapshot to be compared in :meth:`diff`."""
+        self._baseline = self.take_snapshot()
+
+    def allocations(self, limit=20):
+        """Return the owners with most memory allocated and still alive.
+
+        Returns:
+            list: Dicts with the ``owner``, its ``size`` in bytes and the
+                ``count`` of memory blocks, largest first.
+
+        """
+        totals = {}
+        for stat in self.take_snapshot().statistics('filename'):
+            owner = file_owner(stat.traceback[0].filename)
+            size, count = totals.get(owner, (0, 0))
+            totals[owner] = (size + stat.size, count + stat.count)
+        return _top(totals, limit, ('size', 'count'))
+
+    def diff(self, limit=20):
+        """Return the owners whose memory changed most since the baseline.
+
+        If there is no baseline yet, the current snapshot becomes the
+        baseline and the returned list is empty.
+
+        Returns:
+            list: Dicts with the ``owner``, its ``size_diff`` in bytes and
+                the ``count_diff`` of memory blocks, largest change first.
+
+        """
+        snapshot = self.take_snapshot()
+        if self._baseline is None:
+            self._baseline = snapshot
+            return []
+        totals = {}
+        for stat in snapshot.compare_to(self._baseline, 'filename'):
+            owner = file_owner(stat.traceback[0].filename)
+            size, count = totals.get(owner, (0, 0))
+            totals[owner] = (size + stat.size_diff, count + stat.count_diff)
+        return _top({owner: total for owner, total in totals.items()
+                     if total != (0, 0)}, limit, ('size_diff', 'count_diff'))
+
+
+def file_owner(filename):
+    """Return the NApp id or the module name of a source file."""
+    owner = napp_id(filename)
+    if owner:
+        return owner
+    path = PurePath(filename)
+    if 'kytos' in path.parts[:-1]:
+        index = len(path.parts) - 1 - path.parts[::-1].index('kytos')
+        return '.'.join(path.parts[index:-1] + (path.stem,))
+    return filename
+
+
+def object_counts():
+    """Return the number of alive instances of each core class.
+
+    A collection runs first, so unreachable instances are not counted.
+    """
+    gc.collect()
+    counts = Counter({cls.__name__: 0 for cls in CORE_CLASSES})
+    for obj in gc.get_objects():
+        if isinstance(obj, CORE_CLASSES):
+            counts[type(obj).__name__] += 1
+    return dict(counts)
+
+
+def container_sizes(controller):
+    """Return the number of items in the tables of the controller.
+
+    The tables of switches and interfaces are summed for all of them.
+    """
+    switches = list(controller.switches.values())
+    interfaces = [interface for switch in switches
+                  for interface in switch.interfaces.values()]
+    registry = controller.registry
+    sizes = {
+        'switches': len(switches),
+        'connections': len(controller.connections),
+        'napps': len(controller.napps),
+        'registry.interfaces': len(registry.interfaces),
+        'registry.links': len(registry.links),
+        'registry.macs': len(registry.macs),
+        'registry.journal': len(registry.journal),
+        'switch.mac2port': sum(len(switch.mac2port) for switch in switches),
+        'switch.flood_table': sum(len(switch.flood_table)
+                                  for switch in switches),
+        'switch.flows': sum(len(switch.flows) for switch in switches),
+        'interfaces': len(interfaces),
+        'interface.endpoints': sum(len(interface.endpoints_view)
+                                   for interface in interfaces),
+        'interface.available_tags': sum(len(interface.available_tags)
+                                        for interface in interfaces),
+    }
+    if registry.metadata_index is not None:
+        sizes['registry.metadata_index'] = len(registry.metadata_index)
+    for buffer in controller.buffers:
+        sizes[f'buffers.{buffer.name}'] = buffer.qsize()
+    return sizes
+
+
+def _top(totals, limit, names):
+    """Return the ``limit`` largest totals as a list of dicts."""
+    items = sorted(totals.items(), key=lambda item: abs(item[1][0]),
+                   reverse=True)[:limit]
+    return [dict(zip(('owner',) + names, (owner,) + total))
+            for owner, total in items]
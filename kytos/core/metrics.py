@@ -0,0 +1,262 @@
+"""Module with the metrics of the controller in Prometheus text format.
+
+Metrics are created once, usually at module level, in the :data:`METRICS`
+set and updated where the measured code runs:
+
+.. code-block:: python3
+
+    from kytos.core.metrics import METRICS
+
+    PACKETS = METRICS.counter('kytos_packets_total', 'Packets received.',
+                              ['switch'])
+
+    PACKETS.inc('00:00:00:00:00:00:00:01')
+
+Updating a metric takes a lock and a dict lookup, so metrics are always
+enabled. Rates are not computed here: Prometheus computes them from the
+counters when it scrapes ``/api/kytos/core/metrics``.
+"""
+from bisect import bisect_left
+from threading import Lock
+
+__all__ = ('Counter', 'Gauge', 'Histogram', 'METRICS', 'Metrics')
+
+#: Content type of :meth:`Metrics.expose`.
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+#: Upper bounds, in seconds, of the default histogram buckets.
+DEFAULT_BUCKETS = (.0001, .0005, .001, .005, .01, .05, .1, .5, 1, 5, 10)
+
+
+class Metric:
+    """Base class of the metrics, with one value per set of label values."""
+
+    type = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        """Create a metric without values.
+
+        Args:
+            name (str): Metric name, e.g. ``kytos_events_total``.
+            documentation (str): Help text of the metric.
+            labelnames (list): Names of the labels of the metric.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+        self._values = {}
+
+    def __repr__(self):
+        return f"{type(self).__name__}('{self.name}')"
+
+    def value(self, *labelvalues):
+        """Return the value for the given label values."""
+        return self._values.get(labelvalues, 0)
+
+    def clear(self):
+        """Remove all the values."""
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        """Return a list of (name suffix, label values, value) tuples."""
+        with self._lock:
+            return [('', labels, value)
+                    for labels, value in self._values.items()]
+
+    def expose(self):
+        """Return the metric in Prometheus text format."""
+        lines = [f'# HELP {self.name} {_escape_help(self.documentation)}',
+                 f'# TYPE {self.name} {self.type}']
+        for suffix, labelvalues, value in self.samples():
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f'{self.name}{suffix}{labels} {_format(value)}')
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    """Value that only increases, like the number of events received."""
+
+    type = 'counter'
+
+    def inc(self, *labelvalues, amount=1):
+        """Increment the value for the given label values."""
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues,
+                                                         0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down, like the size of a queue.
+
+    Instead of being set, a gauge can get its values from a function called
+    when the metrics are exposed.
+    """
+
+    type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=()):
+        """Create a gauge without values or function."""
+        super().__init__(name, documentation, labelnames)
+        self._function = None
+
+    def set(self, value, *labelvalues):
+        """Set the value for the given label values."""
+        with self._lock:
+            self._values[labelvalues] = value
+
+    def set_function(self, function):
+        """Get the values from ``function`` instead of :meth:`set`.
+
+        Args:
+            function (callable): Return the value, for gauges without
+                labels, or a dict of label values tuples to values.
+        """
+        self._function = function
+
+    def samples(self):
+        """Return the values set or the values returned by the function."""
+        if self._function is None:
+            return super().samples()
+        values = self._function()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [('', labels, value) for labels, value in values.items()]
+
+
+class Histogram(Metric):
+    """Distribution of observed values, like the duration of listeners."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 buckets=DEFAULT_BUCKETS):
+        """Create a histogram.
+
+        Args:
+            buckets (tuple): Sorted upper bounds of the buckets. A bucket
+                for infinity is always added.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labelvalues):
+        """Count ``value`` in the histogram of the given label values."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labelvalues)
+            if counts is None:
+                # One count per bucket, the infinity bucket and the sum
+                counts = self._values[labelvalues] = [0] * (
+                    len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def value(self, *labelvalues):
+        """Return the number of observations for the given label values."""
+        counts = self._values.get(labelvalues)
+        return sum(counts[:-1]) if counts else 0
+
+    def samples(self):
+        """Return the cumulative buckets, sum and count of each histogram."""
+        with self._lock:
+            values = [(labels, list(counts))
+                      for labels, counts in self._values.items()]
+        samples = []
+        for labels, counts in values:
+            total = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                total += count
+                samples.append(('_bucket', labels + (_format(bound),), total))
+            samples.append(('_sum', labels, counts[-1]))
+            samples.append(('_count', labels, total))
+        return samples
+
+    def expose(self):
+        """Return the histogram in Prometheus text format."""
+        lines = [f'# HELP {self.name} {_escape_help(self.documentation)}',
+                 f'# TYPE {self.name} {self.type}']
+        for suffix, labelvalues, value in self.samples():
+            names = self.labelnames
+            if suffix == '_bucket':
+                names += ('le',)
+            labels = _format_labels(names, labelvalues)
+            lines.append(f'{self.name}{suffix}{labels} {_format(value)}')
+        return '\n'.join(lines)
+
+
+class Metrics:
+    """Set of metrics exposed together."""
+
+    def __init__(self):
+        """Create an empty set of metrics."""
+        self._lock = Lock()
+        self._metrics = {}
+
+    def __getitem__(self, name):
+        return self._metrics[name]
+
+    def __contains__(self, name):
+        return name in self._metrics
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        """Return the metric ``name``, creating it if needed."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f'{name} is already a {metric.type}')
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Return the :class:`Counter` ``name``, creating it if needed."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        """Return the :class:`Gauge` ``name``, creating it if needed."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(),
+                  buckets=DEFAULT_BUCKETS):
+        """Return the :class:`Histogram` ``name``, creating it if needed."""
+        return self._get_or_create(Histogram, name, documentation,
+                                   labelnames, buckets=buckets)
+
+    def expose(self):
+        """Return all the metrics in Prometheus text format."""
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        return '\n'.join(metric.expose() for _, metric in metrics) + '\n'
+
+
+#: Metrics of the controller, exposed in ``/api/kytos/core/metrics``.
+METRICS = Metrics()
+
+
+def _format(value):
+    """Return a number in Prometheus text format."""
+    if isinstance(value, str):
+        return value
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value)
+
+
+def _escape_help(text):
+    """Escape backslashes and line feeds of a help text."""
+    return text.replace('\\', r'\\').replace('\n', r'\n')
+
+
+def _format_labels(names, values):
+    """Return ``{name="value",...}`` or an empty string without labels."""
+    if not names:
+        return ''
+    labels = ','.join('{}="{}"'.format(name, str(value).replace('\\', r'\\')
+                                       .replace('"', r'\"')
+                                       .replace('\n', r'\n'))
+                      for name, value in zip(names, values))
+    return '{' + labels + '}'
@@ -0,0 +1,101 @@
+"""Run a function for each NApp after the NApps it depends on.
+
+The ``napp_dependencies`` of kytos.json form a graph of NApps. Instead of
+loading the NApps one after the other, :func:`run_in_dependency_order` runs
+a function for each NApp in a pool of threads as soon as the function has
+finished for all the NApps it depends on, so independent NApps are loaded
+at the same time.
+"""
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from kytos.core.napps.manager import NAppsManager
+
+__all__ = ('dependency_graph', 'run_in_dependency_order')
+
+LOG = logging.getLogger(__name__)
+
+
+def dependency_graph(napps):
+    """Return the ids of the NApps each NApp depends on.
+
+    Dependencies that are not in ``napps`` are ignored, as they are not
+    going to be loaded.
+
+    Args:
+        napps (list): :class:`~kytos.core.napps.base.NApp` instances.
+
+    Returns:
+        dict: Set of dependency ids by NApp id, in the order of ``napps``.
+
+    """
+    ids = {napp.id for napp in napps}
+    graph = {}
+    for napp in napps:
+        dependencies = set()
+        for uri in napp.napp_dependencies or ():
+            napp_id = '/'.join(NAppsManager.get_napp_fullname_from_uri(uri))
+            if napp_id in ids and napp_id != napp.id:
+                dependencies.add(napp_id)
+        graph[napp.id] = dependencies
+    return graph
+
+
+# pylint: disable=too-many-locals
+def run_in_dependency_order(graph, function, max_workers=1):
+    """Call ``function(node)`` for each node after its dependencies.
+
+    Nodes whose dependencies are done run at the same time, up to
+    ``max_workers``, in the order of ``graph``. If the remaining nodes
+    depend on each other in a cycle, the first of them runs without waiting
+    for its dependencies, so every node runs once.
+
+    Args:
+        graph (dict): Set of dependencies of each node, as returned by
+            :func:`dependency_graph`.
+        function (callable): Called with each node, in a thread of the pool.
+        max_workers (int): Maximum number of calls at the same time.
+
+    Returns:
+        dict: Result of ``function`` for each node, in the order of ``graph``.
+
+    Raises:
+        Exception: The first exception raised by ``function``, after the
+            running calls finish.
+
+    """
+    pending = {node: set(dependencies) & graph.keys()
+               for node, dependencies in graph.items()}
+    dependents = {node: [] for node in graph}
+    for node, dependencies in pending.items():
+        for dependency in dependencies:
+            dependents[dependency].append(node)
+    results = {}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers,
+                            thread_name_prefix='napp_loader') as pool:
+
+        def submit_ready():
+            for node in [node for node, dependencies in pending.items()
+                         if not dependencies]:
+                del pending[node]
+                running[pool.submit(function, node)] = node
+
+        submit_ready()
+        while running or pending:
+            if not running:
+                node = next(iter(pending))
+                LOG.warning('Dependency cycle among %s, running %s first',
+                            ', '.join(pending), node)
+                pending[node] = set()
+                submit_ready()
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                results[node] = future.result()
+                for dependent in dependents[node]:
+                    if dependent in pending:
+                        pending[dependent].discard(node)
+            submit_ready()
+    return {node: results[node] for node in graph}
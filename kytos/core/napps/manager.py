@@ -11,7 +11,14 @@ LOG = logging.getLogger(__name__)
 
 
 class NAppsManager:
-    """Deal with NApps at filesystem level and ask Kytos to (un)load NApps."""
+    """Deal with NApps at filesystem level and ask Kytos to (un)load NApps.
+
+    The installed and enabled NApps and their metadata are read from the
+    NApps dir once and kept in a catalog indexed by NApp id, until
+    :meth:`invalidate_catalog` is called. It is called after each install,
+    uninstall, enable and disable, and by the NAppDirListener when the NApps
+    dir changes.
+    """
 
     def __init__(self, controller=None, base_path=None):
         """Need the controller for configuration paths and (un)loading NApps.
@@ -32,6 +39,32 @@ class NAppsManager:
             self._enabled_path = Path(self._config.napps)
 
         self._installed_path = self._enabled_path / '.installed'
+        #: dict: NApps by id found in each path, filled when first needed.
+        self._catalog = {}
+        #: dict: Content of the kytos.json of each NApp id.
+        self._metadata = {}
+
+    def invalidate_catalog(self, path=None):
+        """Forget the NApps read from ``path``, or everything by default.
+
+        Args:
+            path (pathlib.Path): Path of the enabled or installed NApps.
+        """
+        if path is None:
+            self._catalog = {}
+            self._metadata = {}
+        else:
+            self._catalog = {key: napps for key, napps in self._catalog.items()
+                             if key != path}
+
+    def _get_catalog(self, path):
+        """Return the NApps by id found in ``path``, reading it if needed."""
+        catalog = self._catalog
+        napps = catalog.get(path)
+        if napps is None:
+            napps = {napp.id: napp for napp in self.get_napps_from_path(path)}
+            catalog[path] = napps
+        return napps
 
     def install(self, napp_uri, enable=True):
         """Install and enable a NApp from its repository.
@@ -55,6 +88,7 @@ class NAppsManager:
             dst = self._installed_path / napp.username / napp.name
             self._create_module(dst.parent)
             shutil.move(str(napp_folder), str(dst))
+            self.invalidate_catalog()
         finally:
             if pkg_folder and pkg_folder.exists():
                 shutil.rmtree(str(pkg_folder))
@@ -95,6 +129,7 @@ class NAppsManager:
                 installed.unlink()
             else:
                 shutil.rmtree(str(installed))
+            self.invalidate_catalog()
             LOG.info("NApp uninstalled: %s", napp_id)
         else:
             LOG.warning("Unable to uninstall NApp %s. Already uninstalled.",
@@ -125,6 +160,7 @@ class NAppsManager:
             try:
                 # Create symlink
                 enabled.symlink_to(installed)
+                self.invalidate_catalog(self._enabled_path)
                 LOG.info("NApp enabled: %s", napp_id)
             except FileExistsError:
                 pass  # OK, NApp was already enabled
@@ -151,6 +187,7 @@ class NAppsManager:
 
         try:
             enabled.unlink()
+            self.invalidate_catalog(self._enabled_path)
             LOG.info("NApp disabled: %s", napp_id)
             if self._controller is not None:
                 self._controller.unload_napp(username, napp_name)
@@ -172,15 +209,12 @@ class NAppsManager:
     def is_enabled(self, username, napp_name):
         """Whether a NApp is enabled or not on this controller FS."""
         napp_id = "{}/{}".format(username, napp_name)
-
-        napp = NApp.create_from_uri(napp_id)
-        return napp in self.get_enabled_napps()
+        return napp_id in self._get_catalog(self._enabled_path)
 
     def is_installed(self, username, napp_name):
         """Whether a NApp is installed or not on this controller."""
         napp_id = "{}/{}".format(username, napp_name)
-        napp = NApp.create_from_uri(napp_id)
-        return napp in self.get_all_napps()
+        return napp_id in self._get_catalog(self._installed_path)
 
     @staticmethod
     def get_napp_fullname_from_uri(uri):
@@ -197,7 +231,7 @@ class NAppsManager:
 
     def get_enabled_napps(self):
         """Return all enabled NApps on this controller FS."""
-        enabled = self.get_napps_from_path(self._enabled_path)
+        enabled = list(self._get_catalog(self._enabled_path).values())
         for napp in enabled:
             # We should also check if the NApp is enabled on controller
             napp.enabled = True
@@ -205,13 +239,14 @@ class NAppsManager:
 
     def get_disabled_napps(self):
         """Return all disabled NApps on this controller FS."""
-        installed = set(self.get_installed_napps())
-        enabled = set(self.get_enabled_napps())
-        return list(installed - enabled)
+        enabled = self._get_catalog(self._enabled_path)
+        installed = self._get_catalog(self._installed_path)
+        return [napp for napp_id, napp in installed.items()
+                if napp_id not in enabled]
 
     def get_installed_napps(self):
         """Return all NApps installed on this controller FS."""
-        return self.get_napps_from_path(self._installed_path)
+        return list(self._get_catalog(self._installed_path).values())
 
     def get_napp_metadata(self, username, napp_name, key):
         """Return a value from kytos.json.
@@ -226,11 +261,14 @@ class NAppsManager:
 
         """
         napp_id = "{}/{}".format(username, napp_name)
-        kytos_json = self._installed_path / napp_id / 'kytos.json'
+        metadata = self._metadata
         try:
-            with kytos_json.open() as file_descriptor:
-                meta = json.load(file_descriptor)
-                return meta[key]
+            meta = metadata.get(napp_id)
+            if meta is None:
+                kytos_json = self._installed_path / napp_id / 'kytos.json'
+                with kytos_json.open() as file_descriptor:
+                    meta = metadata[napp_id] = json.load(file_descriptor)
+            return meta[key]
         except (FileNotFoundError, json.JSONDecodeError, KeyError):
             LOG.warning("NApp metadata load failed: %s/kytos.json", napp_id)
             return ''
@@ -57,6 +57,59 @@ class NAppDirListener(RegexMatchingEventHandler):
         relative_path = absolute_path.replace(self.napps_path, '')
         return tuple(relative_path.split('/')[1:3])
 
+    def _get_ui_napp(self, path):
+        """Return the username and napp_name of a file of a NApp ui dir.
+
+        Enabled NApps are links to the installed ones, so the changes to
+        their files are seen in the ``.installed`` dir.
+
+        Args:
+            path(str): Absolute path of the changed file.
+
+        Returns:
+            tuple: Tuple with username and napp_name, or ``None`` if the
+                file is not in the ui dir of a NApp.
+
+        """
+        parts = path.replace(self.napps_path, '').split('/')[1:]
+        if parts[:1] == ['.installed']:
+            parts = parts[1:]
+        if parts[2:3] == ['ui']:
+            return tuple(parts[:2])
+        return None
+
+    def dispatch(self, event):
+        """Invalidate the NApp catalog and handle the event.
+
+        The catalog is invalidated for every change in the NApps dir,
+        including the installed NApps, whose events are not handled except
+        for refreshing their UI files.
+
+        Args:
+            event(watchdog.events.FileSystemEvent): Event received from an
+                observer.
+        """
+        self._controller.napps_manager.invalidate_catalog()
+        paths = event.src_path, getattr(event, 'dest_path', '')
+        if any(regex.match(path) for regex in self.ignore_regexes
+               for path in paths if path):
+            self.on_any_event(event)
+        super().dispatch(event)
+
+    def on_any_event(self, event):
+        """Refresh the UI files of a napp when its ui dir changes.
+
+        Args:
+            event(watchdog.events.FileSystemEvent): Event received from an
+                observer.
+        """
+        napps = {self._get_ui_napp(path)
+                 for path in (event.src_path,
+                              getattr(event, 'dest_path', ''))}
+        napps.discard(None)
+        for napp in napps:
+            self._controller.api_server.ui_manifest.refresh_napp(*napp)
+
     def on_created(self, event):
         """Load a napp from created directory.
 
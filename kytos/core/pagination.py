@@ -0,0 +1,67 @@
+"""Module to page through the entities of the controller with cursors.
+
+:func:`paginate` returns the entities of a mapping sorted by id, starting
+after the id encoded in a cursor. Unlike offsets, cursors keep pointing to
+the right place when entities are added or removed between the requests of
+a client. Only the entities of the page are sorted and returned, so the
+cost of serializing a page does not depend on the size of the topology.
+"""
+import base64
+import binascii
+import heapq
+
+__all__ = ('decode_cursor', 'encode_cursor', 'paginate')
+
+#: Number of entities in a page by default.
+DEFAULT_LIMIT = 100
+#: Maximum number of entities in a page.
+MAX_LIMIT = 1000
+
+
+def encode_cursor(key):
+    """Return an opaque cursor pointing after ``key``."""
+    return base64.urlsafe_b64encode(key.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return the key a cursor points after.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+
+    """
+    try:
+        return base64.b64decode(cursor.encode(), b'-_', validate=True).decode()
+    except (binascii.Error, UnicodeError):
+        raise ValueError(f'Invalid cursor {cursor}') from None
+
+
+def paginate(entities, cursor=None, limit=DEFAULT_LIMIT):
+    """Return a page of entities sorted by key.
+
+    Args:
+        entities (dict): Entities by id, like the mappings of a
+            :class:`~kytos.core.registry.TopologySnapshot`.
+        cursor (str): Cursor returned with the previous page, or ``None``
+            for the first page.
+        limit (int): Maximum number of entities in the page, from 1 to
+            :data:`MAX_LIMIT`.
+
+    Returns:
+        tuple: The list of entities of the page and the cursor of the next
+            page, which is ``None`` in the last page.
+
+    Raises:
+        ValueError: If the cursor or the limit is invalid.
+
+    """
+    if not 0 < limit <= MAX_LIMIT:
+        raise ValueError(f'The limit must be from 1 to {MAX_LIMIT}')
+    keys = list(entities)
+    if cursor:
+        after = decode_cursor(cursor)
+        keys = [key for key in keys if key > after]
+    keys = heapq.nsmallest(limit + 1, keys)
+    next_cursor = encode_cursor(keys[limit - 1]) if len(keys) > limit \
+        else None
+    return [entities[key] for key in keys[:limit]], next_cursor
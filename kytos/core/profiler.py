@@ -0,0 +1,109 @@
+"""Module with a statistical profiler of all the threads of the controller.
+
+The :class:`SamplingProfiler` takes the stack of every thread with
+``sys._current_frames`` at a fixed interval and counts identical stacks, so
+a running controller can be profiled without being restarted under
+cProfile. The result is in the collapsed stack format read by
+``flamegraph.pl`` and https://www.speedscope.app:
+
+.. code-block:: none
+
+    MainThread;kytos.core.kytosd:main;kytos/of_core:handle_stats 42
+
+Frames of NApps are named after the NApp id (``username/napp_name``) and
+the other frames after their module.
+"""
+import sys
+import threading
+from collections import Counter
+from pathlib import PurePath
+from time import monotonic, sleep
+
+__all__ = ('SamplingProfiler',)
+
+
+class SamplingProfiler:
+    """Sample the stacks of all threads and count the collapsed stacks."""
+
+    def __init__(self, interval=0.005):
+        """Create a profiler.
+
+        Args:
+            interval (float): Seconds between two samples.
+        """
+        self.interval = interval
+        #: collections.Counter: Number of samples of each collapsed stack
+        self.stacks = Counter()
+        #: int: Number of times the threads were sampled
+        self.samples = 0
+
+    def sample(self):
+        """Count the current stack of every thread but the calling one."""
+        names = {thread.ident: thread.name
+                 for thread in threading.enumerate()}
+        current = threading.get_ident()
+        # pylint: disable=protected-access
+        for ident, frame in sys._current_frames().items():
+            if ident != current:
+                thread = names.get(ident, str(ident))
+                self.stacks[collapse(thread, frame)] += 1
+        self.samples += 1
+
+    def run(self, duration):
+        """Sample the threads every ``interval`` for ``duration`` seconds."""
+        end = monotonic() + duration
+        while monotonic() < end:
+            self.sample()
+            sleep(self.interval)
+        return self
+
+    def collapsed(self):
+        """Return the sampled stacks in collapsed stack format."""
+        return ''.join(f'{stack} {count}\n'
+                       for stack, count in self.stacks.most_common())
+
+    def by_napp(self):
+        """Return the number of samples in which each NApp was running."""
+        napps = Counter()
+        for stack, count in self.stacks.items():
+            # The first name is the thread name
+            owners = {frame.split(':')[0] for frame in stack.split(';')[1:]}
+            for napp in owners:
+                if '/' in napp:
+                    napps[napp] += count
+        return napps
+
+
+def napp_id(filename):
+    """Return the id of the NApp of a source file or ``None``.
+
+    NApps are in ``.../napps/<username>/<napp_name>/``, both in the
+    controller napps directory and in the ``napps`` package.
+    """
+    parts = PurePath(filename).parts
+    for index in range(len(parts) - 4, -1, -1):
+        if parts[index] == 'napps':
+            username, napp_name = parts[index + 1:index + 3]
+            if not username.startswith(('.', '_')):
+                return f'{username}/{napp_name}'
+    return None
+
+
+def frame_name(frame):
+    """Return the ``owner:function`` name of a frame.
+
+    The owner is the NApp id for NApp frames and the module name otherwise.
+    """
+    code = frame.f_code
+    owner = napp_id(code.co_filename) or frame.f_globals.get('__name__', '?')
+    return f'{owner}:{code.co_name}'
+
+
+def collapse(thread, frame):
+    """Return the stack of ``frame`` as ``thread;outer;...;inner``."""
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    names.append(thread)
+    return ';'.join(reversed(names))
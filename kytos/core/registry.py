@@ -0,0 +1,397 @@
+"""Module with the controller-wide indexes of topology entities."""
+from collections import deque, namedtuple
+from threading import Lock, RLock
+from types import MappingProxyType
+
+from kytos.core.constants import CHANGE_JOURNAL_SIZE
+from kytos.core.exceptions import KytosMetadataIndexDisabled
+from kytos.core.helpers import now
+
+__all__ = ('ChangeJournal', 'EntityRegistry', 'MetadataIndex',
+           'TopologySnapshot')
+
+#: Read-only view of the switches, interfaces and links of the controller.
+#: ``switches`` maps dpids to switches, ``interfaces`` maps dpids to the
+#: ``{port number: Interface}`` of each switch and ``links`` maps link ids to
+#: links. The mappings of a snapshot never change, but the entities are the
+#: live objects. ``version`` is the :class:`ChangeJournal` version when the
+#: snapshot was published; changes after it may already be in the snapshot.
+TopologySnapshot = namedtuple('TopologySnapshot',
+                              ['version', 'switches', 'interfaces', 'links'])
+
+_EMPTY = MappingProxyType({})
+
+
+class ChangeJournal:
+    """Bounded in-memory journal of changes made to topology entities.
+
+    Each change gets a version number from a counter that only increases.
+    Clients keep the version of the last change they have seen and ask for
+    the changes since that version, instead of fetching the whole topology.
+    Only the last ``size`` changes are kept; older versions require a full
+    resynchronization.
+    """
+
+    def __init__(self, size=CHANGE_JOURNAL_SIZE):
+        """Create an empty journal that keeps up to ``size`` changes."""
+        self._lock = Lock()
+        self._changes = deque(maxlen=size)
+        #: int: Version of the last recorded change.
+        self.version = 0
+
+    def __len__(self):
+        return len(self._changes)
+
+    def record(self, entity, action, data=None):
+        """Record a change and return its version.
+
+        Args:
+            entity (GenericEntity): Switch, Interface or Link changed.
+            action (str): What happened to the entity, e.g. ``enabled``.
+            data (dict): JSON serializable details of the change.
+        """
+        with self._lock:
+            self.version += 1
+            self._changes.append({'version': self.version,
+                                  'entity': type(entity).__name__.lower(),
+                                  'id': entity.id,
+                                  'action': action,
+                                  'data': data or {},
+                                  'timestamp': now().timestamp()})
+            return self.version
+
+    def changes_since(self, version):
+        """Return the list of changes made after ``version``.
+
+        Returns:
+            list: Changes in ascending version order, or ``None`` if some of
+                them were already discarded, or ``version`` is unknown, and
+                a full resync is needed.
+
+        """
+        with self._lock:
+            if version > self.version:
+                return None
+            changes = []
+            for change in reversed(self._changes):
+                if change['version'] <= version:
+                    break
+                changes.append(change)
+            oldest = changes[-1]['version'] if changes else self.version + 1
+            if oldest > version + 1:
+                return None
+            changes.reverse()
+            return changes
+
+
+class MetadataIndex:
+    """Inverted index of the metadata of topology entities.
+
+    The index maps each metadata key to its values and each value to the
+    entities that have it, so entities can be found by metadata without
+    scanning all of them. Unhashable values, such as lists and dicts, are
+    indexed only by key.
+    """
+
+    def __init__(self):
+        """Create an empty index."""
+        self._lock = Lock()
+        #: dict: key -> value -> {entity id: entity}
+        self._index = {}
+        #: dict: key -> {entity id: entity} for every value of the key
+        self._keys = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, entity, metadata):
+        """Index the ``metadata`` dict of an entity."""
+        with self._lock:
+            for key, value in metadata.items():
+                self._keys.setdefault(key, {})[entity.id] = entity
+                if _is_hashable(value):
+                    values = self._index.setdefault(key, {})
+                    values.setdefault(value, {})[entity.id] = entity
+
+    def remove(self, entity, metadata):
+        """Remove the ``metadata`` dict of an entity from the index."""
+        with self._lock:
+            for key, value in metadata.items():
+                _discard(self._keys, key, entity.id)
+                values = self._index.get(key)
+                if values is not None and _is_hashable(value):
+                    _discard(values, value, entity.id)
+                    if not values:
+                        del self._index[key]
+
+    def find(self, key, value=None):
+        """Return the list of entities with metadata ``key``.
+
+        Args:
+            key (str): Metadata key.
+            value: If not ``None``, only entities with this value are
+                returned.
+        """
+        with self._lock:
+            if value is None:
+                return list(self._keys.get(key, {}).values())
+            if not _is_hashable(value):
+                return []
+            return list(self._index.get(key, {}).get(value, {}).values())
+
+    def values(self, key):
+        """Return the set of indexed values of metadata ``key``."""
+        with self._lock:
+            return set(self._index.get(key, {}))
+
+
+class EntityRegistry:
+    """Indexes of interfaces and links kept by the controller.
+
+    A switch added to the controller gets a reference to this registry in its
+    :attr:`~kytos.core.switch.Switch.registry` attribute. From then on,
+    :meth:`Switch.update_interface`, :meth:`Switch.remove_interface`,
+    :meth:`Interface.update_link` and assignments to
+    :attr:`Interface.address` keep the indexes consistent, so interface,
+    link and neighbor queries do not need to scan the switches.
+
+    Every change also publishes a new :attr:`snapshot`. The dicts of a
+    published snapshot are never modified: writers copy the dict they change
+    and share the others with the previous snapshot, so readers can iterate
+    a snapshot without locks while the topology changes.
+    """
+
+    def __init__(self, metadata_index=False):
+        """Create empty indexes.
+
+        Args:
+            metadata_index (bool): Whether to keep a :class:`MetadataIndex`.
+        """
+        self._lock = RLock()
+        #: ChangeJournal: Changes made to the entities of the controller.
+        self.journal = ChangeJournal()
+        #: dict: interface id -> Interface
+        self.interfaces = {}
+        #: dict: link id -> Link
+        self.links = {}
+        #: dict: dpid -> {link id: Link} with the links of each switch
+        self.adjacency = {}
+        #: dict: mac address -> Interface
+        self.macs = {}
+        #: MetadataIndex: Metadata of the entities, if enabled.
+        self.metadata_index = MetadataIndex() if metadata_index else None
+        #: TopologySnapshot: Last published view of the topology.
+        self.snapshot = TopologySnapshot(0, _EMPTY, _EMPTY, _EMPTY)
+
+    def __repr__(self):
+        return (f"EntityRegistry({len(self.interfaces)} interfaces, "
+                f"{len(self.links)} links)")
+
+    def add_switch(self, switch):
+        """Start tracking a switch, its interfaces and their links."""
+        with self._lock:
+            switch.registry = self
+            self._index_metadata(switch)
+            for interface in list(switch.interfaces.values()):
+                self.add_interface(interface)
+            self.journal.record(switch, 'added')
+            switches = dict(self.snapshot.switches)
+            switches[switch.dpid] = switch
+            interfaces = dict(self.snapshot.interfaces)
+            interfaces[switch.dpid] = MappingProxyType(switch.interfaces)
+            self._publish(switches=MappingProxyType(switches),
+                          interfaces=MappingProxyType(interfaces))
+
+    def remove_switch(self, switch):
+        """Stop tracking a switch, its interfaces and their links."""
+        with self._lock:
+            switches = dict(self.snapshot.switches)
+            switches.pop(switch.dpid, None)
+            interfaces = dict(self.snapshot.interfaces)
+            interfaces.pop(switch.dpid, None)
+            self._publish(switches=MappingProxyType(switches),
+                          interfaces=MappingProxyType(interfaces))
+            for interface in list(switch.interfaces.values()):
+                self.remove_interface(interface)
+            self.adjacency.pop(switch.dpid, None)
+            self._unindex_metadata(switch)
+            self.journal.record(switch, 'removed')
+            switch.registry = None
+
+    def add_interface(self, interface):
+        """Index an interface and its link, if any."""
+        with self._lock:
+            old = self.interfaces.get(interface.id)
+            if old is not None and old is not interface:
+                self.remove_interface(old)
+            self.interfaces[interface.id] = interface
+            self._index_metadata(interface)
+            if interface.address:
+                self.macs[_mac(interface.address)] = interface
+            if interface.link is not None:
+                self.add_link(interface.link)
+            self._publish_interfaces(interface.switch)
+
+    def remove_interface(self, interface):
+        """Remove an interface and its link from the indexes."""
+        with self._lock:
+            if self.interfaces.get(interface.id) is interface:
+                del self.interfaces[interface.id]
+                self._unindex_metadata(interface)
+            mac = _mac(interface.address)
+            if mac and self.macs.get(mac) is interface:
+                del self.macs[mac]
+            if interface.link is not None:
+                self.remove_link(interface.link)
+            self._publish_interfaces(interface.switch)
+
+    def update_address(self, interface, old_address):
+        """Re-index the address of an interface that was ``old_address``."""
+        with self._lock:
+            if self.interfaces.get(interface.id) is not interface:
+                return
+            old_mac = _mac(old_address)
+            if old_mac and self.macs.get(old_mac) is interface:
+                del self.macs[old_mac]
+            if interface.address:
+                self.macs[_mac(interface.address)] = interface
+
+    def add_link(self, link):
+        """Index a link by id and by the dpids of its endpoints."""
+        with self._lock:
+            if self.links.get(link.id) is not link:
+                links = dict(self.links)
+                links[link.id] = link
+                self.links = links
+                self._publish(links=MappingProxyType(links))
+                self._index_metadata(link)
+            for endpoint in link.endpoint_a, link.endpoint_b:
+                links = self.adjacency.setdefault(endpoint.switch.dpid, {})
+                links[link.id] = link
+
+    def remove_link(self, link):
+        """Remove a link from the indexes."""
+        with self._lock:
+            if link.id in self.links:
+                self._unindex_metadata(self.links[link.id])
+                links = dict(self.links)
+                del links[link.id]
+                self.links = links
+                self._publish(links=MappingProxyType(links))
+            for endpoint in link.endpoint_a, link.endpoint_b:
+                links = self.adjacency.get(endpoint.switch.dpid)
+                if links is None:
+                    continue
+                links.pop(link.id, None)
+                if not links:
+                    del self.adjacency[endpoint.switch.dpid]
+
+    def _publish(self, **fields):
+        """Replace the snapshot by one with the given fields changed."""
+        self.snapshot = self.snapshot._replace(version=self.journal.version,
+                                               **fields)
+
+    def _publish_interfaces(self, switch):
+        """Publish the current interfaces of a switch in the snapshot."""
+        if self.snapshot.switches.get(switch.dpid) is not switch:
+            return
+        interfaces = dict(self.snapshot.interfaces)
+        interfaces[switch.dpid] = MappingProxyType(switch.interfaces)
+        self._publish(interfaces=MappingProxyType(interfaces))
+
+    def _index_metadata(self, entity):
+        """Add the metadata of an entity to the metadata index, if any."""
+        if self.metadata_index is not None:
+            self.metadata_index.add(entity, entity.metadata)
+
+    def _unindex_metadata(self, entity):
+        """Remove the metadata of an entity from the metadata index."""
+        if self.metadata_index is not None:
+            self.metadata_index.remove(entity, entity.metadata)
+
+    def find_by_metadata(self, key, value=None):
+        """Return the entities with metadata ``key`` and ``value``.
+
+        See :meth:`MetadataIndex.find`.
+
+        Raises:
+            KytosMetadataIndexDisabled: If the metadata index is disabled.
+
+        """
+        if self.metadata_index is None:
+            raise KytosMetadataIndexDisabled()
+        return self.metadata_index.find(key, value)
+
+    def apply_metadata(self, entities, metadata=None, remove=(), force=True):
+        """Change the metadata of many entities in one call.
+
+        Args:
+            entities (iterable): Switches, interfaces and links to change.
+            metadata (dict): Metadata to add to every entity.
+            remove (iterable): Metadata keys to remove from every entity.
+            force (bool): Whether existing keys in ``metadata`` are
+                overwritten, as in :meth:`GenericEntity.extend_metadata`.
+
+        Returns:
+            int: Number of entities changed.
+
+        """
+        changed = 0
+        with self._lock:
+            for entity in entities:
+                version = entity.version
+                if remove:
+                    entity.remove_metadata_keys(remove)
+                if metadata:
+                    entity.extend_metadata(metadata, force)
+                changed += entity.version != version
+        return changed
+
+    def get_interface(self, interface_id):
+        """Return the interface with ``interface_id`` or ``None``."""
+        return self.interfaces.get(interface_id)
+
+    def get_interface_by_mac(self, mac):
+        """Return the interface with the ``mac`` address or ``None``."""
+        return self.macs.get(_mac(mac))
+
+    def get_link(self, link_id):
+        """Return the link with ``link_id`` or ``None``."""
+        return self.links.get(link_id)
+
+    def get_links(self, dpid):
+        """Return the list of links with an endpoint in switch ``dpid``."""
+        return list(self.adjacency.get(dpid, {}).values())
+
+    def get_neighbors(self, dpid):
+        """Return the set of dpids linked to switch ``dpid``."""
+        neighbors = set()
+        for link in self.get_links(dpid):
+            for endpoint in link.endpoint_a, link.endpoint_b:
+                if endpoint.switch.dpid != dpid:
+                    neighbors.add(endpoint.switch.dpid)
+        return neighbors
+
+
+def _is_hashable(value):
+    """Return whether ``value`` can be a dict key."""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _discard(mapping, key, entity_id):
+    """Remove ``entity_id`` from ``mapping[key]`` and empty sets."""
+    entities = mapping.get(key)
+    if entities is None:
+        return
+    entities.pop(entity_id, None)
+    if not entities:
+        del mapping[key]
+
+
+def _mac(address):
+    """Return the string of a |hw_address| or the address itself."""
+    return getattr(address, 'value', address)
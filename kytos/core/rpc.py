@@ -0,0 +1,101 @@
+"""Module to send events that are answered by calling a callback.
+
+Some NApps, like storehouse, answer an event by calling the function in its
+``callback`` content with ``(event, data, error)``. The functions of this
+module send such an event and return a :class:`~concurrent.futures.Future`
+resolved by the callback, so the caller can wait for the answer without
+polling, with a timeout, or cancel the request:
+
+.. code-block:: python3
+
+    from kytos.core.rpc import call_event
+
+    box, error = call_event(controller.buffers.app,
+                            'kytos.storehouse.retrieve',
+                            {'namespace': 'kytos.core.auth.users',
+                             'box_id': 'admin'},
+                            timeout=5)
+"""
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from kytos.core.events import KytosEvent
+
+__all__ = ('acall_event', 'call_event', 'request_event')
+
+#: Seconds to wait for the answer of an event by default.
+DEFAULT_TIMEOUT = 10
+
+
+def _create_request(name, content, callback_key):
+    """Return an event whose callback resolves the returned future."""
+    future = Future()
+
+    def callback(_event, data, error):
+        """Resolve the future with the answer, unless it was cancelled."""
+        # Answers after the first one are ignored
+        if not future.done() and future.set_running_or_notify_cancel():
+            future.set_result((data, error))
+
+    content = dict(content or {})
+    content[callback_key] = callback
+    return KytosEvent(name=name, content=content), future
+
+
+def request_event(buffer, name, content=None, callback_key='callback'):
+    """Put an event in a buffer and return a future of its answer.
+
+    Args:
+        buffer (~kytos.core.buffers.KytosEventBuffer): Buffer of the event,
+            usually ``controller.buffers.app``.
+        name (str): Name of the event.
+        content (dict): Content of the event, without the callback.
+        callback_key (str): Content key of the callback.
+
+    Returns:
+        concurrent.futures.Future: Resolved with the ``(data, error)``
+            passed to the callback. Cancelling it makes the callback ignore
+            the answer.
+
+    """
+    event, future = _create_request(name, content, callback_key)
+    buffer.put(event)
+    return future
+
+
+def call_event(buffer, name, content=None, timeout=DEFAULT_TIMEOUT,
+               callback_key='callback'):
+    """Put an event in a buffer and wait for its answer.
+
+    Returns:
+        tuple: The ``(data, error)`` passed to the callback.
+
+    Raises:
+        concurrent.futures.TimeoutError: If the callback is not called in
+            ``timeout`` seconds. The request is cancelled.
+
+    """
+    future = request_event(buffer, name, content, callback_key)
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
+
+
+async def acall_event(buffer, name, content=None, timeout=DEFAULT_TIMEOUT,
+                      callback_key='callback'):
+    """Put an event in a buffer and await its answer.
+
+    Returns:
+        tuple: The ``(data, error)`` passed to the callback.
+
+    Raises:
+        asyncio.TimeoutError: If the callback is not called in ``timeout``
+            seconds. The request is cancelled.
+
+    """
+    event, future = _create_request(name, content, callback_key)
+    await buffer.aput(event)
+    return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
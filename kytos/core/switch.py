@@ -1,10 +1,14 @@
 """Module with main classes related to Switches."""
 import json
 import logging
+from threading import Lock
 
-from kytos.core.common import GenericEntity
-from kytos.core.constants import CONNECTION_TIMEOUT, FLOOD_TIMEOUT
+from kytos.core.common import CachedAttribute, GenericEntity, parse_fields
+from kytos.core.constants import (CONNECTION_TIMEOUT, FLOOD_TABLE_CAPACITY,
+                                  FLOOD_TIMEOUT, MAC_TABLE_CAPACITY,
+                                  MAC_TABLE_TTL)
 from kytos.core.helpers import now
+from kytos.core.tables import FloodTable, FlowTable, MACTable
 
 __all__ = ('Switch',)
 
@@ -48,6 +52,9 @@ class Switch(GenericEntity):
     # pylint: disable=too-many-instance-attributes
     # pylint: disable=too-many-public-methods
 
+    dpid = CachedAttribute()
+    description = CachedAttribute()
+
     def __init__(self, dpid, connection=None, features=None):
         """Contructor of switches have the below parameters.
 
@@ -65,19 +72,27 @@ class Switch(GenericEntity):
         self.sent_xid = None
         self.waiting_for_reply = False
         self.request_timestamp = 0
-        #: Dict associating mac addresses to switch ports.
-        #:      the key of this dict is a mac_address, and the value is a set
+        #: MACTable associating mac addresses to switch ports.
+        #:      the key of this table is a mac_address, and the value is a set
         #:      containing the ports of this switch in which that mac can be
-        #:      found.
-        self.mac2port = {}
+        #:      found. Entries age out after MAC_TABLE_TTL seconds and the
+        #:      least recently learned mac is evicted when the table is full.
+        self.mac2port = MACTable(MAC_TABLE_CAPACITY, MAC_TABLE_TTL)
         #: This flood_table will keep track of flood packets to avoid over
         #:     flooding on the network. Its key is a hash composed by
-        #:     (eth_type, mac_src, mac_dst) and the value is the timestamp of
-        #:     the last flood.
-        self.flood_table = {}
+        #:     (eth_type, mac_src, mac_dst) and the value is the monotonic
+        #:     timestamp of the last flood. Old entries are dropped in bulk,
+        #:     so its size is bounded by 2 * FLOOD_TABLE_CAPACITY.
+        self.flood_table = FloodTable(FLOOD_TIMEOUT / 10**6,
+                                      FLOOD_TABLE_CAPACITY)
         self.interfaces = {}
-        self.flows = []
+        #: Lock: Serializes the writers that replace :attr:`interfaces`.
+        self._interfaces_lock = Lock()
+        self._flows = FlowTable()
         self.description = {}
+        #: :class:`~kytos.core.registry.EntityRegistry` of the controller
+        #: this switch was added to, if any.
+        self.registry = None
 
         if connection:
             connection.switch = self
@@ -99,6 +114,13 @@ class Switch(GenericEntity):
         self.description['software'] = desc.sw_desc.value
         self.description['serial'] = desc.serial_num.value
         self.description['data_path'] = desc.dp_desc.value
+        self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """Discard the cached serialization of the switch and interfaces."""
+        super().invalidate_cache()
+        for interface in self.__dict__.get('interfaces', {}).values():
+            interface.invalidate_cache()
 
     @property
     def id(self):  # pylint: disable=invalid-name
@@ -125,12 +147,14 @@ class Switch(GenericEntity):
         for interface in self.interfaces.values():
             interface.disable()
         self._enabled = False
+        self._notify_change('disabled')
 
     def disconnect(self):
         """Disconnect the switch instance."""
         self.connection.close()
         self.connection = None
         LOG.info("Switch %s is disconnected", self.dpid)
+        self._notify_change('disconnected')
 
     def get_interface_by_port_no(self, port_no):
         """Get interface by port number from Switch instance.
@@ -144,16 +168,47 @@ class Switch(GenericEntity):
 
         return self.interfaces.get(port_no)
 
+    @property
+    def flows(self):
+        """Return the :class:`~.core.tables.FlowTable` of this switch."""
+        return self._flows
+
+    @flows.setter
+    def flows(self, flows):
+        """Replace all the flows of this switch.
+
+        Args:
+            flows (iterable): Flows currently installed in the switch.
+        """
+        self._flows.replace(flows)
+
     def get_flow_by_id(self, flow_id):
         """Return a Flow using the flow_id given. None if not found in flows.
 
         Args:
             flow_id (int): identifier from specific flow stored.
         """
-        for flow in self.flows:
-            if flow_id == flow.id:
-                return flow
-        return None
+        return self._flows.get(flow_id)
+
+    def get_flows_by_cookie(self, cookie):
+        """Return the list of flows with the given cookie."""
+        return self._flows.get_by_cookie(cookie)
+
+    def get_flows_by_table(self, table_id, priority=None):
+        """Return the list of flows of a table, optionally by priority."""
+        return self._flows.get_by_table(table_id, priority)
+
+    def update_flows(self, flows):
+        """Reconcile the flows of this switch with a stats reply.
+
+        Args:
+            flows (iterable): Flows currently installed in the switch.
+
+        Returns:
+            :class:`~.core.tables.FlowDiff`: flows added, removed and kept.
+
+        """
+        return self._flows.replace(flows)
 
     def is_active(self):
         """Return true if the switch connection is alive."""
@@ -174,6 +229,7 @@ class Switch(GenericEntity):
         """
         self.connection = connection
         self.connection.switch = self
+        self._notify_change('reconnected')
 
     def update_features(self, features):
         """Update :attr:`features` attribute."""
@@ -196,20 +252,41 @@ class Switch(GenericEntity):
     def update_interface(self, interface):
         """Update or associate a interface from switch instance.
 
+        The :attr:`interfaces` dict is replaced, not modified, so it can be
+        iterated while interfaces are updated. Writers replace it one at a
+        time, so concurrent updates are not lost.
+
         Args:
             interface (:class:`~kytos.core.switch.Interface`):
                 Interface object to be stored.
         """
-        self.interfaces[interface.port_number] = interface
+        with self._interfaces_lock:
+            interfaces = dict(self.interfaces)
+            interfaces[interface.port_number] = interface
+            self.interfaces = interfaces
+            if self.registry is not None:
+                self.registry.add_interface(interface)
+        self._notify_change('interface_added', interface=interface.id)
 
     def remove_interface(self, interface):
         """Remove a interface from switch instance.
 
+        The mac addresses learned on the interface are also removed from the
+        mac table. As in :meth:`update_interface`, the :attr:`interfaces`
+        dict is replaced.
+
         Args:
             interface (:class:`~kytos.core.switch.Interface`):
                 Interface object to be removed.
         """
-        del self.interfaces[interface.port_number]
+        with self._interfaces_lock:
+            interfaces = dict(self.interfaces)
+            del interfaces[interface.port_number]
+            self.interfaces = interfaces
+            if self.registry is not None:
+                self.registry.remove_interface(interface)
+        self.mac2port.remove_port(interface.port_number)
+        self._notify_change('interface_removed', interface=interface.id)
 
     def update_mac_table(self, mac, port_number):
         """Link the mac address with a port number.
@@ -218,10 +295,7 @@ class Switch(GenericEntity):
             mac (|hw_address|): mac address from switch.
             port (int): port linked in mac address.
         """
-        if mac.value in self.mac2port:
-            self.mac2port[mac.value].add(port_number)
-        else:
-            self.mac2port[mac.value] = set([port_number])
+        self.mac2port.learn(mac.value, port_number)
 
     def last_flood(self, ethernet_frame):
         """Return the timestamp when the ethernet_frame was flooded.
@@ -232,14 +306,11 @@ class Switch(GenericEntity):
             ethernet_frame (|ethernet|): Ethernet instance to be verified.
 
         Returns:
-            datetime.datetime.now:
-                Last time when the ethernet_frame was flooded.
+            float: Monotonic timestamp of the last time when the
+                ethernet_frame was flooded. None if it was not flooded.
 
         """
-        try:
-            return self.flood_table[ethernet_frame.get_hash()]
-        except KeyError:
-            return None
+        return self.flood_table.last_flood(ethernet_frame.get_hash())
 
     def should_flood(self, ethernet_frame):
         """Verify if the ethernet frame should flood.
@@ -251,10 +322,7 @@ class Switch(GenericEntity):
             bool: True if the ethernet_frame should flood.
 
         """
-        last_flood = self.last_flood(ethernet_frame)
-        diff = (now() - last_flood).microseconds
-
-        return last_flood is None or diff > FLOOD_TIMEOUT
+        return self.flood_table.should_flood(ethernet_frame.get_hash())
 
     def update_flood_table(self, ethernet_frame):
         """Update a flood table using the given ethernet frame.
@@ -262,7 +330,11 @@ class Switch(GenericEntity):
         Args:
             ethernet_frame (|ethernet|): Ethernet frame to be updated.
         """
-        self.flood_table[ethernet_frame.get_hash()] = now()
+        self.flood_table.mark_flooded(ethernet_frame.get_hash())
+
+    def flood_table_stats(self):
+        """Return a dict with the statistics of the flood table."""
+        return self.flood_table.stats()
 
     def where_is_mac(self, mac):
         """Return all ports from specific mac address.
@@ -274,12 +346,13 @@ class Switch(GenericEntity):
             :class:`list`: A list of ports. None otherswise.
 
         """
-        try:
-            return list(self.mac2port[mac.value])
-        except KeyError:
-            return None
+        return self.mac2port.ports(mac.value)
+
+    def mac_table_stats(self):
+        """Return a dict with the occupancy statistics of the mac table."""
+        return self.mac2port.stats()
 
-    def as_dict(self):
+    def as_dict(self, fields=None):
         """Return a dictionary with switch attributes.
 
         Example of output:
@@ -303,32 +376,58 @@ class Switch(GenericEntity):
                 'enabled': False
                 }
 
+        Args:
+            fields (str, list or dict): Fields to return, as accepted by
+                :func:`~kytos.core.common.parse_fields`, e.g.
+                ``'id,active,interfaces.name'``. All fields by default.
+
         Returns:
             dict: Dictionary filled with interface attributes.
 
         """
-        connection = ""
-        if self.connection is not None:
-            address = self.connection.address
-            port = self.connection.port
-            connection = "{}:{}".format(address, port)
-
+        if fields is not None:
+            return self._project(parse_fields(fields), self._build_dict, {
+                'connection': lambda _: self._connection_address(),
+                'ofp_version': lambda _: self.ofp_version,
+                'interfaces': lambda subfields: {
+                    i.id: i.as_dict(subfields)
+                    for i in self.interfaces.values()},
+                'metadata': lambda _: self.metadata,
+                'active': lambda _: self.is_active(),
+                'enabled': lambda _: self.is_enabled()})
+        switch_dict = self._cached_dict(self._build_dict)
+        switch_dict['connection'] = self._connection_address()
+        switch_dict['ofp_version'] = self.ofp_version
+        switch_dict['interfaces'] = {i.id: i.as_dict()
+                                     for i in self.interfaces.values()}
+        switch_dict['metadata'] = self.metadata
+        switch_dict['active'] = self.is_active()
+        switch_dict['enabled'] = self.is_enabled()
+        return switch_dict
+
+    def _build_dict(self):
+        """Return the switch dict with only the attributes to be cached."""
         return {'id': self.id,
                 'name': self.id,
                 'dpid': self.dpid,
-                'connection': connection,
-                'ofp_version': self.ofp_version,
+                'connection': None,
+                'ofp_version': None,
                 'type': 'switch',
                 'manufacturer': self.description.get('manufacturer', ''),
                 'serial': self.description.get('serial', ''),
                 'hardware': self.description.get('hardware', ''),
                 'software': self.description.get('software'),
                 'data_path': self.description.get('data_path', ''),
-                'interfaces': {i.id: i.as_dict()
-                               for i in self.interfaces.values()},
-                'metadata': self.metadata,
-                'active': self.is_active(),
-                'enabled': self.is_enabled()}
+                'interfaces': None,
+                'metadata': None,
+                'active': None,
+                'enabled': None}
+
+    def _connection_address(self):
+        """Return the "address:port" of the connection or an empty string."""
+        if self.connection is None:
+            return ""
+        return "{}:{}".format(self.connection.address, self.connection.port)
 
     def as_json(self):
         """Return JSON with switch's attributes.
@@ -353,7 +452,15 @@ class Switch(GenericEntity):
             string: JSON filled with switch's attributes.
 
         """
-        return json.dumps(self.as_dict())
+        interfaces = ', '.join(json.dumps(i.id) + ': ' + i.as_json()
+                               for i in self.interfaces.values())
+        dynamic = {'connection': json.dumps(self._connection_address()),
+                   'ofp_version': json.dumps(self.ofp_version),
+                   'interfaces': '{' + interfaces + '}',
+                   'metadata': json.dumps(self.metadata),
+                   'active': json.dumps(self.is_active()),
+                   'enabled': json.dumps(self.is_enabled())}
+        return self._cached_json(self._build_dict, dynamic)
 
     @classmethod
     def from_dict(cls, switch_dict):
@@ -0,0 +1,454 @@
+"""Module with the bounded tables kept by each Switch."""
+from collections import OrderedDict, namedtuple
+from collections.abc import MutableMapping
+from time import monotonic
+
+__all__ = ('FloodTable', 'FlowDiff', 'FlowTable', 'MACTable')
+
+#: Result of :meth:`FlowTable.diff` and :meth:`FlowTable.replace`. Each field
+#: is a list of flows: the ``added`` ones are not in the table, the ``removed``
+#: ones are in the table but not in the new flows and the ``kept`` ones are the
+#: new flows whose id is already in the table.
+FlowDiff = namedtuple('FlowDiff', ['added', 'removed', 'kept'])
+
+
+class MACTable(MutableMapping):
+    """MAC learning table with capacity limit, LRU eviction and aging.
+
+    The table maps a mac address to the set of ports of the switch in which
+    that mac can be found. Each (mac, port) entry has its own timestamp, taken
+    from a monotonic clock, and is considered expired ``ttl`` seconds after it
+    was last learned. Expired entries are dropped lazily when looked up,
+    before the table is iterated or counted, oldest first when a new mac is
+    learned, and in bulk by :meth:`expire`, so no timer is needed.
+
+    When a new mac is learned and the table is full, the least recently
+    learned mac is evicted.
+    """
+
+    def __init__(self, capacity, ttl):
+        """Create an empty table.
+
+        Args:
+            capacity (int): Maximum number of mac addresses in the table.
+            ttl (int, float): Seconds an entry lives without being learned
+                again. Use ``None`` to disable aging.
+        """
+        self.capacity = capacity
+        self.ttl = ttl
+        #: OrderedDict: mac -> {port: timestamp}, least recent first.
+        self._table = OrderedDict()
+        #: dict: port -> set of macs, used to purge a port in bulk.
+        self._ports = {}
+        self.evictions = 0
+        self.expirations = 0
+
+    def __repr__(self):
+        return f"MACTable({len(self._table)}/{self.capacity})"
+
+    def __getitem__(self, mac):
+        ports = self._live_ports(mac)
+        if not ports:
+            raise KeyError(mac)
+        return set(ports)
+
+    def __setitem__(self, mac, ports):
+        self._discard_mac(mac)
+        for port in ports:
+            self.learn(mac, port)
+
+    def __delitem__(self, mac):
+        if mac not in self:
+            raise KeyError(mac)
+        self._discard_mac(mac)
+
+    def __iter__(self):
+        self.expire()
+        return iter(list(self._table))
+
+    def __len__(self):
+        self.expire()
+        return len(self._table)
+
+    def __contains__(self, mac):
+        return bool(self._live_ports(mac))
+
+    def learn(self, mac, port):
+        """Associate ``mac`` with ``port``, refreshing its timestamp."""
+        timestamp = monotonic()
+        entry = self._table.get(mac)
+        if entry is None:
+            if self.ttl is not None:
+                self._expire_oldest(timestamp)
+            if len(self._table) >= self.capacity:
+                self._evict()
+            entry = self._table[mac] = {}
+        else:
+            self._table.move_to_end(mac)
+        entry[port] = timestamp
+        self._ports.setdefault(port, set()).add(mac)
+
+    def ports(self, mac):
+        """Return a list with the live ports of ``mac`` or ``None``."""
+        ports = self._live_ports(mac)
+        return list(ports) if ports else None
+
+    def remove_port(self, port):
+        """Remove all the entries learned on ``port``.
+
+        Returns:
+            int: Number of macs that were associated with the port.
+
+        """
+        macs = self._ports.pop(port, set())
+        for mac in macs:
+            entry = self._table.get(mac)
+            if entry is None:
+                continue
+            entry.pop(port, None)
+            if not entry:
+                del self._table[mac]
+        return len(macs)
+
+    def expire(self):
+        """Remove all expired entries.
+
+        Returns:
+            int: Number of (mac, port) entries removed.
+
+        """
+        if self.ttl is None:
+            return 0
+        removed = 0
+        timestamp = monotonic()
+        for mac in list(self._table):
+            removed += self._expire_mac(mac, timestamp)
+        return removed
+
+    def stats(self):
+        """Return a dict with the table occupancy statistics."""
+        self.expire()
+        return {'macs': len(self._table),
+                'entries': sum(len(ports) for ports in self._table.values()),
+                'capacity': self.capacity,
+                'ttl': self.ttl,
+                'evictions': self.evictions,
+                'expirations': self.expirations}
+
+    def _live_ports(self, mac):
+        """Return the entry of ``mac`` after dropping expired ports."""
+        if mac not in self._table:
+            return None
+        if self.ttl is not None:
+            self._expire_mac(mac, monotonic())
+        return self._table.get(mac)
+
+    def _expire_mac(self, mac, timestamp):
+        """Drop the expired ports of ``mac``, and ``mac`` if none is left."""
+        entry = self._table[mac]
+        expired = [port for port, learned_at in entry.items()
+                   if timestamp - learned_at > self.ttl]
+        for port in expired:
+            del entry[port]
+            self._discard_port(port, mac)
+        if not entry:
+            del self._table[mac]
+        self.expirations += len(expired)
+        return len(expired)
+
+    def _expire_oldest(self, timestamp):
+        """Drop the least recently learned macs while they are expired.
+
+        The macs are kept in learning order, so the scan stops at the first
+        live mac and the cost is spread over the calls to :meth:`learn`.
+        """
+        while self._table:
+            mac = next(iter(self._table))
+            if timestamp - max(self._table[mac].values()) <= self.ttl:
+                break
+            self._expire_mac(mac, timestamp)
+
+    def _evict(self):
+        """Remove the least recently learned mac."""
+        mac, entry = self._table.popitem(last=False)
+        for port in entry:
+            self._discard_port(port, mac)
+        self.evictions += 1
+
+    def _discard_mac(self, mac):
+        entry = self._table.pop(mac, {})
+        for port in entry:
+            self._discard_port(port, mac)
+
+    def _discard_port(self, port, mac):
+        macs = self._ports.get(port)
+        if macs is not None:
+            macs.discard(mac)
+            if not macs:
+                del self._ports[port]
+
+
+class FloodTable(MutableMapping):
+    """Flood suppression table with bounded memory.
+
+    The table maps a frame hash, composed by (eth_type, mac_src, mac_dst), to
+    the monotonic timestamp of its last flood. A frame should only be flooded
+    again after ``window`` seconds.
+
+    Entries are kept in two generations. Every ``window`` seconds, or when the
+    current generation reaches ``capacity`` entries, the current generation
+    becomes the previous one and the old previous generation is dropped at
+    once. So the table never holds more than ``2 * capacity`` entries and no
+    per-entry expiry scan is ever needed.
+    """
+
+    def __init__(self, window, capacity):
+        """Create an empty table.
+
+        Args:
+            window (int, float): Seconds during which a frame already flooded
+                is not flooded again.
+            capacity (int): Maximum number of entries in each generation.
+        """
+        self.window = window
+        self.capacity = capacity
+        self._current = {}
+        self._previous = {}
+        self._rotated_at = monotonic()
+        self.flooded = 0
+        self.suppressed = 0
+        self.rotations = 0
+
+    def __repr__(self):
+        return f"FloodTable({len(self)}/{2 * self.capacity})"
+
+    def __getitem__(self, frame_hash):
+        self._rotate_if_needed(monotonic())
+        try:
+            return self._current[frame_hash]
+        except KeyError:
+            return self._previous[frame_hash]
+
+    def __setitem__(self, frame_hash, timestamp):
+        self._rotate_if_needed(monotonic())
+        self._previous.pop(frame_hash, None)
+        self._current[frame_hash] = timestamp
+        if len(self._current) >= self.capacity:
+            self._rotate(monotonic())
+
+    def __delitem__(self, frame_hash):
+        found = False
+        for generation in self._current, self._previous:
+            if generation.pop(frame_hash, None) is not None:
+                found = True
+        if not found:
+            raise KeyError(frame_hash)
+
+    def __iter__(self):
+        self._rotate_if_needed(monotonic())
+        return iter(list(self._current) + list(self._previous))
+
+    def __len__(self):
+        self._rotate_if_needed(monotonic())
+        return len(self._current) + len(self._previous)
+
+    def last_flood(self, frame_hash):
+        """Return the timestamp of the last flood of a frame or ``None``."""
+        return self.get(frame_hash)
+
+    def should_flood(self, frame_hash):
+        """Return whether a frame was not flooded in the last window.
+
+        Suppressed floods are counted in :attr:`suppressed`.
+        """
+        last_flood = self.last_flood(frame_hash)
+        if last_flood is None or monotonic() - last_flood > self.window:
+            return True
+        self.suppressed += 1
+        return False
+
+    def mark_flooded(self, frame_hash):
+        """Register that a frame was flooded now."""
+        self[frame_hash] = monotonic()
+        self.flooded += 1
+
+    def stats(self):
+        """Return a dict with the table statistics."""
+        return {'entries': len(self),
+                'capacity': self.capacity,
+                'window': self.window,
+                'flooded': self.flooded,
+                'suppressed': self.suppressed,
+                'rotations': self.rotations}
+
+    def _rotate_if_needed(self, timestamp):
+        elapsed = timestamp - self._rotated_at
+        if elapsed >= 2 * self.window:
+            self._previous = {}
+            self._current = {}
+            self._rotated_at = timestamp
+            self.rotations += 1
+        elif elapsed >= self.window:
+            self._rotate(timestamp)
+
+    def _rotate(self, timestamp):
+        self._previous = self._current
+        self._current = {}
+        self._rotated_at = timestamp
+        self.rotations += 1
+
+
+class FlowTable:
+    """Flows installed in a switch, indexed by id, cookie, table and priority.
+
+    The table keeps the insertion order and can be iterated like the list
+    previously used in :attr:`Switch.flows`. Flows must have the ``id``,
+    ``cookie``, ``table_id`` and ``priority`` attributes; missing cookie,
+    table or priority are indexed as ``None``.
+
+    Secondary indexes only keep flow ids, which are shared with the main
+    index, so they add little memory to large tables.
+    """
+
+    __slots__ = ('_flows', '_by_cookie', '_by_table')
+
+    def __init__(self, flows=()):
+        """Create a table with the given flows."""
+        #: dict: flow id -> flow
+        self._flows = {}
+        #: dict: cookie -> {flow id: None}
+        self._by_cookie = {}
+        #: dict: table_id -> {priority: {flow id: None}}
+        self._by_table = {}
+        for flow in flows:
+            self.add(flow)
+
+    def __repr__(self):
+        return f"FlowTable({len(self._flows)} flows)"
+
+    def __len__(self):
+        return len(self._flows)
+
+    def __iter__(self):
+        return iter(list(self._flows.values()))
+
+    def __contains__(self, flow):
+        return getattr(flow, 'id', flow) in self._flows
+
+    def __getitem__(self, index):
+        """Return flows by position, as in a list."""
+        return list(self._flows.values())[index]
+
+    def __eq__(self, other):
+        if isinstance(other, FlowTable):
+            other = list(other)
+        if isinstance(other, (list, tuple)):
+            return list(self._flows.values()) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def add(self, flow):
+        """Add a flow, replacing the flow with the same id, if any."""
+        if flow.id in self._flows:
+            self._unindex(self._flows[flow.id])
+        self._flows[flow.id] = flow
+        self._by_cookie.setdefault(_cookie(flow), {})[flow.id] = None
+        priorities = self._by_table.setdefault(_table_id(flow), {})
+        priorities.setdefault(_priority(flow), {})[flow.id] = None
+
+    #: Same as :meth:`add`. Kept for code that used a list of flows.
+    append = add
+
+    def remove(self, flow_id):
+        """Remove and return the flow with ``flow_id``, or ``None``."""
+        flow = self._flows.pop(flow_id, None)
+        if flow is not None:
+            self._unindex(flow)
+        return flow
+
+    def clear(self):
+        """Remove all flows."""
+        self._flows = {}
+        self._by_cookie = {}
+        self._by_table = {}
+
+    def get(self, flow_id):
+        """Return the flow with ``flow_id`` or ``None``."""
+        return self._flows.get(flow_id)
+
+    def get_by_cookie(self, cookie):
+        """Return the list of flows with ``cookie``."""
+        return [self._flows[flow_id]
+                for flow_id in self._by_cookie.get(cookie, ())]
+
+    def get_by_table(self, table_id, priority=None):
+        """Return the flows of a table, optionally with a given priority."""
+        priorities = self._by_table.get(table_id, {})
+        if priority is not None:
+            ids = priorities.get(priority, ())
+        else:
+            ids = [flow_id for flow_ids in priorities.values()
+                   for flow_id in flow_ids]
+        return [self._flows[flow_id] for flow_id in ids]
+
+    def diff(self, flows):
+        """Compare the table with ``flows`` in a single pass.
+
+        Returns:
+            FlowDiff: flows that would be added, removed and kept if the
+                table were replaced by ``flows``.
+
+        """
+        added, kept, seen = [], [], set()
+        for flow in flows:
+            seen.add(flow.id)
+            if flow.id in self._flows:
+                kept.append(flow)
+            else:
+                added.append(flow)
+        removed = [flow for flow_id, flow in self._flows.items()
+                   if flow_id not in seen]
+        return FlowDiff(added, removed, kept)
+
+    def replace(self, flows):
+        """Replace all the flows of the table, e.g., after a stats reply.
+
+        Returns:
+            FlowDiff: the same as :meth:`diff` before the replacement.
+
+        """
+        flows = list(flows)
+        result = self.diff(flows)
+        self.clear()
+        for flow in flows:
+            self.add(flow)
+        return result
+
+    def _unindex(self, flow):
+        cookie = _cookie(flow)
+        flow_ids = self._by_cookie.get(cookie, {})
+        flow_ids.pop(flow.id, None)
+        if not flow_ids:
+            self._by_cookie.pop(cookie, None)
+
+        table_id, priority = _table_id(flow), _priority(flow)
+        priorities = self._by_table.get(table_id, {})
+        flow_ids = priorities.get(priority, {})
+        flow_ids.pop(flow.id, None)
+        if not flow_ids:
+            priorities.pop(priority, None)
+        if not priorities:
+            self._by_table.pop(table_id, None)
+
+
+def _cookie(flow):
+    return getattr(flow, 'cookie', None)
+
+
+def _table_id(flow):
+    return getattr(flow, 'table_id', None)
+
+
+def _priority(flow):
+    return getattr(flow, 'priority', None)
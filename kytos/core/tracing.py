@@ -0,0 +1,195 @@
+"""Module with the opt-in tracing of the events of the controller.
+
+When tracing is enabled in kytos.conf, a sample of the events created
+without a parent event get an :class:`EventTrace`. The trace is stamped with
+monotonic nanoseconds when the event is created, put in and removed from a
+buffer, dispatched, sent to a switch and handled by each listener. Events
+created while a listener handles a traced event, like a FlowMod sent in
+reply to a PacketIn, are traced too and linked to their parent.
+
+The traces are exported in the Chrome trace event format, which can be
+opened in ``chrome://tracing`` or https://ui.perfetto.dev. Each traced root
+event is a process and each event caused by it is a thread of the process.
+"""
+import json
+import logging
+import random
+from collections import deque
+from itertools import count
+from threading import Lock, local
+from time import monotonic
+
+__all__ = ('EventTrace', 'TRACER', 'Tracer')
+
+LOG = logging.getLogger(__name__)
+
+
+class CurrentEvent(local):
+    """The event being handled by a listener in the current thread.
+
+    It has the interface of a :class:`contextvars.ContextVar`, which is not
+    available in Python 3.6. The listeners of an event run in the thread
+    that dispatches it or in their own threads, never in asyncio tasks that
+    share a thread, so a thread-local value is enough.
+    """
+
+    event = None
+
+    def get(self):
+        """Return the current event or ``None``."""
+        return self.event
+
+    def set(self, event):
+        """Set the current event and return the token to reset it."""
+        token, self.event = self.event, event
+        return token
+
+    def reset(self, token):
+        """Restore the current event from before :meth:`set`."""
+        self.event = token
+
+
+#: The event being handled by a listener in the current thread.
+CURRENT_EVENT = CurrentEvent()
+
+
+def monotonic_ns():
+    """Return the monotonic clock in nanoseconds, as in Python 3.7+."""
+    return int(monotonic() * 1e9)
+
+
+class EventTrace:
+    """Timestamps of the stages of a traced event."""
+
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'stamps')
+
+    def __init__(self, trace_id, span_id, parent_id, name):
+        """Create a trace stamped as created now.
+
+        Args:
+            trace_id (int): Id of the root event trace.
+            span_id (int): Id of this event.
+            parent_id (int): Id of the event that caused this one, if any.
+            name (str): Name of the event.
+        """
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        #: list: (stage, monotonic nanoseconds) in the order they happened
+        self.stamps = [('created', monotonic_ns())]
+
+    def __repr__(self):
+        return (f"EventTrace({self.trace_id}, {self.span_id}, "
+                f"{self.parent_id}, {self.name!r})")
+
+    def mark(self, stage):
+        """Stamp the current time for ``stage``."""
+        self.stamps.append((stage, monotonic_ns()))
+
+    def chrome_events(self):
+        """Return the Chrome trace events of this trace.
+
+        Each stage is a complete event lasting until the next stamp.
+        """
+        stamps = list(self.stamps)
+        events = []
+        args = {'event': self.name, 'span': self.span_id,
+                'parent': self.parent_id}
+        for (stage, start), (_, end) in zip(stamps, stamps[1:]):
+            events.append({'name': stage, 'cat': self.name, 'ph': 'X',
+                           'ts': start / 1000, 'dur': (end - start) / 1000,
+                           'pid': self.trace_id, 'tid': self.span_id,
+                           'args': args})
+        stage, end = stamps[-1]
+        events.append({'name': stage, 'cat': self.name, 'ph': 'i', 's': 't',
+                       'ts': end / 1000, 'pid': self.trace_id,
+                       'tid': self.span_id, 'args': args})
+        return events
+
+
+class Tracer:
+    """Sample events to be traced and keep their traces in memory."""
+
+    def __init__(self, enabled=False, sample_rate=0.01, max_traces=10000):
+        """Create a tracer.
+
+        Args:
+            enabled (bool): Whether events are traced.
+            sample_rate (float): Fraction of the root events traced.
+            max_traces (int): Number of event traces kept; the oldest ones
+                are discarded.
+        """
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self._ids = count(1)
+        self._lock = Lock()
+        self._traces = deque(maxlen=max_traces)
+
+    def __len__(self):
+        return len(self._traces)
+
+    def configure(self, enabled, sample_rate=None, max_traces=None):
+        """Change the tracer options, keeping the recorded traces."""
+        self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        if max_traces is not None:
+            with self._lock:
+                self._traces = deque(self._traces, maxlen=max_traces)
+
+    def start(self, event):
+        """Return the trace of a new event or ``None`` if not traced.
+
+        Events created while a traced event is handled are always traced, in
+        the trace of that event. Other events are sampled.
+        """
+        if not self.enabled:
+            return None
+        parent = CURRENT_EVENT.get()
+        parent_trace = getattr(parent, 'trace', None)
+        if parent is not None:
+            if parent_trace is None:
+                return None
+            trace_id, parent_id = parent_trace.trace_id, parent_trace.span_id
+        elif random.random() < self.sample_rate:
+            trace_id, parent_id = None, None
+        else:
+            return None
+        span_id = next(self._ids)
+        trace = EventTrace(trace_id or span_id, span_id, parent_id,
+                           event.name)
+        with self._lock:
+            self._traces.append(trace)
+        return trace
+
+    def clear(self):
+        """Discard all the recorded traces."""
+        with self._lock:
+            self._traces.clear()
+
+    def chrome_trace(self):
+        """Return the recorded traces in Chrome trace event format."""
+        with self._lock:
+            traces = list(self._traces)
+        events = []
+        for trace in traces:
+            events.extend(trace.chrome_events())
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export(self, path):
+        """Write the recorded traces to ``path`` in Chrome trace format."""
+        with open(path, 'w') as trace_file:
+            json.dump(self.chrome_trace(), trace_file)
+        LOG.info('%d event traces exported to %s', len(self), path)
+
+
+#: Tracer of the events of the controller.
+TRACER = Tracer()
+
+
+def mark(event, stage):
+    """Stamp ``stage`` in the trace of ``event``, if it is traced."""
+    trace = getattr(event, 'trace', None)
+    if isinstance(trace, EventTrace):
+        trace.mark(stage)
@@ -0,0 +1,168 @@
+"""Module with the in-memory manifest of the UI files of the NApps.
+
+The web UI asks for the components of a section and for the files of the
+NApps on every page load. Instead of listing and checking the NApps dir in
+each request, :class:`UIManifest` keeps the files of the ``ui`` dir of every
+NApp, with their ETags and, for small files, their content. It is built when
+the API starts and each NApp is refreshed when it is loaded, unloaded or
+changed in the NApps dir.
+"""
+import mimetypes
+import os
+from collections import namedtuple
+from threading import Lock
+from types import MappingProxyType
+
+from werkzeug.http import generate_etag
+
+__all__ = ('StaticFile', 'UIManifest')
+
+#: Maximum size of a file whose content is kept in memory, in bytes.
+MAX_CACHED_FILE_SIZE = 512 * 1024
+
+#: File of the ``ui`` dir of a NApp. ``data`` is the content of the file, or
+#: ``None`` if it is larger than :data:`MAX_CACHED_FILE_SIZE` and must be read
+#: from ``path``.
+StaticFile = namedtuple('StaticFile', ['path', 'mimetype', 'etag', 'data'])
+
+#: Files by NApp, components by section and version of the manifest.
+_State = namedtuple('_State', ['napps', 'components', 'version'])
+
+
+class UIManifest:
+    """Files of the ``ui`` dir of each NApp in the NApps dir.
+
+    Readers get the current state without locks: every change publishes new
+    dicts and the published ones are never modified.
+    """
+
+    def __init__(self, napps_dir=None):
+        """Create an empty manifest of the NApps in ``napps_dir``."""
+        self.napps_dir = napps_dir
+        self._lock = Lock()
+        self._state = _State(MappingProxyType({}), {}, 0)
+
+    @property
+    def version(self):
+        """Return how many times the manifest changed."""
+        return self._state.version
+
+    def scan(self):
+        """Rebuild the manifest with all the NApps of the NApps dir."""
+        napps = {}
+        for username in _list_dirs(self.napps_dir):
+            user_dir = os.path.join(self.napps_dir, username)
+            for napp_name in _list_dirs(user_dir):
+                files = self._scan_napp(username, napp_name)
+                if files:
+                    napps[(username, napp_name)] = files
+        with self._lock:
+            self._publish(napps)
+
+    def refresh_napp(self, username, napp_name):
+        """Read the ``ui`` dir of a NApp again, removing it if missing."""
+        files = self._scan_napp(username, napp_name)
+        with self._lock:
+            napps = dict(self._state.napps)
+            if files:
+                napps[(username, napp_name)] = files
+            elif napps.pop((username, napp_name), None) is None:
+                return
+            self._publish(napps)
+
+    def get_file(self, username, napp_name, filename):
+        """Return the :class:`StaticFile` of a NApp or ``None``.
+
+        Args:
+            username (str): NApp username.
+            napp_name (str): NApp name.
+            filename (str): Path of the file relative to the ``ui`` dir.
+        """
+        return self._state.napps.get((username, napp_name), {}).get(filename)
+
+    def get_components(self, section_name):
+        """Return the UI components of a section, or of all with ``all``.
+
+        The component name has the following structure:
+        ``{username}-{nappname}-{component-section}-{filename}``.
+
+        Returns:
+            list: Dicts with the ``name`` and ``url`` of each component.
+
+        """
+        state = self._state
+        components = state.components.get(section_name)
+        if components is None:
+            components = _find_components(state.napps, section_name)
+            state.components[section_name] = components
+        return components
+
+    def _publish(self, napps):
+        """Replace the state by a new one with ``napps``."""
+        self._state = _State(MappingProxyType(napps), {},
+                             self._state.version + 1)
+
+    def _scan_napp(self, username, napp_name):
+        """Return the files of the ``ui`` dir of a NApp by relative path."""
+        if self.napps_dir is None:
+            return {}
+        ui_dir = os.path.join(self.napps_dir, username, napp_name, 'ui')
+        files = {}
+        for dirpath, dirnames, filenames in os.walk(ui_dir, followlinks=True):
+            dirnames[:] = [name for name in dirnames
+                           if not name.startswith('.')]
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    static = _read_file(path)
+                except OSError:
+                    continue
+                relative = os.path.relpath(path, ui_dir)
+                files[relative.replace(os.sep, '/')] = static
+        return MappingProxyType(files)
+
+
+def _list_dirs(path):
+    """Return the names of the visible dirs in ``path``."""
+    if not path:
+        return []
+    try:
+        with os.scandir(path) as entries:
+            return sorted(entry.name for entry in entries
+                          if not entry.name.startswith('.') and
+                          entry.is_dir())
+    except OSError:
+        return []
+
+
+def _read_file(path):
+    """Return the :class:`StaticFile` of a file."""
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    stat = os.stat(path)
+    if stat.st_size > MAX_CACHED_FILE_SIZE:
+        etag = f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+        return StaticFile(path, mimetype, etag, None)
+    with open(path, 'rb') as file:
+        data = file.read()
+    return StaticFile(path, mimetype, generate_etag(data), data)
+
+
+def _find_components(napps, section_name):
+    """Return the components of a section in the files of the NApps."""
+    components = []
+    for (username, napp_name), files in sorted(napps.items()):
+        for filename in sorted(files):
+            section, _, basename = filename.rpartition('/')
+            if not basename.endswith('.kytos') or \
+                    basename.startswith('.') or not section:
+                continue
+            if section_name == 'all':
+                if '/' in section:
+                    continue
+            elif section != section_name:
+                continue
+            dirs_name = [username, napp_name] + filename.split('/')
+            component_name = '-'.join(dirs_name[-4:]).replace('.kytos', '')
+            url = f'ui/{"/".join(dirs_name[-4:])}'
+            components.append({'name': component_name, 'url': url})
+    return components
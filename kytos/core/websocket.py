@@ -1,7 +1,26 @@
 """WebSocket abstraction."""
 import logging
+import threading
+from time import monotonic
 
-__all__ = ('WebSocketHandler', )
+__all__ = ('ChangePublisher', 'WebSocketHandler', 'coalesce_changes')
+
+LOG = logging.getLogger(__name__)
+
+#: Socket.IO event with the topology changes.
+CHANGES_EVENT = 'topology changes'
+#: Rooms of the topology changes and the kind of entity of each one.
+CHANGES_ROOMS = {'changes': None,
+                 'changes:switch': 'switch',
+                 'changes:interface': 'interface',
+                 'changes:link': 'link'}
+#: Actions that set a state of the entity to a value.
+_STATES = {'activated': ('active', True),
+           'deactivated': ('active', False),
+           'enabled': ('enabled', True),
+           'disabled': ('enabled', False),
+           'reconnected': ('connected', True),
+           'disconnected': ('connected', False)}
 
 
 class WebSocketHandler:
@@ -47,3 +66,171 @@ class WebSocketStream:
         lines = self._content.split('\n')[:-1]
         self._content = ''
         self._io.emit('show logs', lines, room='log')
+
+
+class ChangePublisher:
+    """Push the changes of the topology entities to Socket.IO rooms.
+
+    Clients join the ``changes`` room to receive the changes of every
+    entity, or one of the other :data:`CHANGES_ROOMS` for a single kind of
+    entity. Instead of one message per change, each room receives at most
+    one ``topology changes`` event per interval with the changes since the
+    previous event, coalesced by :func:`coalesce_changes`. When the changes
+    were already discarded from the journal, the event has ``resync`` set
+    and the clients must fetch the whole topology again.
+    """
+
+    def __init__(self, socketio, registry, interval=1.0, room_intervals=None):
+        """Create a publisher that is started by :meth:`start`.
+
+        Args:
+            socketio (flask_socketio.SocketIO): Server of the rooms.
+            registry (~kytos.core.registry.EntityRegistry): Registry with
+                the change journal and the current entities.
+            interval (float): Seconds between two checks for changes and
+                minimum seconds between two events of a room.
+            room_intervals (dict): Minimum seconds between two events of
+                some rooms, instead of ``interval``.
+        """
+        self._io = socketio
+        self._registry = registry
+        self.interval = interval
+        self.room_intervals = dict(room_intervals or {})
+        self._versions = dict.fromkeys(CHANGES_ROOMS, registry.journal.version)
+        self._last_emit = {}
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start publishing the changes in a thread."""
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name='change_publisher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop publishing the changes."""
+        self._stopped.set()
+
+    def _run(self):
+        """Publish the changes every interval until stopped."""
+        while not self._stopped.wait(self.interval):
+            try:
+                self.publish()
+            except Exception:  # pylint: disable=broad-except
+                LOG.exception('Error publishing the topology changes')
+
+    def publish(self, now=None):
+        """Emit the new changes to the rooms whose interval has passed.
+
+        Returns:
+            list: Names of the rooms that received an event.
+
+        """
+        now = monotonic() if now is None else now
+        journal = self._registry.journal
+        emitted = []
+        for room, kind in CHANGES_ROOMS.items():
+            last = self._last_emit.get(room)
+            interval = self.room_intervals.get(room, self.interval)
+            version = self._versions[room]
+            if version == journal.version or \
+                    last is not None and now - last < interval:
+                continue
+            changes = journal.changes_since(version)
+            if changes is None:
+                self._versions[room] = journal.version
+                message = {'since': version, 'version': journal.version,
+                           'resync': True}
+            elif changes:
+                self._versions[room] = changes[-1]['version']
+                changes = [change for change in changes
+                           if kind is None or change['entity'] == kind]
+                if not changes:
+                    continue
+                message = {'since': version,
+                           'version': self._versions[room],
+                           'resync': False,
+                           'changes': coalesce_changes(
+                               changes, self._registry.snapshot)}
+            else:
+                continue
+            self._io.emit(CHANGES_EVENT, message, room=room)
+            self._last_emit[room] = now
+            emitted.append(room)
+        return emitted
+
+
+def coalesce_changes(changes, snapshot=None):
+    """Merge the changes of each entity into a single delta.
+
+    Each delta has the ``entity`` kind and ``id``, the ``version`` of its
+    last change and the data of each of its ``actions``, with the values of
+    repeated actions merged in lists. The final ``active``, ``enabled`` and
+    ``connected`` states are included when they changed and, if the entity
+    is still in the ``snapshot``, the current values of the changed
+    ``metadata`` keys, with ``None`` for removed keys. For example:
+
+    .. code-block:: python3
+
+        {'entity': 'switch', 'id': '00:00:00:00:00:00:00:01', 'version': 7,
+         'actions': {'deactivated': {},
+                     'metadata_added': {'keys': ['color']}},
+         'active': False,
+         'metadata': {'color': 'red'}}
+
+    Args:
+        changes (list): Changes returned by
+            :meth:`~kytos.core.registry.ChangeJournal.changes_since`.
+        snapshot (~kytos.core.registry.TopologySnapshot): Current entities.
+
+    Returns:
+        list: Deltas in the order of the first change of each entity.
+
+    """
+    deltas = {}
+    for change in changes:
+        key = (change['entity'], change['id'])
+        delta = deltas.get(key)
+        if delta is None:
+            delta = deltas[key] = {'entity': change['entity'],
+                                   'id': change['id'], 'actions': {}}
+        delta['version'] = change['version']
+        data = delta['actions'].setdefault(change['action'], {})
+        for name, value in change['data'].items():
+            values = data.setdefault(name, [])
+            for item in value if isinstance(value, list) else [value]:
+                if item not in values:
+                    values.append(item)
+        if change['action'] in _STATES:
+            state, value = _STATES[change['action']]
+            delta[state] = value
+    if snapshot is not None:
+        for delta in deltas.values():
+            _add_metadata(delta, snapshot)
+    return list(deltas.values())
+
+
+def _add_metadata(delta, snapshot):
+    """Add the current values of the changed metadata keys to a delta."""
+    keys = []
+    for action, data in delta['actions'].items():
+        if action.startswith('metadata_'):
+            keys.extend(key for key in data.get('keys', ())
+                        if key not in keys)
+    entity = _find_entity(snapshot, delta['entity'], delta['id'])
+    if keys and entity is not None:
+        delta['metadata'] = {key: entity.metadata.get(key) for key in keys}
+
+
+def _find_entity(snapshot, kind, entity_id):
+    """Return an entity of a snapshot by kind and id, or ``None``."""
+    if kind == 'switch':
+        return snapshot.switches.get(entity_id)
+    if kind == 'link':
+        return snapshot.links.get(entity_id)
+    dpid, _, port = entity_id.rpartition(':')
+    for interface in snapshot.interfaces.get(dpid, {}).values():
+        if str(interface.port_number) == port:
+            return interface
+    return None
@@ -12,7 +12,7 @@ from kytos.core import Controller
 from kytos.core.config import KytosConfig
 
 __all__ = ('do_handshake', 'new_controller', 'new_client',
-           'new_handshaked_client')
+           'new_handshaked_client', 'StorehouseStandIn')
 
 
 def do_handshake(client: socket):
@@ -171,3 +171,26 @@ def test_concurrently(times):
                                 (len(exceptions), exceptions))
         return wrapper
     return test_concurrently_decorator
+
+
+class StorehouseStandIn:
+    """Answer storehouse events like the storehouse NApp would.
+
+    Replace the ``put`` method of a buffer with :meth:`put` and set the
+    ``(data, error)`` answer of each event name in :attr:`answers`. Events
+    without an answer are never answered.
+    """
+
+    def __init__(self):
+        """Create a stand-in without answers."""
+        #: dict: event name -> (data, error) passed to the callback
+        self.answers = {}
+        #: list: events received
+        self.events = []
+
+    def put(self, event):
+        """Receive an event and call its callback with the answer."""
+        self.events.append(event)
+        if event.name in self.answers:
+            data, error = self.answers[event.name]
+            event.content['callback'](event, data, error)
@@ -0,0 +1,86 @@
+"""Test kytos.core.accounting module."""
+from unittest import TestCase
+
+from kytos.core.accounting import ListenerAccounting, format_top, napp_of
+
+
+class TestListenerAccounting(TestCase):
+    """ListenerAccounting tests."""
+
+    def setUp(self):
+        """Record calls of three listeners of two NApps."""
+        self.accounting = ListenerAccounting()
+        calls = [('napps.kytos.of_core.main.Main.handle', 'kytos/of_core',
+                  0.5, 1.0, False),
+                 ('napps.kytos.of_core.main.Main.stats', 'kytos/of_core',
+                  0.2, 3.0, True),
+                 ('napps.kytos.topology.main.Main.link', 'kytos/topology',
+                  0.6, 0.7, False)]
+        for listener, napp, cpu, wall, error in calls:
+            self.accounting.started(listener, napp)
+            self.accounting.finished(listener, napp, cpu, wall, error)
+
+    def test_top(self):
+        """Test the listeners sorted by CPU and wall time."""
+        rows = self.accounting.top()
+
+        self.assertEqual([row['name'] for row in rows],
+                         ['napps.kytos.topology.main.Main.link',
+                          'napps.kytos.of_core.main.Main.handle',
+                          'napps.kytos.of_core.main.Main.stats'])
+        self.assertEqual(rows[2]['errors'], 1)
+        self.assertEqual(self.accounting.top('wall', limit=1)[0]['name'],
+                         'napps.kytos.of_core.main.Main.stats')
+
+    def test_top__by_napp(self):
+        """Test the totals of each NApp."""
+        rows = self.accounting.top(by_napp=True)
+
+        self.assertEqual(rows[0]['name'], 'kytos/of_core')
+        self.assertAlmostEqual(rows[0]['cpu'], 0.7)
+        self.assertEqual(rows[0]['calls'], 2)
+        self.assertEqual(rows[0]['errors'], 1)
+
+    def test_top__invalid_column(self):
+        """Test sorting by a column that does not exist."""
+        with self.assertRaises(ValueError):
+            self.accounting.top('memory')
+
+    def test_peak(self):
+        """Test the peak of concurrent calls."""
+        listener = 'kytos.core.controller.Controller.new_connection'
+        self.accounting.started(listener, 'kytos.core.controller')
+        self.accounting.started(listener, 'kytos.core.controller')
+        self.accounting.finished(listener, 'kytos.core.controller', 0, 0)
+
+        row = self.accounting.top('peak')[0]
+
+        self.assertEqual(row['name'], listener)
+        self.assertEqual((row['running'], row['peak'], row['calls']),
+                         (1, 2, 1))
+
+    def test_clear(self):
+        """Test clear method."""
+        self.accounting.clear()
+
+        self.assertEqual(self.accounting.top(), [])
+
+
+class TestAccountingFunctions(TestCase):
+    """Tests of the accounting functions."""
+
+    def test_napp_of(self):
+        """Test napp_of function."""
+        self.assertEqual(napp_of('napps.kytos.of_core.main'), 'kytos/of_core')
+        self.assertEqual(napp_of('kytos.core.controller'),
+                         'kytos.core.controller')
+
+    def test_format_top(self):
+        """Test format_top function."""
+        table = format_top([{'name': 'kytos/of_core', 'cpu': 1.5, 'wall': 2,
+                             'calls': 3, 'errors': 0, 'running': 1,
+                             'peak': 2}])
+
+        self.assertEqual(table.splitlines()[1],
+                         '     1.500      2.000        3       0'
+                         '       1     2  kytos/of_core')
@@ -1,13 +1,20 @@
 """APIServer tests."""
+import gzip
 import json
+import os
+import shutil
+import tempfile
 import unittest
 import warnings
+import zlib
 # Disable not-grouped imports that conflicts with isort
-from unittest.mock import (MagicMock, Mock, patch,  # pylint: disable=C0412
-                           sentinel)
+from unittest.mock import (ANY, MagicMock, Mock,  # pylint: disable=C0412
+                           patch, sentinel)
 from urllib.error import HTTPError
 
-from kytos.core.api_server import APIServer
+from flask import jsonify
+
+from kytos.core.api_server import APIServer, conditional
 from kytos.core.napps import rest
 
 KYTOS_CORE_API = "http://127.0.0.1:8181/api/kytos/"
@@ -54,6 +61,47 @@ class TestAPIServer(unittest.TestCase):
 
         mock_exit.assert_called()
 
+    @patch('kytos.core.api_server.AsyncWSGIServer')
+    def test_run__asyncio(self, mock_server):
+        """Test run method in asyncio mode."""
+        api_server = APIServer('CustomName', '127.0.0.1', 8282,
+                               mode='asyncio', max_concurrency=4,
+                               keep_alive_timeout=5)
+        api_server.server = MagicMock()
+
+        mock_server.assert_called_with(api_server.app, '127.0.0.1', 8282,
+                                       4, 5)
+        self.assertIs(api_server.async_server, mock_server.return_value)
+
+        api_server.run()
+
+        mock_server.return_value.run.assert_called()
+        api_server.server.run.assert_not_called()
+
+    def test_init__invalid_mode(self):
+        """Test that an unknown mode is rejected."""
+        with self.assertRaises(ValueError):
+            APIServer('CustomName', mode='gevent')
+
+    @patch('kytos.core.api_server.urlopen')
+    def test_stop_api_server__asyncio(self, mock_urlopen):
+        """Test stop_api_server method in asyncio mode."""
+        self.api_server.async_server = MagicMock()
+        self.api_server.stop_api_server()
+
+        self.api_server.async_server.stop_threadsafe.assert_called()
+        mock_urlopen.assert_not_called()
+
+    def test_stop_api_server__asyncio_not_running(self):
+        """Test that a server stopped before running does not start."""
+        api_server = APIServer('CustomName', '127.0.0.1', 0, mode='asyncio')
+        with patch('kytos.core.api_server.urlopen') as mock_urlopen:
+            api_server.stop_api_server()
+        api_server.run()
+
+        self.assertEqual(api_server.async_server.sockets, [])
+        mock_urlopen.assert_not_called()
+
     @patch('kytos.core.api_server.request')
     def test_shutdown_api(self, mock_request):
         """Test shutdown_api method."""
@@ -84,33 +132,81 @@ class TestAPIServer(unittest.TestCase):
         url = "%s/_shutdown" % API_URI
         mock_urlopen.assert_called_with(url)
 
-    @patch('kytos.core.api_server.send_file')
-    @patch('os.path.exists', return_value=True)
-    def test_static_web_ui__success(self, *args):
+    def _add_ui_file(self, filename, data=b'<template/>'):
+        """Add a file of the NApp kytos/napp to the UI manifest."""
+        napps_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, napps_dir)
+        path = os.path.join(napps_dir, 'kytos/napp/ui', filename)
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as file:
+            file.write(data)
+        self.api_server.ui_manifest.napps_dir = napps_dir
+        self.api_server.ui_manifest.scan()
+        return path
+
+    def test_static_web_ui__success(self):
         """Test static_web_ui method to success case."""
-        (_, mock_send_file) = args
-        self.api_server.static_web_ui('kytos', 'napp', 'filename')
+        self._add_ui_file('k-toolbar/main.kytos')
+
+        with self.api_server.app.test_request_context():
+            response = self.api_server.static_web_ui('kytos', 'napp',
+                                                     'k-toolbar/main.kytos')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(), b'<template/>')
+        self.assertEqual(response.cache_control.max_age, 60)
+        etag = response.get_etag()[0]
+
+        with self.api_server.app.test_request_context(
+                headers={'If-None-Match': f'"{etag}"'}):
+            response = self.api_server.static_web_ui('kytos', 'napp',
+                                                     'k-toolbar/main.kytos')
 
-        mock_send_file.assert_called_with('napps_dir/kytos/napp/ui/filename')
+        self.assertEqual(response.status_code, 304)
 
-    @patch('os.path.exists', return_value=False)
-    def test_static_web_ui__error(self, _):
+    @patch('kytos.core.api_server.send_file')
+    @patch('kytos.core.ui_manifest.MAX_CACHED_FILE_SIZE', 1)
+    def test_static_web_ui__large(self, mock_send_file):
+        """Test that large files are sent from disk."""
+        path = self._add_ui_file('app.js')
+
+        with self.api_server.app.test_request_context():
+            self.api_server.static_web_ui('kytos', 'napp', 'app.js')
+
+        mock_send_file.assert_called_with(path, ANY, add_etags=False)
+
+    def test_static_web_ui__error(self):
         """Test static_web_ui method to error case."""
         resp, code = self.api_server.static_web_ui('kytos', 'napp', 'filename')
 
         self.assertEqual(resp, '')
         self.assertEqual(code, 404)
 
-    @patch('kytos.core.api_server.glob')
-    def test_get_ui_components(self, mock_glob):
+    def test_get_ui_components(self):
         """Test get_ui_components method."""
-        with self.api_server.app.app_context():
-            mock_glob.return_value = ['napps_dir/*/*/ui/*/*.kytos']
+        self._add_ui_file('k-toolbar/main.kytos')
+
+        with self.api_server.app.test_request_context():
             response = self.api_server.get_ui_components('all')
 
-            expected_json = [{'name': '*-*-*-*', 'url': 'ui/*/*/*/*.kytos'}]
+            expected_json = [{'name': 'kytos-napp-k-toolbar-main',
+                              'url': 'ui/kytos/napp/k-toolbar/main.kytos'}]
             self.assertEqual(response.json, expected_json)
-            self.assertEqual(response.status_code, 200)
+
+    def test_get_ui_components__not_modified(self):
+        """Test that the ETag of a section does not match other sections."""
+        self._add_ui_file('k-toolbar/main.kytos')
+        self.api_server.app.add_url_rule('/ui/<path:section_name>', 'ui',
+                                         self.api_server.get_ui_components)
+        client = self.api_server.app.test_client()
+        etag = client.get('/ui/k-toolbar').headers['ETag']
+
+        response = client.get('/ui/k-toolbar',
+                              headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        response = client.get('/ui/k-info-panel',
+                              headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
 
     @patch('os.path')
     @patch('kytos.core.api_server.send_file')
@@ -528,3 +624,112 @@ class TestAPIDecorator(unittest.TestCase):
 
         server.register_napp_endpoints(napp)
         return server
+
+
+class TestResponseFinishing(unittest.TestCase):
+    """Compression and conditional GET of the responses."""
+
+    def setUp(self):
+        """Register endpoints with small and large responses."""
+        self.api_server = APIServer('test')
+        self.data = [{'id': index} for index in range(200)]
+        self.api_server.register_core_endpoint('large', self._large)
+        self.api_server.register_core_endpoint('small', self._small)
+        self.api_server.register_core_endpoint('versioned', self._versioned)
+        self.version = 1
+        self.calls = 0
+        self.client = self.api_server.app.test_client()
+
+    def _large(self):
+        """Endpoint with a response large enough to be compressed."""
+        return jsonify(self.data)
+
+    @staticmethod
+    def _small():
+        """Endpoint with a small response."""
+        return jsonify({'id': 1})
+
+    def _versioned(self):
+        """Endpoint with an ETag made from a version."""
+        conditional(f'data-{self.version}')
+        self.calls += 1
+        return jsonify(self.data)
+
+    def test_gzip(self):
+        """Test that large responses are compressed with gzip."""
+        response = self.client.get('/api/kytos/core/large',
+                                   headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(json.loads(gzip.decompress(response.data)),
+                         self.data)
+        self.assertEqual(int(response.headers['Content-Length']),
+                         len(response.data))
+
+    def test_deflate(self):
+        """Test that deflate is used when gzip is not accepted."""
+        response = self.client.get(
+            '/api/kytos/core/large',
+            headers={'Accept-Encoding': 'gzip;q=0, deflate'})
+        self.assertEqual(response.headers['Content-Encoding'], 'deflate')
+        self.assertEqual(json.loads(zlib.decompress(response.data)),
+                         self.data)
+
+    def test_not_compressed(self):
+        """Test responses that are not compressed."""
+        response = self.client.get('/api/kytos/core/large')
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(response.json, self.data)
+
+        response = self.client.get('/api/kytos/core/small',
+                                   headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.json, {'id': 1})
+
+    def test_etag(self):
+        """Test that unchanged responses are answered with 304."""
+        response = self.client.get('/api/kytos/core/small')
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/'))
+
+        response = self.client.get('/api/kytos/core/small',
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+    def test_conditional(self):
+        """Test that endpoints are not called for versions not modified."""
+        response = self.client.get('/api/kytos/core/versioned')
+        self.assertEqual(response.headers['ETag'], 'W/"data-1"')
+
+        response = self.client.get('/api/kytos/core/versioned',
+                                   headers={'If-None-Match': 'W/"data-1"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], 'W/"data-1"')
+        self.assertEqual(self.calls, 1)
+
+        self.version = 2
+        response = self.client.get('/api/kytos/core/versioned',
+                                   headers={'If-None-Match': 'W/"data-1"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.calls, 2)
+
+    def test_napp_endpoint(self):
+        """Test that NApp endpoints are compressed and tagged too."""
+        data = self.data
+
+        class MyNApp(RESTNApp):  # pylint: disable=too-few-public-methods
+            """NApp with a large response."""
+
+            @rest('/large')
+            @staticmethod
+            def large():
+                """Return the large response."""
+                return jsonify(data)
+
+        self.api_server.register_napp_endpoints(MyNApp())
+        response = self.client.get('/api/test/MyNApp/large',
+                                   headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('ETag', response.headers)
@@ -0,0 +1,273 @@
+"""Test kytos.core.async_api_server module."""
+import asyncio
+import errno
+import socket
+import threading
+from http.client import HTTPConnection
+from unittest import TestCase
+from unittest.mock import patch
+
+from flask import Flask, jsonify, request
+
+from kytos.core.async_api_server import (AsyncWSGIServer, HTTPError, call_app,
+                                         parse_head, read_body)
+
+
+def create_app():
+    """Return a Flask app with a few endpoints."""
+    app = Flask(__name__)
+
+    @app.route('/hello/<name>')
+    def hello(name):  # pylint: disable=unused-variable
+        return jsonify(name=name, query=request.args.get('q'))
+
+    @app.route('/echo', methods=['POST'])
+    def echo():  # pylint: disable=unused-variable
+        length = str(request.content_length)
+        return request.get_data(), 201, {'X-Length': length}
+
+    return app
+
+
+class TestParsing(TestCase):
+    """Test the parsing of requests."""
+
+    def test_parse_head(self):
+        """Test the request line and headers."""
+        head = (b'GET /path?q=1 HTTP/1.1\r\nHost: localhost\r\n'
+                b'Accept: a\r\naccept: b\r\n\r\n')
+        method, target, version, headers = parse_head(head)
+        self.assertEqual((method, target, version),
+                         ('GET', '/path?q=1', 'HTTP/1.1'))
+        self.assertEqual(headers, {'HOST': 'localhost', 'ACCEPT': 'a,b'})
+
+    def test_parse_head__invalid(self):
+        """Test malformed requests."""
+        for head, status in ((b'GET /\r\n\r\n', 400),
+                             (b'GET / HTTP/2.0\r\n\r\n', 505),
+                             (b'GET / HTTP/1.1\r\nHost\r\n\r\n', 400)):
+            with self.assertRaises(HTTPError) as context:
+                parse_head(head)
+            self.assertEqual(context.exception.status, status)
+
+    def _read_body(self, data, headers):
+        """Return the body read from ``data``."""
+        reader = asyncio.StreamReader(loop=self.loop)
+        reader.feed_data(data)
+        reader.feed_eof()
+        return self.loop.run_until_complete(read_body(reader, headers))
+
+    def setUp(self):
+        """Create a loop to read bodies."""
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        """Close the loop."""
+        self.loop.close()
+
+    def test_read_body(self):
+        """Test bodies with Content-Length and chunked."""
+        self.assertEqual(self._read_body(b'abc', {'CONTENT-LENGTH': '3'}),
+                         b'abc')
+        self.assertEqual(self._read_body(b'', {}), b'')
+        chunked = b'3\r\nabc\r\n2;ext\r\nde\r\n0\r\nTrailer: x\r\n\r\n'
+        self.assertEqual(
+            self._read_body(chunked, {'TRANSFER-ENCODING': 'chunked'}),
+            b'abcde')
+
+    def test_read_body__invalid(self):
+        """Test invalid body sizes."""
+        for headers, status in (({'CONTENT-LENGTH': 'x'}, 400),
+                                ({'CONTENT-LENGTH': '-1'}, 400),
+                                ({'CONTENT-LENGTH': '+3'}, 400),
+                                ({'CONTENT-LENGTH': '3,3'}, 400),
+                                ({'CONTENT-LENGTH': str(2 ** 40)}, 413)):
+            with self.assertRaises(HTTPError) as context:
+                self._read_body(b'', headers)
+            self.assertEqual(context.exception.status, status)
+
+    def test_read_body__conflicting_framing(self):
+        """Test that requests with ambiguous framing are rejected."""
+        chunked = b'3\r\nabc\r\n0\r\n\r\n'
+        for headers, status in (
+                ({'CONTENT-LENGTH': '3', 'TRANSFER-ENCODING': 'chunked'},
+                 400),
+                ({'TRANSFER-ENCODING': 'gzip, chunked'}, 501),
+                ({'TRANSFER-ENCODING': 'chunked, identity'}, 501)):
+            with self.assertRaises(HTTPError) as context:
+                self._read_body(chunked, headers)
+            self.assertEqual(context.exception.status, status)
+
+    def test_call_app(self):
+        """Test calling a WSGI app."""
+        def app(_environ, start_response):
+            write = start_response('200 OK', [('A', 'b')])
+            write(b'1')
+            return [b'2', b'', b'3']
+
+        self.assertEqual(call_app(app, {}), ('200 OK', [('A', 'b')], b'123'))
+
+
+def fail(_environ, _start_response):
+    """WSGI app that fails."""
+    raise RuntimeError('failed')
+
+
+class TestAsyncWSGIServer(TestCase):
+    """Test a server running in its own loop and thread."""
+
+    def setUp(self):
+        """Start a server on a free port."""
+        self.server = AsyncWSGIServer(create_app(), '127.0.0.1', 0,
+                                      max_concurrency=2)
+        self.thread = threading.Thread(target=self.server.run)
+        self.thread.start()
+        while not self.server.sockets:
+            self.thread.join(0.01)
+
+    def tearDown(self):
+        """Stop the server and wait for its thread."""
+        self.server.stop_threadsafe(timeout=5)
+        self.thread.join(5)
+
+    def test_keep_alive(self):
+        """Test requests sent over the same connection."""
+        connection = HTTPConnection('127.0.0.1', self.server.port)
+        connection.request('GET', '/hello/kytos?q=1')
+        response = connection.getresponse()
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader('Connection'), 'keep-alive')
+        self.assertEqual(response.read(), b'{"name":"kytos","query":"1"}\n')
+        sock = connection.sock
+
+        connection.request('POST', '/echo', body=b'x' * 2000,
+                           headers={'Expect': '100-continue'})
+        response = connection.getresponse()
+        self.assertEqual(response.status, 201)
+        self.assertEqual(response.getheader('X-Length'), '2000')
+        self.assertEqual(response.read(), b'x' * 2000)
+        self.assertIs(connection.sock, sock)
+        connection.close()
+
+    def test_connection_close(self):
+        """Test that the connection is closed when the client asks."""
+        connection = HTTPConnection('127.0.0.1', self.server.port)
+        connection.request('GET', '/missing', headers={'Connection': 'close'})
+        response = connection.getresponse()
+        self.assertEqual(response.status, 404)
+        self.assertEqual(response.getheader('Connection'), 'close')
+        response.read()
+        connection.close()
+
+    def test_smuggled_request(self):
+        """Test that Content-Length with Transfer-Encoding is rejected."""
+        with socket.create_connection(('127.0.0.1', self.server.port)) as sock:
+            sock.sendall(b'POST /echo HTTP/1.1\r\nHost: x\r\n'
+                         b'Content-Length: 4\r\n'
+                         b'Transfer-Encoding: chunked\r\n\r\n'
+                         b'0\r\n\r\nGET /hello/a HTTP/1.1\r\n\r\n')
+            data = sock.recv(1024)
+            self.assertTrue(data.startswith(b'HTTP/1.1 400 Bad Request'))
+            self.assertEqual(sock.recv(1024), b'')
+
+    def test_bad_request(self):
+        """Test that malformed requests are answered and closed."""
+        with socket.create_connection(('127.0.0.1', self.server.port)) as sock:
+            sock.sendall(b'GARBAGE\r\n\r\n')
+            data = sock.recv(1024)
+            self.assertTrue(data.startswith(b'HTTP/1.1 400 Bad Request'))
+            self.assertEqual(sock.recv(1024), b'')
+
+    def test_app_error(self):
+        """Test that errors of the app are answered with 500."""
+        self.server.app = fail
+        connection = HTTPConnection('127.0.0.1', self.server.port)
+        with self.assertLogs('kytos.core.async_api_server', 'ERROR'):
+            connection.request('GET', '/')
+            response = connection.getresponse()
+        self.assertEqual(response.status, 500)
+        connection.close()
+
+    def test_stop(self):
+        """Test that stopping closes idle connections and the thread ends."""
+        with socket.create_connection(('127.0.0.1', self.server.port)) as sock:
+            sock.sendall(b'GET /hello/a HTTP/1.1\r\nHost: x\r\n\r\n')
+            self.assertTrue(sock.recv(1024).startswith(b'HTTP/1.1 200 OK'))
+            self.assertTrue(self.server.stop_threadsafe(timeout=5))
+            self.thread.join(5)
+            self.assertFalse(self.thread.is_alive())
+            self.assertEqual(sock.recv(1024), b'')
+        self.assertFalse(self.server.stop_threadsafe())
+
+    def test_stop_threadsafe__timeout(self):
+        """Test that waiting for the server to stop gives up."""
+        async def stop():
+            await asyncio.sleep(1)
+
+        with patch.object(self.server, 'stop', stop), \
+                self.assertLogs('kytos.core.async_api_server', 'WARNING'):
+            self.assertFalse(self.server.stop_threadsafe(timeout=0.01))
+
+    def test_stop_threadsafe__not_running(self):
+        """Test that a server stopped before running does not start."""
+        server = AsyncWSGIServer(create_app(), '127.0.0.1', 0)
+        self.assertFalse(server.stop_threadsafe())
+        server.run()
+        self.assertEqual(server.sockets, [])
+
+
+class TestAccept(TestCase):
+    """Test errors accepting connections."""
+
+    def setUp(self):
+        """Create a server and a loop whose accept fails twice."""
+        self.server = AsyncWSGIServer(create_app(), '127.0.0.1', 0)
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        self.errors = [OSError(errno.EMFILE, 'Too many open files'),
+                       OSError(errno.ECONNABORTED, 'Connection aborted')]
+        sock_accept = self.loop.sock_accept
+
+        async def accept(sock):
+            if self.errors:
+                raise self.errors.pop(0)
+            return await sock_accept(sock)
+
+        self.loop.sock_accept = accept
+
+    async def _request(self):
+        """Start the server, send a request and return the response."""
+        await self.server.start()
+        reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                       self.server.port)
+        writer.write(b'GET /hello/a HTTP/1.1\r\nHost: x\r\n'
+                     b'Connection: close\r\n\r\n')
+        response = await reader.read()
+        writer.close()
+        await self.server.stop()
+        return response
+
+    @patch('kytos.core.async_api_server.ACCEPT_RETRY_DELAY', 0)
+    def test_accept__errors(self):
+        """Test that the server keeps accepting after accept errors."""
+        with self.assertLogs('kytos.core.async_api_server', 'WARNING') as log:
+            response = self.loop.run_until_complete(self._request())
+        self.assertTrue(response.startswith(b'HTTP/1.1 200 OK'))
+        self.assertEqual(len(log.output), 2)
+        self.assertEqual(self.errors, [])
+
+    @patch('asyncio.open_connection')
+    def test_accept__open_connection_error(self, mock_open):
+        """Test that the connection is closed if its streams fail."""
+        mock_open.side_effect = OSError(errno.ENOMEM, 'Out of memory')
+        self.errors = []
+
+        async def accept_once():
+            await self.server.start()
+            with socket.create_connection(('127.0.0.1', self.server.port)):
+                while not mock_open.called:
+                    await asyncio.sleep(0.01)
+            await self.server.stop()
+
+        with self.assertLogs('kytos.core.async_api_server', 'WARNING'):
+            self.loop.run_until_complete(accept_once())
@@ -2,12 +2,14 @@
 import asyncio
 import base64
 import hashlib
+import time
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
 from kytos.core import Controller
-from kytos.core.auth import Auth
+from kytos.core.auth import TOKEN_CACHE, Auth, TokenCache, UserCache
 from kytos.core.config import KytosConfig
+from tests.helper import StorehouseStandIn
 
 KYTOS_CORE_API = "http://127.0.0.1:8181/api/kytos/"
 API_URI = KYTOS_CORE_API+"core"
@@ -20,7 +22,7 @@ class TestAuth(TestCase):
 
     def setUp(self):
         """Instantiate a controller and an Auth."""
-        self.patched_events = []  # {'event_name': box_object}
+        self.storehouse = StorehouseStandIn()
         self.server_name_url = 'http://localhost:8181/api/kytos'
         self.controller = self._get_controller_mock()
         self.auth = Auth(self.controller)
@@ -32,12 +34,6 @@ class TestAuth(TestCase):
             "password": "password",
         }
 
-    def _patch_event_trigger(self, event):
-        """Patch event callback trigger."""
-        for patched_event in self.patched_events:
-            box = patched_event.get(event.content.get('callback').__name__)
-            event.content.get('callback')(None, box, None)
-
     def _get_controller_mock(self):
         """Return a controller mock."""
         loop = asyncio.new_event_loop()
@@ -48,8 +44,8 @@ class TestAuth(TestCase):
         controller = Controller(options, loop=loop)
         controller.log = Mock()
 
-        # Patch event callback trigger.
-        controller.buffers.app.put = self._patch_event_trigger
+        # Answer storehouse events without the storehouse NApp.
+        controller.buffers.app.put = self.storehouse.put
 
         return controller
 
@@ -87,8 +83,7 @@ class TestAuth(TestCase):
                 bytes(self.username + ":" + self.password, "ascii")
             ).decode("ascii")
         }
-        # Patch _find_user_callback event callback.
-        self.patched_events.append({'_find_user_callback': box})
+        self.storehouse.answers['kytos.storehouse.retrieve'] = (box, None)
         url = "%s/auth/login/" % API_URI
         api = self.get_auth_test_client(self.auth)
         success_response = api.open(url, method='GET', headers=header)
@@ -127,8 +122,7 @@ class TestAuth(TestCase):
                         '94c706a8bb980b1d7785e5976ec049b46df5f1326af5a2ea6d103'
                         'fd07c95385ffab0cacbc86'
         }
-        # Patch _find_user_callback event callback.
-        self.patched_events.append({'_find_user_callback': box})
+        self.storehouse.answers['kytos.storehouse.retrieve'] = (box, None)
         url = "%s/auth/login/" % API_URI
         api = self.get_auth_test_client(self.auth)
         success_response = api.open(url, method='GET', headers=valid_header)
@@ -144,12 +138,11 @@ class TestAuth(TestCase):
         invalid_header = {"Authorization": "Bearer invalidtoken"}
         schema = {"users": list}
         password = "password".encode()
-        # Patch _list_users_callback event callback.
         event_boxes = [self.user_data,
                        {"username": "authtempuser2",
                         "email": "tempuser2@kytos.io",
                         "password": hashlib.sha512(password).hexdigest()}]
-        self.patched_events.append({'_list_users_callback': event_boxes})
+        self.storehouse.answers['kytos.storehouse.list'] = (event_boxes, None)
         api = self.get_auth_test_client(self.auth)
         url = "%s/auth/users/" % API_URI
         success_response = api.open(url, method='GET', headers=valid_header)
@@ -164,8 +157,8 @@ class TestAuth(TestCase):
     def test_03_create_user_request(self, mock_jwt_secret):
         """Test auth create user endpoint."""
         header = {"Authorization": "Bearer %s" % self.token}
-        # Patch _create_user_callback event callback.
-        self.patched_events.append({'_create_user_callback': self.user_data})
+        self.storehouse.answers['kytos.storehouse.create'] = (
+            self.user_data, None)
         api = self.get_auth_test_client(self.auth)
         url = "%s/auth/users/" % API_URI
         success_response = api.open(url, method='POST', json=self.user_data,
@@ -177,8 +170,7 @@ class TestAuth(TestCase):
     def test_03_create_user_request_error(self, mock_jwt_secret):
         """Test auth create user endpoint."""
         header = {"Authorization": "Bearer %s" % self.token}
-        # Patch _create_user_callback event callback.
-        self.patched_events.append({'_create_user_callback': None})
+        self.storehouse.answers['kytos.storehouse.create'] = (None, None)
         api = self.get_auth_test_client(self.auth)
         url = "%s/auth/users/" % API_URI
         error_response = api.open(url, method='POST', json=self.user_data,
@@ -193,7 +185,7 @@ class TestAuth(TestCase):
         schema = {"data": {"email": str, "username": str}}
         box = Mock()
         box.data = self.user_data
-        self.patched_events.append({'_find_user_callback': box})
+        self.storehouse.answers['kytos.storehouse.retrieve'] = (box, None)
         api = self.get_auth_test_client(self.auth)
         url = "%s/auth/users/%s" % (API_URI, self.user_data.get("username"))
         success_response = api.open(url, method='GET', headers=valid_header)
@@ -206,7 +198,7 @@ class TestAuth(TestCase):
     def test_04_list_user_request_error(self, mock_jwt_secret):
         """Test auth list user endpoint."""
         valid_header = {"Authorization": "Bearer %s" % self.token}
-        self.patched_events.append({'_find_user_callback': None})
+        self.storehouse.answers['kytos.storehouse.retrieve'] = (None, None)
         api = self.get_auth_test_client(self.auth)
         url = "%s/auth/users/%s" % (API_URI, 'user3')
         error_response = api.open(url, method='GET', headers=valid_header)
@@ -218,7 +210,7 @@ class TestAuth(TestCase):
         """Test auth update user endpoint."""
         valid_header = {"Authorization": "Bearer %s" % self.token}
         data = {"email": "newemail_tempuser@kytos.io"}
-        self.patched_events.append({'_update_user_callback': data})
+        self.storehouse.answers['kytos.storehouse.update'] = (data, None)
         api = self.get_auth_test_client(self.auth)
         url = "%s/auth/users/%s" % (API_URI, self.user_data.get("username"))
         success_response = api.open(url, method='PATCH', json=data,
@@ -230,7 +222,7 @@ class TestAuth(TestCase):
     def test_05_update_user_request_error(self, mock_jwt_secret):
         """Test auth update user endpoint."""
         valid_header = {"Authorization": "Bearer %s" % self.token}
-        self.patched_events.append({'_update_user_callback': None})
+        self.storehouse.answers['kytos.storehouse.update'] = (None, None)
         api = self.get_auth_test_client(self.auth)
         url = "%s/auth/users/%s" % (API_URI, 'user5')
         error_response = api.open(url, method='PATCH', json={},
@@ -242,8 +234,8 @@ class TestAuth(TestCase):
     def test_06_delete_user_request(self, mock_jwt_secret):
         """Test auth delete user endpoint."""
         header = {"Authorization": "Bearer %s" % self.token}
-        # Patch _delete_user_callback event callback.
-        self.patched_events.append({'_delete_user_callback': self.user_data})
+        self.storehouse.answers['kytos.storehouse.delete'] = (
+            self.user_data, None)
         api = self.get_auth_test_client(self.auth)
         url = "%s/auth/users/%s" % (API_URI, self.user_data.get("username"))
         success_response = api.open(url, method='DELETE', headers=header)
@@ -254,10 +246,209 @@ class TestAuth(TestCase):
     def test_06_delete_user_request_error(self, mock_jwt_secret):
         """Test auth delete user endpoint."""
         header = {"Authorization": "Bearer %s" % self.token}
-        # Patch _delete_user_callback event callback.
-        self.patched_events.append({'_delete_user_callback': None})
+        self.storehouse.answers['kytos.storehouse.delete'] = (None, None)
         api = self.get_auth_test_client(self.auth)
         url = "%s/auth/users/%s" % (API_URI, "nonexistent")
         success_response = api.open(url, method='DELETE', headers=header)
 
         self.assertEqual(success_response.status_code, 404)
+
+    @patch('kytos.core.auth.STOREHOUSE_TIMEOUT', 0.01)
+    @patch('kytos.core.auth.Auth.get_jwt_secret', return_value="abc")
+    def test_07_storehouse_timeout(self, mock_jwt_secret):
+        """Test that requests fail when storehouse does not answer."""
+        header = {"Authorization": "Bearer %s" % self.token}
+        del self.storehouse.answers['kytos.storehouse.retrieve']
+        api = self.get_auth_test_client(self.auth)
+        url = "%s/auth/users/%s" % (API_URI, self.user_data.get("username"))
+        error_response = api.open(url, method='GET', headers=header)
+
+        self.assertEqual(error_response.status_code, 504)
+        self.assertEqual(self.storehouse.events[-1].name,
+                         'kytos.storehouse.retrieve')
+
+    @patch('kytos.core.auth.jwt.decode', return_value={'exp': None})
+    @patch('kytos.core.auth.Auth.get_jwt_secret', return_value="abc")
+    def test_08_token_cache(self, mock_jwt_secret, mock_decode):
+        """Test that a token is decoded only once."""
+        TOKEN_CACHE.clear()
+        header = {"Authorization": "Bearer %s" % self.token}
+        self.storehouse.answers['kytos.storehouse.list'] = ([], None)
+        api = self.get_auth_test_client(self.auth)
+        url = "%s/auth/users/" % API_URI
+        for _ in range(3):
+            response = api.open(url, method='GET', headers=header)
+            self.assertEqual(response.status_code, 200)
+
+        mock_decode.assert_called_once()
+
+    @patch('kytos.core.auth.Auth.get_jwt_secret', return_value="abc")
+    def test_09_user_cache(self, mock_jwt_secret):
+        """Test that logins use the cache until the user is updated."""
+        header = {
+            "Authorization": "Basic "
+            + base64.b64encode(
+                bytes(self.username + ":" + self.password, "ascii")
+            ).decode("ascii")
+        }
+        api = self.get_auth_test_client(self.auth)
+        url = "%s/auth/login/" % API_URI
+        retrievals = len(self.storehouse.events)
+
+        response = api.open(url, method='GET', headers=header)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.storehouse.events), retrievals)
+
+        self.storehouse.answers['kytos.storehouse.update'] = (
+            {'password': 'new'}, None)
+        self.storehouse.answers['kytos.storehouse.retrieve'] = (None, None)
+        api.open("%s/auth/users/%s" % (API_URI, self.username),
+                 method='PATCH', json={'password': 'new'},
+                 headers={"Authorization": "Bearer %s" % self.token})
+        response = api.open(url, method='GET', headers=header)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.storehouse.events[-1].name,
+                         'kytos.storehouse.retrieve')
+
+    @patch('kytos.core.auth.Auth.get_jwt_secret', return_value="abc")
+    def test_09_user_cache__stale_retrieval(self, mock_jwt_secret):
+        """Test that users invalidated while retrieved are not cached."""
+        self.auth.users.clear()
+        # pylint: disable=protected-access
+        retrieve = self.auth._request_storehouse
+
+        def update_while_retrieving(name, content):
+            answer = retrieve(name, content)
+            self.auth.users.invalidate(content['box_id'])
+            return answer
+
+        with patch.object(self.auth, '_request_storehouse',
+                          side_effect=update_while_retrieving):
+            answer, code = self.auth._find_user(self.username)
+
+        self.assertEqual(code, 200)
+        self.assertIn('password', answer['data'])
+        self.assertIsNone(self.auth.users.get(self.username))
+
+    @patch('kytos.core.auth.Auth.get_jwt_secret', return_value="abc")
+    def test_09_login__password_not_str(self, mock_jwt_secret):
+        """Test that stored passwords that are not str do not fail."""
+        self.controller.auth.users.clear()
+        box = Mock(data={'password': None})
+        self.storehouse.answers['kytos.storehouse.retrieve'] = (box, None)
+        header = {
+            "Authorization": "Basic "
+            + base64.b64encode(
+                bytes(self.username + ":" + self.password, "ascii")
+            ).decode("ascii")
+        }
+        api = self.get_auth_test_client(self.auth)
+
+        response = api.open("%s/auth/login/" % API_URI, method='GET',
+                            headers=header)
+
+        self.assertEqual(response.status_code, 401)
+
+    @patch('kytos.core.auth.KytosConfig')
+    def test_10_get_jwt_secret(self, mock_config):
+        """Test that the configuration is parsed only once."""
+        mock_config.return_value.options = {
+            'daemon': Mock(jwt_secret='secret')}
+        with patch.object(Auth, '_jwt_secret', None):
+            self.assertEqual(Auth.get_jwt_secret(), 'secret')
+            self.assertEqual(Auth.get_jwt_secret(), 'secret')
+
+        mock_config.assert_called_once()
+
+
+class TestTokenCache(TestCase):
+    """TokenCache tests."""
+
+    def setUp(self):
+        """Create a cache of two tokens."""
+        self.cache = TokenCache(size=2)
+
+    def test_is_verified(self):
+        """Test that only tokens added with the same secret are verified."""
+        self.cache.add('token', 'secret', time.time() + 60)
+
+        self.assertTrue(self.cache.is_verified('token', 'secret'))
+        self.assertFalse(self.cache.is_verified('other', 'secret'))
+        self.assertFalse(self.cache.is_verified('token', 'new secret'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_is_verified__expired(self):
+        """Test that expired tokens are removed."""
+        self.cache.add('token', 'secret', time.time() - 1)
+
+        self.assertFalse(self.cache.is_verified('token', 'secret'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_add__lru(self):
+        """Test that the least recently used token is discarded."""
+        self.cache.add('a', 'secret')
+        self.cache.add('b', 'secret')
+        self.cache.is_verified('a', 'secret')
+        self.cache.add('c', 'secret')
+
+        self.assertTrue(self.cache.is_verified('a', 'secret'))
+        self.assertFalse(self.cache.is_verified('b', 'secret'))
+        self.assertTrue(self.cache.is_verified('c', 'secret'))
+
+
+class TestUserCache(TestCase):
+    """UserCache tests."""
+
+    def setUp(self):
+        """Create a cache of two users."""
+        self.cache = UserCache(size=2)
+        self.cache.set('a', {'password': 'a'})
+        self.cache.set('b', {'password': 'b'})
+
+    def test_get(self):
+        """Test that copies of the user data are returned."""
+        user = self.cache.get('a')
+        del user['password']
+
+        self.assertEqual(self.cache.get('a'), {'password': 'a'})
+        self.assertIsNone(self.cache.get('c'))
+
+    def test_set__lru(self):
+        """Test that the least recently used user is discarded."""
+        self.cache.get('a')
+        self.cache.set('c', {'password': 'c'})
+
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(len(self.cache), 2)
+
+    def test_invalidate(self):
+        """Test invalidate and clear methods."""
+        self.cache.invalidate('a')
+        self.assertIsNone(self.cache.get('a'))
+
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_set__generation(self):
+        """Test that data retrieved before an invalidation is not stored."""
+        generation = self.cache.generation
+        self.cache.invalidate('c')
+        self.cache.set('c', {'password': 'old'}, generation)
+
+        self.assertIsNone(self.cache.get('c'))
+
+        self.cache.set('c', {'password': 'new'}, self.cache.generation)
+        self.assertEqual(self.cache.get('c'), {'password': 'new'})
+
+    def test_get__expired(self):
+        """Test that users are removed after the TTL."""
+        cache = UserCache(ttl=60)
+        with patch('kytos.core.auth.time.monotonic', return_value=100):
+            cache.set('a', {'password': 'a'})
+        with patch('kytos.core.auth.time.monotonic', return_value=159):
+            self.assertEqual(cache.get('a'), {'password': 'a'})
+        with patch('kytos.core.auth.time.monotonic', return_value=160):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
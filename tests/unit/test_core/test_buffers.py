@@ -3,7 +3,8 @@ import asyncio
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
-from kytos.core.buffers import KytosBuffers, KytosEventBuffer
+from kytos.core.buffers import (EVENTS_GOT, EVENTS_PUT, KytosBuffers,
+                                KytosEventBuffer)
 
 
 # pylint: disable=protected-access
@@ -33,6 +34,17 @@ class TestKytosEventBuffer(TestCase):
 
         self.assertEqual(queue_event, event)
 
+    def test_put_get__metrics(self):
+        """Test that put and get update the buffer counters."""
+        put = EVENTS_PUT.value('name', 'any')
+        got = EVENTS_GOT.value('name')
+
+        self.kytos_event_buffer.put(self.create_event_mock())
+        self.kytos_event_buffer.get()
+
+        self.assertEqual(EVENTS_PUT.value('name', 'any'), put + 1)
+        self.assertEqual(EVENTS_GOT.value('name'), got + 1)
+
     def test_put__shutdown(self):
         """Test put method to shutdown event."""
         event = self.create_event_mock('kytos/core.shutdown')
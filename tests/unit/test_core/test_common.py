@@ -1,8 +1,9 @@
 """Test kytos.core.common module."""
+import json
 from unittest import TestCase
 from unittest.mock import MagicMock
 
-from kytos.core.common import GenericEntity
+from kytos.core.common import CachedAttribute, GenericEntity, parse_fields
 
 
 # pylint: disable=protected-access, too-many-public-methods
@@ -175,3 +176,130 @@ class TestGenericEntity(TestCase):
 
         metadata = self.generic_entity.metadata
         self.assertEqual(metadata, {'ABC': 456, 'DEF': 789})
+
+    def test_extend_metadata__not_force_changes(self):
+        """Test that extend_metadata records one change with the new keys."""
+        self.generic_entity._notify_change = MagicMock()
+        self.generic_entity.metadata = {'ABC': 123}
+
+        self.generic_entity.extend_metadata({'ABC': 456, 'DEF': 789,
+                                             'GHI': 0}, False)
+        self.generic_entity.extend_metadata({'ABC': 456}, False)
+
+        self.generic_entity._notify_change.assert_called_once_with(
+            'metadata_added', keys=['DEF', 'GHI'])
+
+    def test_remove_metadata_keys(self):
+        """Test remove_metadata_keys method."""
+        self.generic_entity.metadata = {'ABC': 123, 'DEF': 456}
+
+        removed = self.generic_entity.remove_metadata_keys(['ABC', 'GHI'])
+
+        self.assertEqual(removed, ['ABC'])
+        self.assertEqual(self.generic_entity.metadata, {'DEF': 456})
+
+    def test_update_metadata_index(self):
+        """Test that metadata changes update the metadata index."""
+        registry = MagicMock()
+        self.generic_entity._get_registry = MagicMock(return_value=registry)
+        self.generic_entity.metadata = {'ABC': 123}
+
+        self.generic_entity.update_metadata('ABC', 456)
+
+        index = registry.metadata_index
+        index.remove.assert_called_with(self.generic_entity, {'ABC': 123})
+        index.add.assert_called_with(self.generic_entity, {'ABC': 456})
+
+    def test_version(self):
+        """Test that changes increment the entity version."""
+        self.assertEqual(self.generic_entity.version, 0)
+
+        self.generic_entity.disable()
+        self.generic_entity.add_metadata('ABC', 123)
+        self.generic_entity.add_metadata('ABC', 456)
+
+        self.assertEqual(self.generic_entity.version, 2)
+
+    def test_notify_change(self):
+        """Test that changes are recorded in the registry journal."""
+        registry = MagicMock()
+        self.generic_entity._get_registry = MagicMock(return_value=registry)
+
+        self.generic_entity.update_metadata('ABC', 123)
+
+        registry.journal.record.assert_called_with(
+            self.generic_entity, 'metadata_updated', {'keys': ['ABC']})
+
+    def test_get_cached(self):
+        """Test that cached values are built again after invalidation."""
+        build = MagicMock(side_effect=[1, 2])
+
+        self.assertEqual(self.generic_entity._get_cached('value', build), 1)
+        self.assertEqual(self.generic_entity._get_cached('value', build), 1)
+        self.generic_entity.invalidate_cache()
+        self.assertEqual(self.generic_entity._get_cached('value', build), 2)
+
+    def test_cached_attribute(self):
+        """Test that assigning a cached attribute invalidates the cache."""
+        class Entity(GenericEntity):
+            """Entity with a cached attribute."""
+
+            name = CachedAttribute()
+
+        entity = Entity()
+        entity.name = 'first'
+        entity._get_cached('value', lambda: 1)
+
+        entity.metadata = {'other': 1}
+        self.assertIn('_cache', entity.__dict__)
+
+        entity.name = 'name'
+        self.assertEqual(entity.name, 'name')
+        self.assertNotIn('_cache', entity.__dict__)
+
+        entity._get_cached('value', lambda: 1)
+        del entity.name
+        self.assertNotIn('_cache', entity.__dict__)
+        self.assertNotIn('name', entity.__dict__)
+
+    def test_cached_json(self):
+        """Test that _cached_json output is the same as json.dumps."""
+        data = {'id': 'A', 'active': None, 'list': [1, 2]}
+
+        result = self.generic_entity._cached_json(
+            lambda: data, {'active': 'true', 'extra': '{"a": 1}'})
+
+        expected = json.dumps({'id': 'A', 'active': True, 'list': [1, 2],
+                               'extra': {'a': 1}})
+        self.assertEqual(result, expected)
+
+    def test_project(self):
+        """Test that _project only computes the requested fields."""
+        dynamic = {'active': MagicMock(return_value=True),
+                   'nested': MagicMock(return_value={'a': 1})}
+
+        result = self.generic_entity._project(
+            {'id': None, 'nested': {'a': None}, 'missing': None},
+            lambda: {'id': 'A', 'name': 'name'}, dynamic)
+
+        self.assertEqual(result, {'id': 'A', 'nested': {'a': 1}})
+        dynamic['nested'].assert_called_with({'a': None})
+        dynamic['active'].assert_not_called()
+
+
+class TestParseFields(TestCase):
+    """Test the parse_fields function."""
+
+    def test_parse_fields(self):
+        """Test comma separated and nested fields."""
+        self.assertEqual(parse_fields('id, active,interfaces.name,,'),
+                         {'id': None, 'active': None,
+                          'interfaces': {'name': None}})
+        self.assertEqual(parse_fields(['a.b.c', 'a.d']),
+                         {'a': {'b': {'c': None}, 'd': None}})
+        self.assertEqual(parse_fields({'id': None}), {'id': None})
+
+    def test_parse_fields__whole_value(self):
+        """Test that a field without subfields returns the whole value."""
+        self.assertEqual(parse_fields('a,a.b'), {'a': None})
+        self.assertEqual(parse_fields('a.b,a'), {'a': None})
@@ -4,14 +4,19 @@ import json
 import logging
 import sys
 import tempfile
+import threading
 import warnings
 from copy import copy
+from datetime import datetime, timezone
 from unittest import TestCase
 from unittest.mock import MagicMock, Mock, call, patch
 
 from kytos.core import Controller
 from kytos.core.config import KytosConfig
+from kytos.core.exceptions import KytosMemoryTracingDisabled
+from kytos.core.interface import Interface
 from kytos.core.logs import LogManager
+from kytos.core.switch import Switch
 
 
 # pylint: disable=protected-access, too-many-public-methods
@@ -49,7 +54,7 @@ class TestController(TestCase):
         handlers_bak = copy(logging.root.handlers)
 
         # Minimum to instantiate Controller
-        options = Mock(napps='')
+        options = Mock(napps='', api_server_mode='threading')
         path.return_value.exists.return_value = False
         controller = Controller(options, loop=loop)
 
@@ -259,17 +264,20 @@ class TestController(TestCase):
         api_server = MagicMock()
         napp_dir_listener = MagicMock()
         pool = MagicMock()
+        change_publisher = MagicMock()
         self.controller.server = server
         self.controller.buffers = buffers
         self.controller.api_server = api_server
         self.controller.napp_dir_listener = napp_dir_listener
         self.controller._pool = pool
+        self.controller.change_publisher = change_publisher
 
         self.controller.stop_controller()
 
         buffers.send_stop_signal.assert_called()
         api_server.stop_api_server.assert_called()
         napp_dir_listener.stop.assert_called()
+        change_publisher.stop.assert_called()
         pool.shutdown.assert_called()
         mock_unload_napps.assert_called()
         server.shutdown.assert_called()
@@ -345,6 +353,31 @@ class TestController(TestCase):
 
         self.assertEqual(resp_interface, interface)
 
+    def test_get_interface_by_id__registry(self):
+        """Test get_interface_by_id method using the registry index."""
+        interface = MagicMock()
+        interface_id = '00:00:00:00:00:00:00:01:123'
+        self.controller.registry.interfaces[interface_id] = interface
+
+        resp_interface = self.controller.get_interface_by_id(interface_id)
+
+        self.assertEqual(resp_interface, interface)
+
+    def test_topology_queries(self):
+        """Test the registry queries exposed by the controller."""
+        self.controller.registry = MagicMock()
+
+        self.controller.get_interface_by_mac('mac')
+        self.controller.get_link_by_id('link_id')
+        self.controller.get_links_by_dpid('dpid')
+        self.controller.get_neighbors('dpid')
+
+        registry = self.controller.registry
+        registry.get_interface_by_mac.assert_called_with('mac')
+        registry.get_link.assert_called_with('link_id')
+        registry.get_links.assert_called_with('dpid')
+        registry.get_neighbors.assert_called_with('dpid')
+
     def test_get_switch_by_dpid(self):
         """Test get_switch_by_dpid method."""
         dpid = '00:00:00:00:00:00:00:01'
@@ -377,6 +410,218 @@ class TestController(TestCase):
         expected_switches = {'00:00:00:00:00:00:00:01': switch}
         self.assertEqual(self.controller.switches, expected_switches)
 
+    def test_add_new_switch__copy_on_write(self):
+        """Test that add_new_switch does not change the previous dict."""
+        switches = self.controller.switches
+
+        self.controller.add_new_switch(Switch('00:00:00:00:00:00:00:01'))
+
+        self.assertEqual(switches, {})
+        self.assertIsNot(self.controller.switches, switches)
+
+    def test_add_new_switch__concurrent(self):
+        """Test that switches added by concurrent threads are not lost."""
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+        def add_switches(thread):
+            for number in range(100):
+                dpid = f'00:00:00:00:00:00:{thread:02x}:{number:02x}'
+                self.controller.add_new_switch(Switch(dpid))
+
+        threads = [threading.Thread(target=add_switches, args=(thread,))
+                   for thread in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.controller.switches), 800)
+        self.assertEqual(len(self.controller.snapshot().switches), 800)
+
+    def test_rest_metrics(self):
+        """Test rest_metrics method."""
+        self.controller.switches = {'00:00:00:00:00:00:00:01': MagicMock()}
+
+        body, code, headers = self.controller.rest_metrics()
+
+        self.assertEqual(code, 200)
+        self.assertTrue(headers['Content-Type'].startswith('text/plain'))
+        self.assertIn('kytos_switches 1\n', body)
+        self.assertIn('kytos_buffer_size{buffer="app_event"} 0', body)
+
+    @patch('kytos.core.controller.TRACER')
+    def test_rest_traces(self, mock_tracer):
+        """Test rest_traces method."""
+        mock_tracer.chrome_trace.return_value = {'traceEvents': []}
+
+        body, code = self.controller.rest_traces()
+
+        self.assertEqual(code, 200)
+        self.assertEqual(json.loads(body), {'traceEvents': []})
+
+    @patch('kytos.core.controller.SamplingProfiler')
+    def test_rest_profile(self, mock_profiler):
+        """Test rest_profile method."""
+        profiler = mock_profiler.return_value.run.return_value
+        profiler.collapsed.return_value = 'MainThread;kytos:main 1\n'
+
+        body, code, _ = self.controller.rest_profile(2)
+
+        self.assertEqual(code, 200)
+        self.assertEqual(body, 'MainThread;kytos:main 1\n')
+        mock_profiler.return_value.run.assert_called_with(2)
+
+    def test_rest_profile__invalid_seconds(self):
+        """Test rest_profile method with too many seconds."""
+        _, code = self.controller.rest_profile(3600)
+
+        self.assertEqual(code, 400)
+
+    @patch('kytos.core.controller.ACCOUNTING')
+    def test_rest_listeners(self, mock_accounting):
+        """Test rest_listeners and rest_listeners_by_napp methods."""
+        mock_accounting.top.return_value = [{'name': 'kytos/of_core'}]
+
+        body, code = self.controller.rest_listeners_by_napp('wall')
+
+        self.assertEqual(code, 200)
+        self.assertEqual(json.loads(body), [{'name': 'kytos/of_core'}])
+        mock_accounting.top.assert_called_with('wall', True, None)
+
+        mock_accounting.top.side_effect = ValueError
+        _, code = self.controller.rest_listeners('memory')
+        self.assertEqual(code, 400)
+
+    @patch('kytos.core.controller.container_sizes', return_value={})
+    @patch('kytos.core.controller.object_counts', return_value={})
+    def test_rest_memory(self, *_):
+        """Test rest_memory method."""
+        self.controller.memory = MagicMock(tracing=True)
+        self.controller.memory.allocations.return_value = [
+            {'owner': 'kytos/of_core', 'size': 10, 'count': 1}]
+
+        body, code = self.controller.rest_memory()
+
+        self.assertEqual(code, 200)
+        self.assertEqual(json.loads(body)['allocations'][0]['owner'],
+                         'kytos/of_core')
+
+    def test_rest_memory_tracing(self):
+        """Test rest_memory_tracing method."""
+        self.controller.memory = MagicMock(tracing=True)
+
+        _, code = self.controller.rest_memory_tracing('start')
+        self.controller.memory.start.assert_called_once()
+        self.assertEqual(code, 200)
+
+        self.controller.rest_memory_tracing('stop')
+        self.controller.memory.stop.assert_called_once()
+
+        _, code = self.controller.rest_memory_tracing('pause')
+        self.assertEqual(code, 404)
+
+    def test_rest_memory_diff__disabled(self):
+        """Test rest_memory_diff method without tracing."""
+        self.controller.memory = MagicMock()
+        self.controller.memory.diff.side_effect = KytosMemoryTracingDisabled
+
+        _, code = self.controller.rest_memory_diff()
+
+        self.assertEqual(code, 409)
+
+    def test_snapshot(self):
+        """Test snapshot method."""
+        switch = Switch('00:00:00:00:00:00:00:01')
+        self.controller.add_new_switch(switch)
+
+        snapshot = self.controller.snapshot()
+
+        self.assertIs(snapshot, self.controller.registry.snapshot)
+        self.assertIs(snapshot.switches[switch.dpid], switch)
+        self.assertEqual(switch.registry, self.controller.registry)
+
+    def test_get_entity_page(self):
+        """Test get_entity_page method."""
+        for dpid in ('00:00:00:00:00:00:00:02', '00:00:00:00:00:00:00:01'):
+            self.controller.add_new_switch(Switch(dpid))
+
+        page = self.controller.get_entity_page('switches', 'id', limit=1)
+        self.assertEqual(page['switches'],
+                         [{'id': '00:00:00:00:00:00:00:01'}])
+
+        page = self.controller.get_entity_page('switches', 'id,active',
+                                               page['next_cursor'])
+        self.assertEqual(page, {'switches': [{'id': '00:00:00:00:00:00:00:02',
+                                              'active': True}],
+                                'next_cursor': None})
+
+    def test_get_entity_page__interfaces(self):
+        """Test that the interfaces of all switches are paged by id."""
+        switch = Switch('00:00:00:00:00:00:00:01')
+        for port in (2, 1):
+            switch.update_interface(Interface(f's1-eth{port}', port, switch))
+        self.controller.add_new_switch(switch)
+
+        page = self.controller.get_entity_page('interfaces', 'id', limit=1)
+
+        self.assertEqual(page['interfaces'],
+                         [{'id': '00:00:00:00:00:00:00:01:1'}])
+        self.assertIsNotNone(page['next_cursor'])
+
+    def test_rest_switches(self):
+        """Test rest_switches method and its errors."""
+        self.controller.add_new_switch(Switch('00:00:00:00:00:00:00:01'))
+        app = self.controller.api_server.app
+
+        with app.test_request_context('/?fields=id&limit=5'):
+            resp, code = self.controller.rest_switches()
+        self.assertEqual(code, 200)
+        self.assertEqual(json.loads(resp),
+                         {'switches': [{'id': '00:00:00:00:00:00:00:01'}],
+                          'next_cursor': None})
+
+        for query in ('/?limit=0', '/?limit=a', '/?cursor=%25'):
+            with app.test_request_context(query):
+                resp, code = self.controller.rest_switches()
+            self.assertEqual(code, 400)
+            self.assertIn('error', json.loads(resp))
+
+    def test_rest_switches__not_modified(self):
+        """Test rest_switches method when the client has the last page."""
+        app = self.controller.api_server.app
+        app.add_url_rule('/switches', 'switches',
+                         self.controller.rest_switches)
+        client = app.test_client()
+        self.controller.add_new_switch(Switch('00:00:00:00:00:00:00:01'))
+        response = client.get('/switches?fields=id,active')
+        etag = response.headers['ETag']
+
+        response = client.get('/switches?fields=id,active',
+                              headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        response = client.get('/switches?fields=id',
+                              headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+        # The switch becomes inactive without a journal entry
+        switch = self.controller.switches['00:00:00:00:00:00:00:01']
+        switch.lastseen = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        response = client.get('/switches?fields=id,active',
+                              headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(json.loads(response.data)['switches'][0]['active'])
+
+    def test_rest_interfaces_and_links(self):
+        """Test rest_interfaces and rest_links methods."""
+        with self.controller.api_server.app.test_request_context():
+            self.assertEqual(json.loads(self.controller.rest_interfaces()[0]),
+                             {'interfaces': [], 'next_cursor': None})
+            self.assertEqual(json.loads(self.controller.rest_links()[0]),
+                             {'links': [], 'next_cursor': None})
+
     def test_create_or_update_connection(self):
         """Test create_or_update_connection method."""
         self.controller.connections = {}
@@ -549,7 +794,7 @@ class TestController(TestCase):
     @patch('kytos.core.controller.Controller.load_napp')
     def test_load_napps(self, mock_load):
         """Test load_napps method."""
-        napp = MagicMock()
+        napp = MagicMock(id='kytos/name', napp_dependencies=[])
         napp.username = 'kytos'
         napp.name = 'name'
         enabled_napps = [napp]
@@ -559,6 +804,37 @@ class TestController(TestCase):
 
         mock_load.assert_called_with('kytos', 'name')
 
+    def test_load_napps__dependencies(self):
+        """Test that NApps are loaded after their dependencies."""
+        loaded = []
+
+        def load_napp(username, napp_name):
+            loaded.append(f'{username}/{napp_name}')
+            self.controller.napps_load_times[(username, napp_name)] = {
+                'import': 0.1, 'setup': 0.2, 'start': 0.3}
+
+        napps = []
+        for name, dependencies in (('topology', ['kytos/of_core']),
+                                   ('of_core', []),
+                                   ('mef_eline', ['kytos/topology',
+                                                  'kytos/pathfinder'])):
+            napp = MagicMock(id=f'kytos/{name}',
+                             napp_dependencies=dependencies)
+            napp.username = 'kytos'
+            napp.name = name
+            napps.append(napp)
+        self.napps_manager.get_enabled_napps.return_value = napps
+        self.controller.load_napp = load_napp
+        self.controller.log = MagicMock()
+
+        self.controller.load_napps()
+
+        self.assertEqual(loaded, ['kytos/of_core', 'kytos/topology',
+                                  'kytos/mef_eline'])
+        table = self.controller.log.info.call_args[0][-1]
+        self.assertIn('kytos/of_core', table)
+        self.assertIn('  0.200', table)
+
     @patch('kytos.core.controller.import_module')
     def test_reload_napp_module__module_not_found(self, mock_import_module):
         """Test reload_napp_module method when module is not found."""
@@ -628,6 +904,46 @@ class TestController(TestCase):
         self.assertEqual(resp, 'reloaded')
         self.assertEqual(code, 200)
 
+    def test_rest_changes(self):
+        """Test rest_changes method."""
+        switch = MagicMock(id='00:00:00:00:00:00:00:01')
+        self.controller.registry.journal.record(switch, 'enabled')
+
+        with self.controller.api_server.app.test_request_context():
+            resp, code = self.controller.rest_changes(0)
+
+        changes = json.loads(resp)
+        self.assertEqual(code, 200)
+        self.assertEqual(changes['version'], 1)
+        self.assertEqual(changes['changes'][0]['action'], 'enabled')
+
+    def test_rest_changes__resync(self):
+        """Test rest_changes method with an unknown version."""
+        with self.controller.api_server.app.test_request_context():
+            resp, code = self.controller.rest_changes(10)
+
+        self.assertEqual(code, 410)
+        self.assertIsNone(json.loads(resp)['changes'])
+
+    def test_rest_changes__not_modified(self):
+        """Test rest_changes method when the client has the last version."""
+        app = self.controller.api_server.app
+        app.add_url_rule('/changes/<int:version>', 'changes',
+                         self.controller.rest_changes)
+        client = app.test_client()
+        response = client.get('/changes/0')
+        etag = response.headers['ETag']
+        self.assertEqual(etag, 'W/"changes-0-0"')
+
+        response = client.get('/changes/0', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        switch = MagicMock(id='00:00:00:00:00:00:00:01')
+        self.controller.registry.journal.record(switch, 'enabled')
+        response = client.get('/changes/0', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['ETag'], 'W/"changes-0-1"')
+
     @patch('kytos.core.controller.Controller.reload_napp')
     def test_rest_reload_all_napps(self, mock_reload_napp):
         """Test rest_reload_all_napps method."""
@@ -2,7 +2,8 @@
 from unittest import TestCase
 from unittest.mock import patch
 
-from kytos.core.helpers import get_time, run_on_thread
+from kytos.core.helpers import (LISTENER_DURATION, get_time, listen_to,
+                                run_on_thread)
 
 
 class TestHelpers(TestCase):
@@ -21,6 +22,45 @@ class TestHelpers(TestCase):
 
         mock_thread.return_value.start.assert_called()
 
+    @patch('kytos.core.helpers.Thread')
+    def test_listen_to(self, mock_thread):
+        """Test that listen_to measures the duration of the handler."""
+
+        @listen_to('kytos/core.test')
+        def handler(event):
+            self.assertEqual(event, 'event')
+
+        listener = f'{__name__}.TestHelpers.test_listen_to.<locals>.handler'
+        calls = LISTENER_DURATION.value(listener)
+
+        handler('event')
+        kwargs = mock_thread.call_args[1]
+        kwargs['target'](*kwargs['args'])
+
+        self.assertEqual(handler.events, ['kytos/core.test'])
+        self.assertEqual(LISTENER_DURATION.value(listener), calls + 1)
+
+    @patch('kytos.core.helpers.ACCOUNTING')
+    @patch('kytos.core.helpers.Thread')
+    def test_listen_to__accounting(self, mock_thread, mock_accounting):
+        """Test that listen_to accounts the calls and errors."""
+
+        @listen_to('kytos/core.test')
+        def handler(_):
+            raise ValueError
+
+        listener = (f'{__name__}.TestHelpers.test_listen_to__accounting.'
+                    '<locals>.handler')
+        handler('event')
+        kwargs = mock_thread.call_args[1]
+        with self.assertRaises(ValueError):
+            kwargs['target'](*kwargs['args'])
+
+        mock_accounting.started.assert_called_with(listener, __name__)
+        args = mock_accounting.finished.call_args[0]
+        self.assertEqual(args[:2], (listener, __name__))
+        self.assertTrue(args[4])
+
     def test_get_time__str(self):
         """Test get_time method passing a string as parameter."""
         date = get_time("2000-01-01T00:30:00")
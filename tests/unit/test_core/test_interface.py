@@ -1,10 +1,12 @@
 """Interface tests."""
+import json
 import logging
 import unittest
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, patch
 
 from pyof.v0x04.common.port import PortFeatures
 
+from kytos.core.connection import Connection, ConnectionState
 from kytos.core.interface import TAG, UNI, Interface, TAGType
 from kytos.core.switch import Switch
 
@@ -122,6 +124,58 @@ class TestInterface(unittest.TestCase):
         self.assertEqual(10 * 10**6 / 8, self.iface.speed)
         self.assertEqual('10 Mbps', self.iface.get_hr_speed())
 
+    def test_as_json(self):
+        """Test that as_json is the JSON of as_dict."""
+        self.iface.add_metadata('key', 'value')
+
+        self.assertEqual(self.iface.as_json(),
+                         json.dumps(self.iface.as_dict()))
+
+    def test_as_dict__fields(self):
+        """Test as_dict method with a projection."""
+        self.iface.add_metadata('key', 'value')
+
+        self.assertEqual(self.iface.as_dict('id,metadata,stats'),
+                         {'id': 'dpid:42', 'metadata': {'key': 'value'}})
+        self.iface.stats = Mock()
+        self.iface.stats.as_dict.return_value = {'rx': 1}
+        self.assertEqual(self.iface.as_dict(['stats']), {'stats': {'rx': 1}})
+
+    def test_as_dict__cache(self):
+        """Test that the cached dict is updated by assignments."""
+        self.iface.features = PortFeatures.OFPPF_10MB_FD
+        self.assertEqual(self.iface.as_dict()['speed'], 10 * 10**6 / 8)
+
+        self.iface.features = PortFeatures.OFPPF_1GB_FD
+        self.iface.add_metadata('key', 'value')
+        self.iface.disable()
+
+        iface_dict = self.iface.as_dict()
+        self.assertEqual(iface_dict['speed'], 10**9 / 8)
+        self.assertEqual(iface_dict['metadata'], {'key': 'value'})
+        self.assertFalse(iface_dict['enabled'])
+
+    def test_as_dict__switch_connection(self):
+        """Test that the speed follows the state of the switch connection."""
+        switch = Switch('dpid')
+        connection = Connection('addr', 'port', Mock())
+        connection.protocol.version = 0x04
+        switch.update_connection(connection)
+        iface = Interface('name', 42, switch,
+                          features=PortFeatures.OFPPF_40GB_FD)
+        switch.update_interface(iface)
+        self.assertIsNone(iface.as_dict()['speed'])
+
+        connection.set_established_state()
+        self.assertEqual(iface.as_dict()['speed'], 40 * 10**9 / 8)
+        self.assertEqual(iface.as_dict('speed'), {'speed': 40 * 10**9 / 8})
+        self.assertEqual(json.loads(iface.as_json())['speed'],
+                         40 * 10**9 / 8)
+
+        connection.state = ConnectionState.FINISHED
+        self.assertIsNone(iface.as_dict()['speed'])
+        self.assertIsNone(json.loads(iface.as_json())['speed'])
+
     def test_speed_setter(self):
         """Should return speed that was set and not features'."""
         expected_speed = 12345
@@ -243,6 +297,57 @@ class TestInterface(unittest.TestCase):
 
         self.assertEqual(len(self.iface.endpoints), 1)
 
+    def test_update_endpoint__order(self):
+        """Test that an updated endpoint is moved to the end."""
+        self.iface.add_endpoint('endpoint_1')
+        self.iface.add_endpoint('endpoint_2')
+
+        self.iface.update_endpoint('endpoint_1')
+
+        endpoints = [endpoint for endpoint, _ in self.iface.endpoints]
+        self.assertEqual(endpoints, ['endpoint_2', 'endpoint_1'])
+
+    def test_endpoints__copy(self):
+        """Test that the endpoints are only changed through the methods."""
+        self.iface.add_endpoint('endpoint_1')
+
+        self.assertIsInstance(self.iface.endpoints, list)
+        self.iface.endpoints.append(('endpoint_2', None))
+        self.assertEqual(len(self.iface.endpoints), 1)
+
+        self.assertIsInstance(self.iface.endpoints_view, tuple)
+        with self.assertRaises(AttributeError):
+            # pylint: disable=no-member
+            self.iface.endpoints_view.append(('endpoint_2', None))
+        self.assertEqual(self.iface.endpoints_view,
+                         tuple(self.iface.endpoints))
+
+    def test_get_endpoint__interface_and_address(self):
+        """Test get_endpoint method with an Interface and a hw_address."""
+        interface = Interface('eth1', 1, self.iface.switch)
+        address = MagicMock(value='00:00:00:00:00:01')
+        self.iface.add_endpoint(interface)
+        self.iface.add_endpoint(address)
+
+        self.assertEqual(self.iface.get_endpoint(interface)[0], interface)
+        self.assertEqual(self.iface.get_endpoint('00:00:00:00:00:01')[0],
+                         address)
+
+    @patch('kytos.core.interface.monotonic')
+    def test_expire_endpoints(self, mock_monotonic):
+        """Test expire_endpoints method."""
+        mock_monotonic.return_value = 100
+        self.iface.add_endpoint('endpoint_1')
+        mock_monotonic.return_value = 150
+        self.iface.add_endpoint('endpoint_2')
+
+        mock_monotonic.return_value = 170
+        expired = self.iface.expire_endpoints(max_age=60)
+
+        self.assertEqual(expired, ['endpoint_1'])
+        self.assertIsNone(self.iface.get_endpoint('endpoint_1'))
+        self.assertIsNotNone(self.iface.get_endpoint('endpoint_2'))
+
     def test_update_link__none(self):
         """Test update_link method when this interface is not in link
            endpoints."""
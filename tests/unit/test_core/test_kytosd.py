@@ -2,7 +2,8 @@
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
-from kytos.core.kytosd import _create_pid_dir, async_main, create_shell, main
+from kytos.core.kytosd import (_create_pid_dir, async_main, create_shell, main,
+                               profile_magic, top_magic)
 
 
 class TestKytosd(TestCase):
@@ -38,6 +39,33 @@ class TestKytosd(TestCase):
 
         mock_interactive_shell.assert_called()
 
+    @staticmethod
+    @patch('builtins.print')
+    @patch('kytos.core.kytosd.SamplingProfiler')
+    def test_profile_magic(mock_profiler, mock_print):
+        """Test profile_magic function."""
+        profiler = mock_profiler.return_value.run.return_value
+        profiler.by_napp.return_value.most_common.return_value = [
+            ('kytos/of_core', 3)]
+        profiler.stacks.most_common.return_value = []
+
+        profile_magic('2')
+
+        mock_profiler.return_value.run.assert_called_with(2.0)
+        mock_print.assert_called_with('       3 kytos/of_core')
+
+    @staticmethod
+    @patch('builtins.print')
+    @patch('kytos.core.kytosd.ACCOUNTING')
+    def test_top_magic(mock_accounting, mock_print):
+        """Test top_magic function."""
+        mock_accounting.top.return_value = []
+
+        top_magic('wall napps')
+
+        mock_accounting.top.assert_called_with('wall', True, limit=20)
+        mock_print.assert_called_once()
+
     @staticmethod
     @patch('kytos.core.kytosd.async_main')
     @patch('kytos.core.kytosd._create_pid_dir')
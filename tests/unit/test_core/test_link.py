@@ -1,4 +1,5 @@
 """Link tests."""
+import json
 import logging
 import time
 import unittest
@@ -12,7 +13,7 @@ from kytos.core.switch import Switch
 logging.basicConfig(level=logging.CRITICAL)
 
 
-# pylint: disable=protected-access
+# pylint: disable=protected-access, too-many-public-methods
 class TestLink(unittest.TestCase):
     """Test Links."""
 
@@ -66,6 +67,40 @@ class TestLink(unittest.TestCase):
         self.assertEqual(ids[2], ids[3])
         self.assertNotEqual(ids[0], ids[2])
 
+    def test_as_json(self):
+        """Test that as_json is the JSON of as_dict."""
+        link = Link(self.iface1, self.iface2)
+        link.add_metadata('key', 'value')
+
+        self.assertEqual(link.as_json(), json.dumps(link.as_dict()))
+
+    def test_as_dict__cache(self):
+        """Test that the cached id follows the endpoints."""
+        link = Link(self.iface1, self.iface2)
+        self.iface1.update_link(link)
+        link_id = link.as_dict()['id']
+        self.assertEqual(link.as_dict('id'), {'id': link_id})
+
+        self.iface1.port_number = 1
+        self.assertNotEqual(link.as_dict()['id'], link_id)
+        self.assertEqual(link.as_dict()['id'], link.id)
+
+        link_id = link.as_dict()['id']
+        iface3 = Interface('interface3', 43, self.iface1.switch)
+        link.endpoint_b = iface3
+        self.assertNotEqual(link.as_dict()['id'], link_id)
+        self.assertEqual(json.loads(link.as_json())['id'], link.id)
+
+    def test_as_dict__fields(self):
+        """Test as_dict method with a projection."""
+        link = Link(self.iface1, self.iface2)
+
+        self.assertEqual(link.as_dict('id,endpoint_a.port_number,enabled'),
+                         {'id': link.id, 'endpoint_a': {'port_number': 41},
+                          'enabled': False})
+        self.assertEqual(link.as_dict('endpoint_b')['endpoint_b'],
+                         self.iface2.as_dict())
+
     def test_init(self):
         """Test normal Link initialization."""
         link = Link(self.iface1, self.iface2)
@@ -0,0 +1,47 @@
+"""Test kytos.core.loop_monitor module."""
+import asyncio
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from kytos.core.loop_monitor import LOOP_LAG, LOOP_STALLS, LoopMonitor
+
+
+class TestLoopMonitor(TestCase):
+    """LoopMonitor tests."""
+
+    def setUp(self):
+        """Create a monitor of a new loop."""
+        self.loop = asyncio.new_event_loop()
+        self.monitor = LoopMonitor(self.loop, interval=0.01, threshold=0.1)
+
+    def tearDown(self):
+        """Stop the monitor and close the loop."""
+        self.monitor.stop()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.loop.close()
+
+    def test_sample(self):
+        """Test that the loop lag is recorded."""
+        samples = LOOP_LAG.value()
+
+        self.monitor.start()
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+
+        self.assertGreater(LOOP_LAG.value(), samples)
+
+    @patch('kytos.core.loop_monitor.LOG')
+    def test_watchdog(self, mock_log):
+        """Test that the stack is logged once when the loop is blocked."""
+        stalls = LOOP_STALLS.value()
+
+        def blocking_callback():
+            time.sleep(0.4)
+
+        self.monitor.start()
+        self.loop.call_soon(blocking_callback)
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+
+        self.assertEqual(LOOP_STALLS.value(), stalls + 1)
+        mock_log.warning.assert_called_once()
+        self.assertIn('blocking_callback', mock_log.warning.call_args[0][2])
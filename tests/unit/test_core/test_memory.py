@@ -0,0 +1,104 @@
+"""Test kytos.core.memory module."""
+import tracemalloc
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from kytos.core.exceptions import KytosMemoryTracingDisabled
+from kytos.core.memory import (MemoryInspector, container_sizes, file_owner,
+                               object_counts)
+from kytos.core.registry import EntityRegistry
+from kytos.core.switch import Switch
+
+
+class TestMemoryInspector(TestCase):
+    """MemoryInspector tests."""
+
+    def setUp(self):
+        """Create an inspector."""
+        self.inspector = MemoryInspector()
+
+    def tearDown(self):
+        """Stop tracing."""
+        self.inspector.stop()
+
+    def test_tracing_disabled(self):
+        """Test that snapshots need tracing to be started."""
+        self.assertFalse(self.inspector.tracing)
+        with self.assertRaises(KytosMemoryTracingDisabled):
+            self.inspector.allocations()
+
+    def test_allocations(self):
+        """Test that allocations are grouped by owner."""
+        self.inspector.start()
+        self.assertTrue(tracemalloc.is_tracing())
+        data = [Switch(f'00:00:00:00:00:00:00:{i:02x}') for i in range(50)]
+
+        allocations = self.inspector.allocations(limit=100)
+
+        owners = [allocation['owner'] for allocation in allocations]
+        self.assertIn('kytos.core.switch', owners)
+        self.assertTrue(all(allocation['size'] > 0
+                            for allocation in allocations))
+        self.assertEqual(len(data), 50)
+
+    def test_diff(self):
+        """Test that the first diff sets the baseline."""
+        self.inspector.start()
+
+        self.assertEqual(self.inspector.diff(), [])
+        data = [Switch(f'00:00:00:00:00:00:00:{i:02x}') for i in range(50)]
+        diff = self.inspector.diff(limit=100)
+
+        switch = [item for item in diff
+                  if item['owner'] == 'kytos.core.switch'][0]
+        self.assertGreater(switch['size_diff'], 0)
+        self.assertGreater(switch['count_diff'], 0)
+        self.assertEqual(len(data), 50)
+
+
+class TestMemoryFunctions(TestCase):
+    """Tests of the memory functions."""
+
+    def test_file_owner(self):
+        """Test file_owner function."""
+        self.assertEqual(
+            file_owner('/var/lib/kytos/napps/kytos/of_core/main.py'),
+            'kytos/of_core')
+        self.assertEqual(file_owner('/lib/site-packages/kytos/core/link.py'),
+                         'kytos.core.link')
+        self.assertEqual(file_owner('/usr/lib/python3.8/json/decoder.py'),
+                         '/usr/lib/python3.8/json/decoder.py')
+
+    def test_object_counts(self):
+        """Test that only alive switches are counted."""
+        garbage = Switch('00:00:00:00:00:00:00:02')
+        garbage.cycle = garbage
+        del garbage
+        before = object_counts()
+        switch = Switch('00:00:00:00:00:00:00:01')
+
+        after = object_counts()
+        del switch
+
+        self.assertEqual(after['Switch'], before['Switch'] + 1)
+        self.assertEqual(object_counts()['Switch'], before['Switch'])
+        self.assertIn('KytosEvent', after)
+
+    def test_container_sizes(self):
+        """Test the sizes of the controller tables."""
+        switch = Switch('00:00:00:00:00:00:00:01')
+        switch.update_mac_table(MagicMock(value='00:00:00:00:00:01'), 1)
+        buffer = MagicMock()
+        buffer.name = 'app_event'
+        buffer.qsize.return_value = 3
+        controller = MagicMock(switches={switch.dpid: switch},
+                               connections={}, napps={},
+                               registry=EntityRegistry(),
+                               buffers=[buffer])
+
+        sizes = container_sizes(controller)
+
+        self.assertEqual(sizes['switches'], 1)
+        self.assertEqual(sizes['switch.mac2port'], 1)
+        self.assertEqual(sizes['buffers.app_event'], 3)
+        self.assertNotIn('registry.metadata_index', sizes)
@@ -0,0 +1,90 @@
+"""Test kytos.core.metrics module."""
+from unittest import TestCase
+
+from kytos.core.metrics import Counter, Gauge, Histogram, Metrics
+
+
+class TestCounter(TestCase):
+    """Counter tests."""
+
+    def test_inc(self):
+        """Test inc method and the exposition of a counter."""
+        counter = Counter('events_total', 'Events.', ['name'])
+
+        counter.inc('a')
+        counter.inc('a', amount=2)
+        counter.inc('b"\\')
+
+        self.assertEqual(counter.value('a'), 3)
+        self.assertEqual(counter.expose(),
+                         '# HELP events_total Events.\n'
+                         '# TYPE events_total counter\n'
+                         'events_total{name="a"} 3\n'
+                         'events_total{name="b\\"\\\\"} 1')
+
+
+class TestGauge(TestCase):
+    """Gauge tests."""
+
+    def test_set(self):
+        """Test set method."""
+        gauge = Gauge('size', 'Size.')
+
+        gauge.set(5)
+
+        self.assertEqual(gauge.expose().splitlines()[-1], 'size 5')
+
+    def test_set_function(self):
+        """Test that values are read from the function when exposed."""
+        gauge = Gauge('size', 'Size.', ['queue'])
+        gauge.set_function(lambda: {('a',): 1, ('b',): 2.5})
+
+        self.assertEqual(gauge.expose().splitlines()[2:],
+                         ['size{queue="a"} 1', 'size{queue="b"} 2.5'])
+
+
+class TestHistogram(TestCase):
+    """Histogram tests."""
+
+    def test_observe(self):
+        """Test observe method and the exposition of a histogram."""
+        histogram = Histogram('duration', 'Duration.', ['name'],
+                              buckets=(0.1, 1))
+
+        for value in 0.05, 0.1, 0.5, 2:
+            histogram.observe(value, 'a')
+
+        self.assertEqual(histogram.value('a'), 4)
+        self.assertEqual(histogram.expose().splitlines()[2:],
+                         ['duration_bucket{name="a",le="0.1"} 2',
+                          'duration_bucket{name="a",le="1"} 3',
+                          'duration_bucket{name="a",le="+Inf"} 4',
+                          'duration_sum{name="a"} 2.65',
+                          'duration_count{name="a"} 4'])
+
+
+class TestMetrics(TestCase):
+    """Metrics tests."""
+
+    def setUp(self):
+        """Create an empty set of metrics."""
+        self.metrics = Metrics()
+
+    def test_get_or_create(self):
+        """Test that metrics are created once."""
+        counter = self.metrics.counter('events_total', 'Events.')
+
+        self.assertIs(self.metrics.counter('events_total', 'Events.'),
+                      counter)
+        self.assertIs(self.metrics['events_total'], counter)
+        with self.assertRaises(ValueError):
+            self.metrics.gauge('events_total', 'Events.')
+
+    def test_expose(self):
+        """Test that metrics are exposed sorted by name."""
+        self.metrics.gauge('b', 'B.').set(1)
+        self.metrics.counter('a', 'A.').inc()
+
+        self.assertEqual(self.metrics.expose(),
+                         '# HELP a A.\n# TYPE a counter\na 1\n'
+                         '# HELP b B.\n# TYPE b gauge\nb 1\n')
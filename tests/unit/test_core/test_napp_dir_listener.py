@@ -2,6 +2,8 @@
 from unittest import TestCase
 from unittest.mock import Mock
 
+from watchdog.events import FileModifiedEvent, FileMovedEvent
+
 from kytos.core.napps.napp_dir_listener import NAppDirListener
 
 
@@ -37,3 +39,34 @@ class TestNAppDirListener(TestCase):
         """Test whether on_deleted is calling unload_napp."""
         self.napp_dir_listener.on_deleted(self.event)
         self.controller.unload_napp.assert_called_with("username", "napp_name")
+
+    def test_on_any_event(self):
+        """Test that changes of the ui dir refresh the UI manifest."""
+        manifest = self.controller.api_server.ui_manifest
+        event = FileModifiedEvent('/tmp/username/napp_name/main.py')
+        self.napp_dir_listener.on_any_event(event)
+        manifest.refresh_napp.assert_not_called()
+
+        event = FileMovedEvent('/tmp/username/napp_name/ui/k-toolbar/a~',
+                               '/tmp/username/napp_name/ui/k-toolbar/a.kytos')
+        self.napp_dir_listener.on_any_event(event)
+        manifest.refresh_napp.assert_called_with("username", "napp_name")
+
+    def test_dispatch(self):
+        """Test that every event invalidates the NApp catalog."""
+        event = FileModifiedEvent('/tmp/.installed/username/napp/kytos.json')
+        self.napp_dir_listener.dispatch(event)
+
+        self.controller.napps_manager.invalidate_catalog.assert_called_once()
+        self.controller.load_napp.assert_not_called()
+        self.controller.api_server.ui_manifest.refresh_napp.assert_not_called()
+
+    def test_dispatch__installed_ui(self):
+        """Test that changes of installed ui dirs refresh the UI manifest."""
+        event = FileModifiedEvent(
+            '/tmp/.installed/username/napp/ui/k-toolbar/main.kytos')
+        self.napp_dir_listener.dispatch(event)
+
+        manifest = self.controller.api_server.ui_manifest
+        manifest.refresh_napp.assert_called_once_with("username", "napp")
+        self.controller.load_napp.assert_not_called()
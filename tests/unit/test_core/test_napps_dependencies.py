@@ -0,0 +1,79 @@
+"""Test kytos.core.napps.dependencies module."""
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from kytos.core.napps.dependencies import (dependency_graph,
+                                           run_in_dependency_order)
+
+
+def get_napp(napp_id, dependencies):
+    """Return a NApp mock."""
+    return MagicMock(id=napp_id, napp_dependencies=dependencies)
+
+
+class TestDependencyGraph(TestCase):
+    """Test dependency_graph function."""
+
+    def test_dependency_graph(self):
+        """Test that only dependencies among the NApps are kept."""
+        napps = [get_napp('kytos/topology', ['kytos/of_core',
+                                             'kytos/storehouse:1.0']),
+                 get_napp('kytos/of_core', ['kytos/of_core']),
+                 get_napp('kytos/mef_eline',
+                          ['https://napps.kytos.io/repo/kytos/topology'])]
+
+        self.assertEqual(dependency_graph(napps),
+                         {'kytos/topology': {'kytos/of_core'},
+                          'kytos/of_core': set(),
+                          'kytos/mef_eline': {'kytos/topology'}})
+
+
+class TestRunInDependencyOrder(TestCase):
+    """Test run_in_dependency_order function."""
+
+    def test_order(self):
+        """Test that nodes run after their dependencies."""
+        finished = []
+        lock = threading.Lock()
+
+        def function(node):
+            with lock:
+                finished.append(node)
+            return node.upper()
+
+        graph = {'c': {'a', 'b'}, 'a': set(), 'b': {'a'}, 'd': set()}
+        results = run_in_dependency_order(graph, function, max_workers=4)
+
+        self.assertEqual(results, {'c': 'C', 'a': 'A', 'b': 'B', 'd': 'D'})
+        self.assertEqual(list(results), ['c', 'a', 'b', 'd'])
+        self.assertLess(finished.index('a'), finished.index('b'))
+        self.assertLess(finished.index('b'), finished.index('c'))
+
+    def test_concurrency(self):
+        """Test that independent nodes run at the same time."""
+        barrier = threading.Barrier(3, timeout=5)
+        graph = {'a': set(), 'b': set(), 'c': set()}
+
+        results = run_in_dependency_order(graph, lambda _: barrier.wait(),
+                                          max_workers=3)
+
+        self.assertEqual(sorted(results.values()), [0, 1, 2])
+
+    def test_cycle(self):
+        """Test that nodes in a cycle still run once."""
+        graph = {'a': {'b'}, 'b': {'a'}, 'c': {'a'}}
+
+        with self.assertLogs('kytos.core.napps.dependencies', 'WARNING'):
+            results = run_in_dependency_order(graph, lambda node: node)
+
+        self.assertEqual(results, {'a': 'a', 'b': 'b', 'c': 'c'})
+
+    def test_error(self):
+        """Test that errors of the function are raised."""
+        def function(node):
+            if node == 'a':
+                raise ValueError(node)
+
+        with self.assertRaises(ValueError):
+            run_in_dependency_order({'a': set(), 'b': {'a'}}, function)
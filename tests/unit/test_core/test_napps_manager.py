@@ -193,33 +193,45 @@ class TestNAppsManager(unittest.TestCase):
 
         mock_disable.assert_called_once()
 
-    @patch('kytos.core.napps.NApp.create_from_uri')
-    @patch('kytos.core.napps.NAppsManager.get_enabled_napps')
-    def test_is_enabled(self, *args):
+    @patch('kytos.core.napps.NApp.create_from_json')
+    def test_is_enabled(self, mock_create_from_json):
         """Test is_enabled method."""
-        (mock_get_enabled_napps, mock_create_from_uri) = args
-        napp = MagicMock()
-        mock_create_from_uri.return_value = napp
-        mock_get_enabled_napps.return_value = [napp]
-
-        is_enabled = self.napps_manager.is_enabled('kytos', 'napp')
+        napp = MagicMock(id='kytos/napp')
+        mock_create_from_json.return_value = napp
+        self.napps_manager._enabled_path = self.get_path(['json'])
 
-        mock_create_from_uri.assert_called_with('kytos/napp')
-        self.assertTrue(is_enabled)
+        self.assertTrue(self.napps_manager.is_enabled('kytos', 'napp'))
+        self.assertFalse(self.napps_manager.is_enabled('kytos', 'other'))
+        mock_create_from_json.assert_called_once_with('json')
 
-    @patch('kytos.core.napps.NApp.create_from_uri')
-    @patch('kytos.core.napps.NAppsManager.get_installed_napps')
-    def test_is_installed(self, *args):
+    @patch('kytos.core.napps.NApp.create_from_json')
+    def test_is_installed(self, mock_create_from_json):
         """Test is_installed method."""
-        (mock_get_installed_napps, mock_create_from_uri) = args
-        napp = MagicMock()
-        mock_create_from_uri.return_value = napp
-        mock_get_installed_napps.return_value = [napp]
+        napp = MagicMock(id='kytos/napp')
+        mock_create_from_json.return_value = napp
+        self.napps_manager._installed_path = self.get_path(['json'])
+
+        self.assertTrue(self.napps_manager.is_installed('kytos', 'napp'))
+        self.assertFalse(self.napps_manager.is_installed('kytos', 'other'))
+        mock_create_from_json.assert_called_once_with('json')
 
-        is_installed = self.napps_manager.is_installed('kytos', 'napp')
+    @patch('kytos.core.napps.NApp.create_from_json')
+    def test_invalidate_catalog(self, mock_create_from_json):
+        """Test that the NApps are read again after the invalidation."""
+        mock_create_from_json.return_value = MagicMock(id='kytos/napp')
+        self.napps_manager._installed_path = self.get_path(['json'])
+        self.napps_manager._enabled_path = self.get_path(['json'])
+        self.napps_manager.get_installed_napps()
+        self.napps_manager.get_enabled_napps()
 
-        mock_create_from_uri.assert_called_with('kytos/napp')
-        self.assertTrue(is_installed)
+        self.napps_manager.invalidate_catalog(self.napps_manager._enabled_path)
+        self.napps_manager.get_installed_napps()
+        self.napps_manager.get_enabled_napps()
+        self.assertEqual(mock_create_from_json.call_count, 3)
+
+        self.napps_manager.invalidate_catalog()
+        self.napps_manager.get_installed_napps()
+        self.assertEqual(mock_create_from_json.call_count, 4)
 
     def test_get_napp_fullname_from_uri(self):
         """Test get_napp_fullname_from_uri method."""
@@ -287,8 +299,11 @@ class TestNAppsManager(unittest.TestCase):
         mock_open.return_value.__enter__.return_value = data_file
 
         meta = self.napps_manager.get_napp_metadata('kytos', 'napp', 'version')
+        name = self.napps_manager.get_napp_metadata('kytos', 'napp', 'name')
 
         self.assertEqual(meta, '1.0')
+        self.assertEqual(name, 'napp')
+        mock_open.assert_called_once()
 
     def test_get_napp_metadata__error(self):
         """Test get_napp_metadata method to error case."""
@@ -0,0 +1,51 @@
+"""Test kytos.core.pagination module."""
+from unittest import TestCase
+
+from kytos.core.pagination import (MAX_LIMIT, decode_cursor, encode_cursor,
+                                   paginate)
+
+
+class TestPaginate(TestCase):
+    """Test the paginate function."""
+
+    def setUp(self):
+        """Create entities whose keys are not sorted."""
+        self.entities = {key: key.upper() for key in 'dbeac'}
+
+    def test_pages(self):
+        """Test that all entities are returned in order, page by page."""
+        page, cursor = paginate(self.entities, limit=2)
+        self.assertEqual(page, ['A', 'B'])
+        page, cursor = paginate(self.entities, cursor, limit=2)
+        self.assertEqual(page, ['C', 'D'])
+        page, cursor = paginate(self.entities, cursor, limit=2)
+        self.assertEqual(page, ['E'])
+        self.assertIsNone(cursor)
+
+    def test_last_full_page(self):
+        """Test that a full last page has no next cursor."""
+        page, cursor = paginate(self.entities, limit=5)
+        self.assertEqual(len(page), 5)
+        self.assertIsNone(cursor)
+
+    def test_changes_between_pages(self):
+        """Test that the cursor survives added and removed entities."""
+        _, cursor = paginate(self.entities, limit=2)
+        del self.entities['a']
+        del self.entities['c']
+        self.entities['bb'] = 'BB'
+        page, _ = paginate(self.entities, cursor, limit=2)
+        self.assertEqual(page, ['BB', 'D'])
+
+    def test_invalid(self):
+        """Test invalid limits and cursors."""
+        for limit in (0, MAX_LIMIT + 1):
+            with self.assertRaises(ValueError):
+                paginate(self.entities, limit=limit)
+        with self.assertRaises(ValueError):
+            paginate(self.entities, 'not a cursor')
+
+    def test_cursor(self):
+        """Test that cursors are decoded to the encoded key."""
+        key = '00:00:00:00:00:00:00:01:1'
+        self.assertEqual(decode_cursor(encode_cursor(key)), key)
@@ -0,0 +1,82 @@
+"""Test kytos.core.profiler module."""
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from kytos.core.profiler import SamplingProfiler, collapse, napp_id
+
+
+class TestSamplingProfiler(TestCase):
+    """SamplingProfiler tests."""
+
+    def setUp(self):
+        """Start a thread that waits until the test ends."""
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self.stop.wait,
+                                       name='waiting_thread')
+        self.thread.start()
+        self.profiler = SamplingProfiler(interval=0.001)
+
+    def tearDown(self):
+        """Stop the waiting thread."""
+        self.stop.set()
+        self.thread.join()
+
+    def test_sample(self):
+        """Test that other threads are sampled in collapsed format."""
+        self.profiler.sample()
+        self.profiler.sample()
+
+        stacks = [stack for stack in self.profiler.stacks
+                  if stack.startswith('waiting_thread;')]
+        self.assertEqual(len(stacks), 1)
+        self.assertTrue(stacks[0].endswith(';threading:wait'))
+        self.assertEqual(self.profiler.stacks[stacks[0]], 2)
+        self.assertEqual(self.profiler.samples, 2)
+        self.assertFalse(any(stack.startswith('MainThread;')
+                             for stack in self.profiler.stacks))
+        self.assertIn(f'{stacks[0]} 2\n', self.profiler.collapsed())
+
+    def test_run(self):
+        """Test that threads are sampled for the given duration."""
+        self.profiler.run(0.02)
+
+        self.assertGreater(self.profiler.samples, 1)
+
+    def test_by_napp(self):
+        """Test the number of samples of each NApp."""
+        self.profiler.stacks.update({
+            'Thread-1;kytos.core.helpers:threaded_handler;'
+            'kytos/of_core:handle;kytos/of_core:pack': 3,
+            'Thread/2;kytos.core.helpers:threaded_handler': 1,
+            'Thread-3;amlight/sdntrace:trace': 2})
+
+        self.assertEqual(self.profiler.by_napp(),
+                         {'kytos/of_core': 3, 'amlight/sdntrace': 2})
+
+
+class TestProfilerFunctions(TestCase):
+    """Tests of the profiler functions."""
+
+    def test_napp_id(self):
+        """Test napp_id function."""
+        self.assertEqual(
+            napp_id('/var/lib/kytos/napps/kytos/of_core/main.py'),
+            'kytos/of_core')
+        self.assertEqual(
+            napp_id('/var/lib/kytos/napps/../napps/kytos/topology/v1/a.py'),
+            'kytos/topology')
+        self.assertIsNone(napp_id('/var/lib/kytos/napps/kytos/__init__.py'))
+        self.assertIsNone(napp_id('/usr/lib/kytos/core/controller.py'))
+
+    def test_collapse(self):
+        """Test collapse function."""
+        outer = MagicMock(f_back=None, f_globals={'__name__': 'kytos.core'})
+        outer.f_code.co_filename = '/kytos/core/__init__.py'
+        outer.f_code.co_name = 'main'
+        inner = MagicMock(f_back=outer, f_globals={'__name__': 'napps.x'})
+        inner.f_code.co_filename = '/napps/kytos/of_core/main.py'
+        inner.f_code.co_name = 'execute'
+
+        self.assertEqual(collapse('Thread-1', inner),
+                         'Thread-1;kytos.core:main;kytos/of_core:execute')
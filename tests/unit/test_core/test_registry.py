@@ -0,0 +1,294 @@
+"""Test kytos.core.registry module."""
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from kytos.core.exceptions import KytosMetadataIndexDisabled
+from kytos.core.interface import Interface
+from kytos.core.link import Link
+from kytos.core.registry import ChangeJournal, EntityRegistry, MetadataIndex
+from kytos.core.switch import Switch
+
+
+class TestEntityRegistry(TestCase):
+    """EntityRegistry tests."""
+
+    def setUp(self):
+        """Create two switches linked by their first interfaces."""
+        self.registry = EntityRegistry()
+        self.switch_1 = Switch('00:00:00:00:00:00:00:01')
+        self.switch_2 = Switch('00:00:00:00:00:00:00:02')
+        self.iface_1 = Interface('s1-eth1', 1, self.switch_1,
+                                 address='00:00:00:00:01:01')
+        self.iface_2 = Interface('s2-eth1', 1, self.switch_2,
+                                 address='00:00:00:00:02:01')
+        self.switch_1.update_interface(self.iface_1)
+        self.switch_2.update_interface(self.iface_2)
+        self.registry.add_switch(self.switch_1)
+        self.registry.add_switch(self.switch_2)
+        self.link = Link(self.iface_1, self.iface_2)
+
+    def test_add_switch(self):
+        """Test that the interfaces of an added switch are indexed."""
+        self.assertIs(self.switch_1.registry, self.registry)
+        self.assertIs(self.registry.get_interface(self.iface_1.id),
+                      self.iface_1)
+        self.assertIs(self.registry.get_interface_by_mac('00:00:00:00:01:01'),
+                      self.iface_1)
+
+    def test_snapshot(self):
+        """Test that a snapshot has the switches, interfaces and links."""
+        self.iface_1.update_link(self.link)
+
+        snapshot = self.registry.snapshot
+
+        self.assertEqual(set(snapshot.switches),
+                         {self.switch_1.dpid, self.switch_2.dpid})
+        self.assertIs(snapshot.interfaces[self.switch_1.dpid][1],
+                      self.iface_1)
+        self.assertIs(snapshot.links[self.link.id], self.link)
+        self.assertLessEqual(snapshot.version, self.registry.journal.version)
+        with self.assertRaises(TypeError):
+            snapshot.switches['00:00:00:00:00:00:00:03'] = self.switch_1
+
+    def test_snapshot__unchanged(self):
+        """Test that a snapshot does not change after it is published."""
+        snapshot = self.registry.snapshot
+        iface = Interface('s1-eth2', 2, self.switch_1)
+
+        self.switch_1.update_interface(iface)
+        self.registry.remove_switch(self.switch_2)
+
+        self.assertEqual(list(snapshot.interfaces[self.switch_1.dpid]), [1])
+        self.assertIn(self.switch_2.dpid, snapshot.switches)
+        current = self.registry.snapshot
+        self.assertEqual(list(current.interfaces[self.switch_1.dpid]), [1, 2])
+        self.assertNotIn(self.switch_2.dpid, current.switches)
+        self.assertNotIn(self.switch_2.dpid, current.interfaces)
+        self.assertIs(current.links, snapshot.links)
+
+    def test_update_interface(self):
+        """Test that Switch.update_interface keeps the indexes."""
+        iface = Interface('s1-eth2', 2, self.switch_1)
+        self.switch_1.update_interface(iface)
+
+        self.assertIs(self.registry.get_interface(iface.id), iface)
+
+        self.switch_1.remove_interface(iface)
+
+        self.assertIsNone(self.registry.get_interface(iface.id))
+
+    def test_update_interface__replace(self):
+        """Test replacing an interface with the same port number."""
+        iface = Interface('s1-eth1', 1, self.switch_1,
+                          address='00:00:00:00:01:02')
+        self.switch_1.update_interface(iface)
+
+        self.assertIs(self.registry.get_interface(iface.id), iface)
+        self.assertIsNone(
+            self.registry.get_interface_by_mac('00:00:00:00:01:01'))
+
+    def test_update_address(self):
+        """Test that assigning Interface.address re-indexes the address."""
+        self.iface_1.address = '00:00:00:00:01:02'
+
+        self.assertIsNone(
+            self.registry.get_interface_by_mac('00:00:00:00:01:01'))
+        self.assertIs(self.registry.get_interface_by_mac('00:00:00:00:01:02'),
+                      self.iface_1)
+
+        self.iface_1.address = None
+
+        self.assertEqual(self.registry.macs,
+                         {'00:00:00:00:02:01': self.iface_2})
+
+        iface = Interface('s1-eth2', 2, self.switch_1)
+        iface.address = '00:00:00:00:01:03'
+
+        self.assertIsNone(
+            self.registry.get_interface_by_mac('00:00:00:00:01:03'))
+
+    def test_update_link(self):
+        """Test that Interface.update_link indexes the link."""
+        self.iface_1.update_link(self.link)
+
+        self.assertIs(self.registry.get_link(self.link.id), self.link)
+        self.assertEqual(self.registry.get_links(self.switch_1.dpid),
+                         [self.link])
+        self.assertEqual(self.registry.get_neighbors(self.switch_1.dpid),
+                         {self.switch_2.dpid})
+        self.assertEqual(self.registry.get_neighbors(self.switch_2.dpid),
+                         {self.switch_1.dpid})
+
+    def test_remove_interface__link(self):
+        """Test that removing an interface removes its link."""
+        self.iface_1.update_link(self.link)
+
+        self.switch_1.remove_interface(self.iface_1)
+
+        self.assertIsNone(self.registry.get_link(self.link.id))
+        self.assertEqual(self.registry.get_links(self.switch_2.dpid), [])
+        self.assertEqual(self.registry.get_neighbors(self.switch_2.dpid),
+                         set())
+
+    def test_remove_switch(self):
+        """Test that removing a switch removes its interfaces and links."""
+        self.iface_1.update_link(self.link)
+
+        self.registry.remove_switch(self.switch_1)
+
+        self.assertIsNone(self.switch_1.registry)
+        self.assertIsNone(self.registry.get_interface(self.iface_1.id))
+        self.assertIsNone(self.registry.get_link(self.link.id))
+        self.assertIs(self.registry.get_interface(self.iface_2.id),
+                      self.iface_2)
+
+    def test_journal(self):
+        """Test that entity changes are recorded in the journal."""
+        version = self.registry.journal.version
+
+        self.switch_1.enable()
+        self.iface_1.add_metadata('color', 'red')
+        self.iface_1.update_link(self.link)
+        self.link.disable()
+
+        changes = self.registry.journal.changes_since(version)
+        summary = [(change['entity'], change['id'], change['action'])
+                   for change in changes]
+        self.assertEqual(summary, [
+            ('switch', self.switch_1.id, 'enabled'),
+            ('interface', self.iface_1.id, 'metadata_added'),
+            ('interface', self.iface_1.id, 'link_updated'),
+            ('link', self.link.id, 'disabled')])
+        self.assertEqual(changes[1]['data'], {'keys': ['color']})
+        self.assertEqual(self.switch_1.version, 2)
+
+    def test_find_by_metadata__disabled(self):
+        """Test find_by_metadata without the metadata index."""
+        with self.assertRaises(KytosMetadataIndexDisabled):
+            self.registry.find_by_metadata('color')
+
+    def test_apply_metadata(self):
+        """Test changing the metadata of many entities at once."""
+        self.iface_1.add_metadata('color', 'red')
+        self.iface_2.add_metadata('owner', 'a')
+
+        changed = self.registry.apply_metadata(
+            [self.iface_1, self.iface_2], {'color': 'blue'}, remove=['owner'],
+            force=False)
+
+        self.assertEqual(changed, 1)
+        self.assertEqual(self.iface_1.metadata, {'color': 'red'})
+        self.assertEqual(self.iface_2.metadata, {'color': 'blue'})
+
+
+class TestEntityRegistryMetadataIndex(TestCase):
+    """EntityRegistry tests with the metadata index enabled."""
+
+    def setUp(self):
+        """Create a switch with two interfaces and metadata."""
+        self.registry = EntityRegistry(metadata_index=True)
+        self.switch = Switch('00:00:00:00:00:00:00:01')
+        self.switch.add_metadata('color', 'red')
+        self.iface_1 = Interface('s1-eth1', 1, self.switch)
+        self.iface_2 = Interface('s1-eth2', 2, self.switch)
+        self.switch.update_interface(self.iface_1)
+        self.switch.update_interface(self.iface_2)
+        self.registry.add_switch(self.switch)
+
+    def test_add_switch(self):
+        """Test that existing metadata is indexed."""
+        self.assertEqual(self.registry.find_by_metadata('color', 'red'),
+                         [self.switch])
+
+    def test_metadata_methods(self):
+        """Test that the metadata methods keep the index."""
+        self.iface_1.add_metadata('color', 'red')
+        self.iface_2.extend_metadata({'color': 'blue', 'vlans': [1, 2]})
+        self.switch.update_metadata('color', 'blue')
+
+        self.assertEqual(self.registry.find_by_metadata('color', 'red'),
+                         [self.iface_1])
+        self.assertEqual(self.registry.find_by_metadata('color', 'blue'),
+                         [self.iface_2, self.switch])
+        self.assertEqual(self.registry.find_by_metadata('vlans'),
+                         [self.iface_2])
+
+        self.iface_1.remove_metadata('color')
+        self.iface_2.clear_metadata()
+
+        self.assertEqual(self.registry.find_by_metadata('color'),
+                         [self.switch])
+        self.assertEqual(self.registry.find_by_metadata('vlans'), [])
+
+    def test_remove_switch(self):
+        """Test that the metadata of removed entities is removed."""
+        self.iface_1.add_metadata('color', 'red')
+
+        self.registry.remove_switch(self.switch)
+
+        self.assertEqual(self.registry.find_by_metadata('color'), [])
+
+
+class TestMetadataIndex(TestCase):
+    """MetadataIndex tests."""
+
+    def setUp(self):
+        """Create an index with two entities."""
+        self.index = MetadataIndex()
+        self.entity_1 = MagicMock(id='1')
+        self.entity_2 = MagicMock(id='2')
+        self.index.add(self.entity_1, {'color': 'red', 'tags': ['a']})
+        self.index.add(self.entity_2, {'color': 'blue'})
+
+    def test_find(self):
+        """Test find method."""
+        self.assertEqual(self.index.find('color', 'red'), [self.entity_1])
+        self.assertEqual(self.index.find('color'),
+                         [self.entity_1, self.entity_2])
+        self.assertEqual(self.index.find('tags'), [self.entity_1])
+        self.assertEqual(self.index.find('tags', ['a']), [])
+        self.assertEqual(self.index.values('color'), {'red', 'blue'})
+
+    def test_remove(self):
+        """Test remove method."""
+        self.index.remove(self.entity_1, {'color': 'red', 'tags': ['a']})
+
+        self.assertEqual(self.index.find('color', 'red'), [])
+        self.assertEqual(self.index.values('color'), {'blue'})
+        self.assertEqual(len(self.index), 1)
+
+
+class TestChangeJournal(TestCase):
+    """ChangeJournal tests."""
+
+    def setUp(self):
+        """Create a journal with three changes out of five."""
+        self.journal = ChangeJournal(size=3)
+        self.entity = MagicMock(id='entity')
+        for _ in range(5):
+            self.journal.record(self.entity, 'enabled')
+
+    def test_record(self):
+        """Test record method."""
+        version = self.journal.record(self.entity, 'disabled', {'a': 1})
+
+        self.assertEqual(version, 6)
+        self.assertEqual(len(self.journal), 3)
+        change = self.journal.changes_since(5)[0]
+        self.assertEqual(change['version'], 6)
+        self.assertEqual(change['id'], 'entity')
+        self.assertEqual(change['action'], 'disabled')
+        self.assertEqual(change['data'], {'a': 1})
+
+    def test_changes_since(self):
+        """Test changes_since method with versions still in the journal."""
+        versions = [change['version']
+                    for change in self.journal.changes_since(2)]
+
+        self.assertEqual(versions, [3, 4, 5])
+        self.assertEqual(self.journal.changes_since(5), [])
+
+    def test_changes_since__resync(self):
+        """Test changes_since method with discarded or unknown versions."""
+        self.assertIsNone(self.journal.changes_since(1))
+        self.assertIsNone(self.journal.changes_since(6))
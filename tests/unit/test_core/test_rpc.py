@@ -0,0 +1,89 @@
+"""Test kytos.core.rpc module."""
+import asyncio
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from threading import Timer
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from kytos.core.rpc import acall_event, call_event, request_event
+from tests.helper import StorehouseStandIn
+
+
+class TestRPC(TestCase):
+    """Tests of the event requests."""
+
+    def setUp(self):
+        """Create a stand-in storehouse."""
+        self.storehouse = StorehouseStandIn()
+        self.storehouse.answers['kytos.storehouse.retrieve'] = ('box', None)
+
+    def test_call_event(self):
+        """Test that the answer of the callback is returned."""
+        answer = call_event(self.storehouse, 'kytos.storehouse.retrieve',
+                            {'box_id': 'a'})
+
+        self.assertEqual(answer, ('box', None))
+        event = self.storehouse.events[0]
+        self.assertEqual(event.content['box_id'], 'a')
+        self.assertTrue(callable(event.content['callback']))
+
+    def test_call_event__answered_later(self):
+        """Test waiting for a callback called from another thread."""
+        buffer = MagicMock()
+
+        def answer(event):
+            Timer(0.01, event.content['callback'],
+                  (event, 'box', None)).start()
+        buffer.put.side_effect = answer
+
+        self.assertEqual(call_event(buffer, 'kytos.storehouse.list'),
+                         ('box', None))
+
+    def test_call_event__timeout(self):
+        """Test that unanswered requests time out and are cancelled."""
+        with self.assertRaises(FutureTimeoutError):
+            call_event(self.storehouse, 'kytos.storehouse.list', timeout=0.01)
+
+        event = self.storehouse.events[0]
+        event.content['callback'](event, 'late', None)
+
+    def test_request_event__cancel(self):
+        """Test that cancelled requests ignore the answer."""
+        future = request_event(self.storehouse, 'kytos.storehouse.list')
+
+        self.assertTrue(future.cancel())
+        event = self.storehouse.events[0]
+        event.content['callback'](event, 'boxes', None)
+        self.assertTrue(future.cancelled())
+
+    def test_request_event__answered_twice(self):
+        """Test that only the first answer is used."""
+        future = request_event(self.storehouse, 'kytos.storehouse.retrieve')
+
+        event = self.storehouse.events[0]
+        event.content['callback'](event, 'other', None)
+        self.assertEqual(future.result(0), ('box', None))
+
+    def test_acall_event(self):
+        """Test awaiting the answer of an event."""
+        buffer = MagicMock()
+
+        async def aput(event):
+            loop.call_later(0.01, event.content['on_done'], event, 'box',
+                            True)
+
+        async def ignore(_event):
+            pass
+        buffer.aput = aput
+        loop = asyncio.new_event_loop()
+        try:
+            answer = loop.run_until_complete(
+                acall_event(buffer, 'kytos.storehouse.create',
+                            callback_key='on_done'))
+            with self.assertRaises(asyncio.TimeoutError):
+                loop.run_until_complete(
+                    acall_event(MagicMock(aput=ignore), 'a', timeout=0.01))
+        finally:
+            loop.close()
+
+        self.assertEqual(answer, ('box', True))
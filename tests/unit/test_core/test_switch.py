@@ -1,6 +1,8 @@
 """Test kytos.core.switch module."""
 import asyncio
 import json
+import sys
+import threading
 from datetime import datetime
 from unittest import TestCase
 from unittest.mock import MagicMock, Mock, patch
@@ -117,6 +119,62 @@ class TestSwitch(TestCase):
         self.assertEqual(self.switch.description['serial'], 'serial_num')
         self.assertEqual(self.switch.description['data_path'], 'dp_desc')
 
+    def test_update_interface__concurrent(self):
+        """Test that interfaces updated by concurrent threads are not lost."""
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.addCleanup(sys.setswitchinterval, interval)
+
+        def update_interfaces(thread):
+            for port in range(thread * 100 + 1, thread * 100 + 101):
+                self.switch.update_interface(
+                    Interface(f'eth{port}', port, self.switch))
+            for port in range(thread * 100 + 1, thread * 100 + 51):
+                self.switch.remove_interface(self.switch.interfaces[port])
+
+        threads = [threading.Thread(target=update_interfaces, args=(thread,))
+                   for thread in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.switch.interfaces), 400)
+
+    def test_update_interface__copy_on_write(self):
+        """Test that update_interface does not change the previous dict."""
+        interfaces = self.switch.interfaces
+        interface = Interface('interface', 1, self.switch)
+
+        self.switch.update_interface(interface)
+        self.assertEqual(interfaces, {})
+        self.assertEqual(self.switch.interfaces, {1: interface})
+
+        interfaces = self.switch.interfaces
+        self.switch.remove_interface(interface)
+        self.assertEqual(interfaces, {1: interface})
+        self.assertEqual(self.switch.interfaces, {})
+
+    def test_update_description__cache(self):
+        """Test that update_description updates the cached dict."""
+        self.switch.as_dict()
+        desc = MagicMock()
+        desc.hw_desc.value = 'hw_desc'
+
+        self.switch.update_description(desc)
+
+        self.assertEqual(self.switch.as_dict()['hardware'], 'hw_desc')
+
+    def test_description__cache(self):
+        """Test that assigning the description updates the cached dict."""
+        self.switch.as_dict()
+
+        self.switch.description = {'hardware': 'hw_desc'}
+
+        self.assertEqual(self.switch.as_dict()['hardware'], 'hw_desc')
+        self.assertEqual(json.loads(self.switch.as_json())['hardware'],
+                         'hw_desc')
+
     def test_disable(self):
         """Test disable method."""
         interface = MagicMock()
@@ -133,6 +191,16 @@ class TestSwitch(TestCase):
 
         self.assertIsNone(self.switch.connection)
 
+    def test_disconnect__notify_change(self):
+        """Test that disconnecting is recorded as a change."""
+        version = self.switch.version
+        with patch.object(self.switch, '_notify_change',
+                          wraps=self.switch._notify_change) as mock_notify:
+            self.switch.disconnect()
+
+        mock_notify.assert_called_once_with('disconnected')
+        self.assertEqual(self.switch.version, version + 1)
+
     def test_get_interface_by_port_no(self):
         """Test get_interface_by_port_no method."""
         interface_1 = MagicMock(port_number='1')
@@ -157,6 +225,28 @@ class TestSwitch(TestCase):
         self.assertEqual(expected_flow_1, flow_1)
         self.assertIsNone(expected_flow_2)
 
+    def test_get_flows_by_cookie_and_table(self):
+        """Test get_flows_by_cookie and get_flows_by_table methods."""
+        flow_1 = MagicMock(id='1', cookie=1, table_id=0, priority=10)
+        flow_2 = MagicMock(id='2', cookie=2, table_id=0, priority=20)
+        self.switch.flows = [flow_1, flow_2]
+
+        self.assertEqual(self.switch.get_flows_by_cookie(2), [flow_2])
+        self.assertEqual(self.switch.get_flows_by_table(0), [flow_1, flow_2])
+        self.assertEqual(self.switch.get_flows_by_table(0, 10), [flow_1])
+
+    def test_update_flows(self):
+        """Test update_flows method."""
+        flow_1 = MagicMock(id='1')
+        flow_2 = MagicMock(id='2')
+        self.switch.flows = [flow_1]
+
+        diff = self.switch.update_flows([flow_2])
+
+        self.assertEqual(diff.added, [flow_2])
+        self.assertEqual(diff.removed, [flow_1])
+        self.assertEqual(self.switch.flows, [flow_2])
+
     def test_is_connected__true(self):
         """Test is_connected method."""
         connection = MagicMock()
@@ -195,6 +285,16 @@ class TestSwitch(TestCase):
         self.assertEqual(self.switch.connection, connection)
         self.assertEqual(self.switch.connection.switch, self.switch)
 
+    def test_update_connection__notify_change(self):
+        """Test that reconnecting is recorded as a change."""
+        version = self.switch.version
+        with patch.object(self.switch, '_notify_change',
+                          wraps=self.switch._notify_change) as mock_notify:
+            self.switch.update_connection(MagicMock())
+
+        mock_notify.assert_called_once_with('reconnected')
+        self.assertEqual(self.switch.version, version + 1)
+
     def test_update_features(self):
         """Test update_features method."""
         self.switch.update_features('features')
@@ -230,6 +330,17 @@ class TestSwitch(TestCase):
 
         self.assertEqual(self.switch.interfaces, {})
 
+    def test_remove_interface__mac_table(self):
+        """Test remove_interface method purging the learned macs."""
+        interface = MagicMock(port_number=1)
+        self.switch.interfaces[1] = interface
+        mac = MagicMock(value='00:00:00:00:00:00')
+        self.switch.update_mac_table(mac, 1)
+
+        self.switch.remove_interface(interface)
+
+        self.assertIsNone(self.switch.where_is_mac(mac))
+
     def test_update_mac_table(self):
         """Test update_mac_table method."""
         mac = MagicMock(value='00:00:00:00:00:00')
@@ -238,6 +349,16 @@ class TestSwitch(TestCase):
 
         self.assertEqual(self.switch.mac2port[mac.value], {1, 2})
 
+    def test_mac_table_stats(self):
+        """Test mac_table_stats method."""
+        mac = MagicMock(value='00:00:00:00:00:00')
+        self.switch.update_mac_table(mac, 1)
+
+        stats = self.switch.mac_table_stats()
+
+        self.assertEqual(stats['macs'], 1)
+        self.assertEqual(stats['entries'], 1)
+
     def test_last_flood(self):
         """Test last_flood method."""
         self.switch.flood_table['hash'] = 'timestamp'
@@ -257,24 +378,32 @@ class TestSwitch(TestCase):
 
         self.assertIsNone(last_flood)
 
-    @patch('kytos.core.switch.now', return_value=get_date())
+    @patch('kytos.core.tables.monotonic', return_value=1000.0)
     def test_should_flood(self, _):
         """Test should_flood method."""
-        self.switch.flood_table['hash1'] = datetime(2000, 1, 1, 0, 0, 0, 0)
-        self.switch.flood_table['hash2'] = datetime(2000, 1, 1, 0, 0, 0,
-                                                    FLOOD_TIMEOUT)
+        window = FLOOD_TIMEOUT / 10**6
+        self.switch.flood_table['hash1'] = 1000.0 - window - 0.000001
+        self.switch.flood_table['hash2'] = 1000.0 - window + 0.000001
+        # Whole seconds must be taken into account
+        self.switch.flood_table['hash3'] = 1000.0 - window - 1
 
         ethernet_frame = MagicMock()
-        ethernet_frame.get_hash.side_effect = ['hash1', 'hash2']
+        ethernet_frame.get_hash.side_effect = ['hash1', 'hash2', 'hash3',
+                                               'hash4']
 
         should_flood_1 = self.switch.should_flood(ethernet_frame)
         should_flood_2 = self.switch.should_flood(ethernet_frame)
+        should_flood_3 = self.switch.should_flood(ethernet_frame)
+        should_flood_4 = self.switch.should_flood(ethernet_frame)
 
         self.assertTrue(should_flood_1)
         self.assertFalse(should_flood_2)
+        self.assertTrue(should_flood_3)
+        self.assertTrue(should_flood_4)
+        self.assertEqual(self.switch.flood_table_stats()['suppressed'], 1)
 
-    @patch('kytos.core.switch.now', return_value=get_date())
-    def test_update_flood_table(self, mock_now):
+    @patch('kytos.core.tables.monotonic', return_value=1000.0)
+    def test_update_flood_table(self, mock_monotonic):
         """Test update_flood_table method."""
         ethernet_frame = MagicMock()
         ethernet_frame.get_hash.return_value = 'hash'
@@ -282,7 +411,8 @@ class TestSwitch(TestCase):
         self.switch.update_flood_table(ethernet_frame)
 
         self.assertEqual(self.switch.flood_table['hash'],
-                         mock_now.return_value)
+                         mock_monotonic.return_value)
+        self.assertEqual(self.switch.flood_table_stats()['flooded'], 1)
 
     def test_where_is_mac(self):
         """Test where_is_mac method."""
@@ -315,6 +445,18 @@ class TestSwitch(TestCase):
                          'enabled': True}
         self.assertEqual(self.switch.as_dict(), expected_dict)
 
+    def test_as_dict__fields(self):
+        """Test as_dict method with a projection."""
+        interface = Interface('interface', 1, self.switch)
+        self.switch.update_interface(interface)
+
+        self.assertEqual(self.switch.as_dict('id,active,interfaces.name'),
+                         {'id': '00:00:00:00:00:00:00:01',
+                          'active': True,
+                          'interfaces': {interface.id: {'name': 'interface'}}})
+        self.assertEqual(self.switch.as_dict(list(self.switch.as_dict())),
+                         self.switch.as_dict())
+
     def test_as_json(self):
         """Test as_json method."""
         expected_json = json.dumps({'id': '00:00:00:00:00:00:00:01',
@@ -334,3 +476,12 @@ class TestSwitch(TestCase):
                                     'enabled': True})
 
         self.assertEqual(self.switch.as_json(), expected_json)
+
+    def test_as_json__interfaces(self):
+        """Test as_json method with interfaces."""
+        interface = Interface('interface', 1, self.switch)
+        interface.add_metadata('key', 'value')
+        self.switch.update_interface(interface)
+
+        self.assertEqual(self.switch.as_json(),
+                         json.dumps(self.switch.as_dict()))
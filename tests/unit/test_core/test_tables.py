@@ -0,0 +1,263 @@
+"""Test kytos.core.tables module."""
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from kytos.core.tables import FloodTable, FlowTable, MACTable
+
+
+class TestMACTable(TestCase):
+    """MACTable tests."""
+
+    def setUp(self):
+        """Create a small table."""
+        self.table = MACTable(capacity=2, ttl=10)
+
+    def test_learn(self):
+        """Test learn method with many ports for the same mac."""
+        self.table.learn('mac1', 1)
+        self.table.learn('mac1', 2)
+
+        self.assertEqual(self.table['mac1'], {1, 2})
+        self.assertEqual(sorted(self.table.ports('mac1')), [1, 2])
+        self.assertIn('mac1', self.table)
+        self.assertEqual(len(self.table), 1)
+
+    def test_ports__unknown(self):
+        """Test ports method with an unknown mac."""
+        self.assertIsNone(self.table.ports('mac1'))
+        self.assertNotIn('mac1', self.table)
+
+    def test_setitem(self):
+        """Test replacing the ports of a mac."""
+        self.table.learn('mac1', 1)
+        self.table['mac1'] = {2, 3}
+
+        self.assertEqual(self.table['mac1'], {2, 3})
+        self.assertEqual(self.table.remove_port(1), 0)
+
+    def test_lru_eviction(self):
+        """Test that the least recently learned mac is evicted."""
+        self.table.learn('mac1', 1)
+        self.table.learn('mac2', 1)
+        self.table.learn('mac1', 2)
+        self.table.learn('mac3', 1)
+
+        self.assertEqual(set(self.table), {'mac1', 'mac3'})
+        self.assertEqual(self.table.stats()['evictions'], 1)
+
+    @patch('kytos.core.tables.monotonic')
+    def test_ttl(self, mock_monotonic):
+        """Test that entries are not returned after their ttl."""
+        mock_monotonic.return_value = 100
+        self.table.learn('mac1', 1)
+        mock_monotonic.return_value = 105
+        self.table.learn('mac1', 2)
+
+        mock_monotonic.return_value = 111
+        self.assertEqual(self.table.ports('mac1'), [2])
+
+        mock_monotonic.return_value = 116
+        self.assertIsNone(self.table.ports('mac1'))
+        self.assertEqual(len(self.table), 0)
+        self.assertEqual(self.table.stats()['expirations'], 2)
+
+    @patch('kytos.core.tables.monotonic')
+    def test_expire(self, mock_monotonic):
+        """Test bulk removal of expired entries."""
+        mock_monotonic.return_value = 100
+        self.table.learn('mac1', 1)
+        mock_monotonic.return_value = 105
+        self.table.learn('mac2', 1)
+
+        mock_monotonic.return_value = 111
+        self.assertEqual(self.table.expire(), 1)
+        self.assertEqual(list(self.table), ['mac2'])
+
+    @patch('kytos.core.tables.monotonic')
+    def test_iter__expired(self, mock_monotonic):
+        """Test that expired macs are not iterated or counted."""
+        mock_monotonic.return_value = 100
+        self.table.learn('mac1', 1)
+        mock_monotonic.return_value = 105
+        self.table.learn('mac2', 1)
+
+        mock_monotonic.return_value = 111
+        self.assertEqual(len(self.table), 1)
+        self.assertEqual(dict(self.table.items()), {'mac2': {1}})
+        self.assertEqual(dict(self.table), {'mac2': {1}})
+        with self.assertRaises(KeyError):
+            del self.table['mac1']
+
+    @patch('kytos.core.tables.monotonic')
+    def test_learn__expire_oldest(self, mock_monotonic):
+        """Test that learning a mac drops the expired ones, not live ones."""
+        mock_monotonic.return_value = 100
+        self.table.learn('mac1', 1)
+        mock_monotonic.return_value = 105
+        self.table.learn('mac2', 1)
+
+        mock_monotonic.return_value = 111
+        self.table.learn('mac3', 1)
+
+        self.assertEqual(list(self.table), ['mac2', 'mac3'])
+        self.assertEqual(self.table.stats()['evictions'], 0)
+        self.assertEqual(self.table.stats()['expirations'], 1)
+
+    def test_remove_port(self):
+        """Test removing all the macs learned on a port."""
+        self.table.learn('mac1', 1)
+        self.table.learn('mac1', 2)
+        self.table.learn('mac2', 1)
+
+        self.assertEqual(self.table.remove_port(1), 2)
+        self.assertEqual(self.table['mac1'], {2})
+        self.assertNotIn('mac2', self.table)
+
+    def test_stats(self):
+        """Test stats method."""
+        self.table.learn('mac1', 1)
+        self.table.learn('mac1', 2)
+
+        expected = {'macs': 1, 'entries': 2, 'capacity': 2, 'ttl': 10,
+                    'evictions': 0, 'expirations': 0}
+        self.assertEqual(self.table.stats(), expected)
+
+
+class TestFloodTable(TestCase):
+    """FloodTable tests."""
+
+    @patch('kytos.core.tables.monotonic', return_value=100)
+    def setUp(self, _):
+        """Create a small table."""
+        self.table = FloodTable(window=1, capacity=2)
+
+    @patch('kytos.core.tables.monotonic')
+    def test_should_flood(self, mock_monotonic):
+        """Test should_flood method inside and after the window."""
+        mock_monotonic.return_value = 100
+        self.assertTrue(self.table.should_flood('hash'))
+        self.table.mark_flooded('hash')
+
+        mock_monotonic.return_value = 100.5
+        self.assertFalse(self.table.should_flood('hash'))
+
+        mock_monotonic.return_value = 101.5
+        self.assertTrue(self.table.should_flood('hash'))
+        self.assertEqual(self.table.stats()['suppressed'], 1)
+
+    @patch('kytos.core.tables.monotonic')
+    def test_generations(self, mock_monotonic):
+        """Test that old generations are dropped as time goes by."""
+        mock_monotonic.return_value = 100
+        self.table.mark_flooded('hash1')
+
+        mock_monotonic.return_value = 101
+        self.assertEqual(self.table.last_flood('hash1'), 100)
+        self.table.mark_flooded('hash2')
+
+        mock_monotonic.return_value = 102
+        self.assertIsNone(self.table.last_flood('hash1'))
+        self.assertEqual(self.table.last_flood('hash2'), 101)
+
+        mock_monotonic.return_value = 110
+        self.assertEqual(len(self.table), 0)
+
+    @patch('kytos.core.tables.monotonic', return_value=100)
+    def test_capacity(self, _):
+        """Test that the table size is bounded by twice its capacity."""
+        for i in range(10):
+            self.table.mark_flooded(f'hash{i}')
+
+        self.assertLessEqual(len(self.table), 4)
+        self.assertIsNotNone(self.table.last_flood('hash9'))
+        self.assertIsNone(self.table.last_flood('hash0'))
+
+    @patch('kytos.core.tables.monotonic', return_value=100)
+    def test_delitem(self, _):
+        """Test removing an entry."""
+        self.table['hash'] = 100
+        del self.table['hash']
+
+        self.assertNotIn('hash', self.table)
+        with self.assertRaises(KeyError):
+            del self.table['hash']
+
+
+def get_flow(flow_id, cookie=0, table_id=0, priority=100):
+    """Return a flow mock."""
+    return MagicMock(id=flow_id, cookie=cookie, table_id=table_id,
+                     priority=priority)
+
+
+class TestFlowTable(TestCase):
+    """FlowTable tests."""
+
+    def setUp(self):
+        """Create a table with three flows."""
+        self.flows = [get_flow('1', cookie=10),
+                      get_flow('2', cookie=10, priority=200),
+                      get_flow('3', cookie=20, table_id=1)]
+        self.table = FlowTable(self.flows)
+
+    def test_list_compatibility(self):
+        """Test that the table behaves like the former list of flows."""
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(list(self.table), self.flows)
+        self.assertEqual(self.table, self.flows)
+        self.assertEqual(self.table[0], self.flows[0])
+        self.assertIn(self.flows[1], self.table)
+
+    def test_get(self):
+        """Test get method."""
+        self.assertEqual(self.table.get('2'), self.flows[1])
+        self.assertIsNone(self.table.get('4'))
+
+    def test_get_by_cookie(self):
+        """Test get_by_cookie method."""
+        self.assertEqual(self.table.get_by_cookie(10), self.flows[:2])
+        self.assertEqual(self.table.get_by_cookie(30), [])
+
+    def test_get_by_table(self):
+        """Test get_by_table method with and without priority."""
+        self.assertEqual(self.table.get_by_table(0), self.flows[:2])
+        self.assertEqual(self.table.get_by_table(0, 200), [self.flows[1]])
+        self.assertEqual(self.table.get_by_table(1), [self.flows[2]])
+        self.assertEqual(self.table.get_by_table(2), [])
+
+    def test_add__same_id(self):
+        """Test that adding a flow with an existing id reindexes it."""
+        flow = get_flow('1', cookie=30)
+        self.table.append(flow)
+
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(self.table.get_by_cookie(10), [self.flows[1]])
+        self.assertEqual(self.table.get_by_cookie(30), [flow])
+
+    def test_remove(self):
+        """Test remove method cleaning the secondary indexes."""
+        self.assertEqual(self.table.remove('3'), self.flows[2])
+        self.assertIsNone(self.table.remove('3'))
+
+        self.assertEqual(self.table.get_by_cookie(20), [])
+        self.assertEqual(self.table.get_by_table(1), [])
+
+    def test_diff(self):
+        """Test diff method."""
+        new_flow = get_flow('4')
+        diff = self.table.diff([self.flows[0], new_flow])
+
+        self.assertEqual(diff.added, [new_flow])
+        self.assertEqual(diff.removed, self.flows[1:])
+        self.assertEqual(diff.kept, [self.flows[0]])
+        self.assertEqual(len(self.table), 3)
+
+    def test_replace(self):
+        """Test replace method."""
+        new_flow = get_flow('4', cookie=10)
+        diff = self.table.replace([self.flows[0], new_flow])
+
+        self.assertEqual(diff.added, [new_flow])
+        self.assertEqual(list(self.table), [self.flows[0], new_flow])
+        self.assertEqual(self.table.get_by_cookie(10),
+                         [self.flows[0], new_flow])
+        self.assertEqual(self.table.get_by_cookie(20), [])
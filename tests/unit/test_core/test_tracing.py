@@ -0,0 +1,156 @@
+"""Test kytos.core.tracing module."""
+import json
+import os
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from kytos.core.events import KytosEvent
+from kytos.core.helpers import listen_to
+from kytos.core.tracing import CURRENT_EVENT, TRACER, EventTrace, Tracer, mark
+
+
+class TestTracer(TestCase):
+    """Tracer tests."""
+
+    def setUp(self):
+        """Create an enabled tracer that samples every root event."""
+        self.tracer = Tracer(enabled=True, sample_rate=1, max_traces=3)
+
+    def test_start__disabled(self):
+        """Test that no event is traced when the tracer is disabled."""
+        self.tracer.configure(False)
+
+        self.assertIsNone(self.tracer.start(MagicMock()))
+        self.assertEqual(len(self.tracer), 0)
+
+    @patch('kytos.core.tracing.random.random', return_value=0.5)
+    def test_start__sample_rate(self, _):
+        """Test that root events are sampled."""
+        self.tracer.configure(True, sample_rate=0.4)
+        self.assertIsNone(self.tracer.start(MagicMock()))
+
+        self.tracer.configure(True, sample_rate=0.6)
+        self.assertIsNotNone(self.tracer.start(MagicMock()))
+
+    def test_start__parent(self):
+        """Test that events created while handling an event are linked."""
+        parent = MagicMock(trace=self.tracer.start(MagicMock()))
+
+        token = CURRENT_EVENT.set(parent)
+        try:
+            trace = self.tracer.start(MagicMock())
+            untraced = self.tracer.start(MagicMock(trace=None))
+            CURRENT_EVENT.set(MagicMock(trace=None))
+            orphan = self.tracer.start(MagicMock())
+        finally:
+            CURRENT_EVENT.reset(token)
+
+        self.assertEqual(trace.trace_id, parent.trace.trace_id)
+        self.assertEqual(trace.parent_id, parent.trace.span_id)
+        self.assertIsNotNone(untraced)
+        self.assertIsNone(orphan)
+
+    def test_current_event__thread_local(self):
+        """Test that the current event is not seen by other threads."""
+        seen = []
+        token = CURRENT_EVENT.set('event')
+        try:
+            thread = threading.Thread(
+                target=lambda: seen.append(CURRENT_EVENT.get()))
+            thread.start()
+            thread.join()
+            self.assertEqual(CURRENT_EVENT.get(), 'event')
+        finally:
+            CURRENT_EVENT.reset(token)
+
+        self.assertEqual(seen, [None])
+        self.assertIsNone(CURRENT_EVENT.get())
+
+    def test_max_traces(self):
+        """Test that only the newest traces are kept."""
+        for _ in range(5):
+            self.tracer.start(MagicMock())
+
+        self.assertEqual(len(self.tracer), 3)
+        self.tracer.clear()
+        self.assertEqual(len(self.tracer), 0)
+
+    def test_chrome_trace(self):
+        """Test the Chrome trace format of the traces."""
+        event = MagicMock()
+        event.name = 'kytos/core.test'
+        trace = self.tracer.start(event)
+        trace.mark('put:app')
+        trace.mark('dispatch')
+
+        events = self.tracer.chrome_trace()['traceEvents']
+
+        self.assertEqual([(item['name'], item['ph']) for item in events],
+                         [('created', 'X'), ('put:app', 'X'),
+                          ('dispatch', 'i')])
+        self.assertEqual(events[0]['pid'], trace.trace_id)
+        self.assertEqual(events[0]['cat'], 'kytos/core.test')
+        self.assertAlmostEqual(events[0]['ts'] + events[0]['dur'],
+                               events[1]['ts'], delta=0.001)
+
+    def test_export(self):
+        """Test that the traces are written as JSON."""
+        self.tracer.start(KytosEvent('kytos/core.test'))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            self.tracer.export(path)
+            with open(path) as trace_file:
+                content = json.load(trace_file)
+
+        self.assertEqual(len(content['traceEvents']), 1)
+
+
+class TestEventTracing(TestCase):
+    """Tests of the tracing of KytosEvent."""
+
+    def setUp(self):
+        """Trace every root event."""
+        TRACER.configure(True, sample_rate=1)
+
+    def tearDown(self):
+        """Disable the tracer."""
+        TRACER.configure(False)
+        TRACER.clear()
+
+    def test_event_trace(self):
+        """Test that new events get a trace and marks are recorded."""
+        event = KytosEvent('kytos/core.test')
+        mark(event, 'dispatch')
+
+        self.assertIsInstance(event.trace, EventTrace)
+        self.assertEqual([stage for stage, _ in event.trace.stamps],
+                         ['created', 'dispatch'])
+
+    @staticmethod
+    def test_mark__untraced():
+        """Test that marking an untraced event does nothing."""
+        mark(MagicMock(), 'dispatch')
+        mark(None, 'dispatch')
+
+    @patch('kytos.core.helpers.Thread')
+    def test_listen_to(self, mock_thread):
+        """Test that events created by a listener are linked to its event."""
+        children = []
+
+        @listen_to('kytos/core.test')
+        def handler(_):
+            children.append(KytosEvent('kytos/core.child'))
+
+        event = KytosEvent('kytos/core.test')
+        handler(event)
+        kwargs = mock_thread.call_args[1]
+        kwargs['target'](*kwargs['args'])
+
+        self.assertEqual(children[0].trace.parent_id, event.trace.span_id)
+        self.assertEqual([stage.split(':')[0]
+                          for stage, _ in event.trace.stamps],
+                         ['created', 'listener_start', 'listener_end'])
+        self.assertIsNone(CURRENT_EVENT.get())
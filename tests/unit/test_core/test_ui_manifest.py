@@ -0,0 +1,97 @@
+"""Test kytos.core.ui_manifest module."""
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from kytos.core.ui_manifest import UIManifest
+
+
+class TestUIManifest(TestCase):
+    """UIManifest tests."""
+
+    def setUp(self):
+        """Create a NApps dir with the UI files of two NApps."""
+        self.napps_dir = tempfile.mkdtemp()
+        self._write('kytos/topology/ui/k-toolbar/main.kytos', b'<template/>')
+        self._write('kytos/topology/ui/k-info-panel/switch.kytos', b'<a/>')
+        self._write('kytos/topology/ui/static/logo.svg', b'<svg/>')
+        self._write('amlight/sdx/ui/k-toolbar/main.kytos', b'<b/>')
+        self._write('.installed/kytos/old/ui/k-toolbar/main.kytos', b'<c/>')
+        self.manifest = UIManifest(self.napps_dir)
+        self.manifest.scan()
+
+    def tearDown(self):
+        """Remove the NApps dir."""
+        shutil.rmtree(self.napps_dir)
+
+    def _write(self, filename, data):
+        """Write a file in the NApps dir."""
+        path = os.path.join(self.napps_dir, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(data)
+
+    def test_get_components(self):
+        """Test the components of a section and of all sections."""
+        self.assertEqual(self.manifest.get_components('k-toolbar'), [
+            {'name': 'amlight-sdx-k-toolbar-main',
+             'url': 'ui/amlight/sdx/k-toolbar/main.kytos'},
+            {'name': 'kytos-topology-k-toolbar-main',
+             'url': 'ui/kytos/topology/k-toolbar/main.kytos'}])
+        self.assertEqual(
+            [component['name']
+             for component in self.manifest.get_components('all')],
+            ['amlight-sdx-k-toolbar-main',
+             'kytos-topology-k-info-panel-switch',
+             'kytos-topology-k-toolbar-main'])
+        self.assertEqual(self.manifest.get_components('missing'), [])
+
+    def test_get_file(self):
+        """Test that small files are kept in memory with an ETag."""
+        static = self.manifest.get_file('kytos', 'topology', 'static/logo.svg')
+
+        self.assertEqual(static.data, b'<svg/>')
+        self.assertEqual(static.mimetype, 'image/svg+xml')
+        self.assertTrue(static.etag)
+        self.assertIsNone(self.manifest.get_file('kytos', 'topology', 'x'))
+        self.assertIsNone(self.manifest.get_file('kytos', 'old', 'k-toolbar/'
+                                                 'main.kytos'))
+
+    @patch('kytos.core.ui_manifest.MAX_CACHED_FILE_SIZE', 4)
+    def test_get_file__large(self):
+        """Test that large files are read from disk."""
+        self.manifest.scan()
+
+        static = self.manifest.get_file('kytos', 'topology', 'static/logo.svg')
+
+        self.assertIsNone(static.data)
+        self.assertTrue(static.path.endswith('ui/static/logo.svg'))
+
+    def test_refresh_napp(self):
+        """Test that refreshing a NApp updates only its files."""
+        version = self.manifest.version
+        components = self.manifest.get_components('k-toolbar')
+        self._write('amlight/sdx/ui/k-toolbar/other.kytos', b'<d/>')
+
+        self.assertIs(self.manifest.get_components('k-toolbar'), components)
+        self.manifest.refresh_napp('amlight', 'sdx')
+
+        self.assertEqual(self.manifest.version, version + 1)
+        self.assertEqual(len(self.manifest.get_components('k-toolbar')), 3)
+
+        shutil.rmtree(os.path.join(self.napps_dir, 'amlight'))
+        self.manifest.refresh_napp('amlight', 'sdx')
+        self.manifest.refresh_napp('amlight', 'sdx')
+
+        self.assertEqual(self.manifest.version, version + 2)
+        self.assertIsNone(self.manifest.get_file('amlight', 'sdx',
+                                                 'k-toolbar/main.kytos'))
+
+    def test_scan__without_napps_dir(self):
+        """Test that a manifest without NApps dir is empty."""
+        manifest = UIManifest()
+        manifest.scan()
+
+        self.assertEqual(manifest.get_components('all'), [])
@@ -2,9 +2,14 @@
 import logging
 from copy import copy
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock, patch
 
+from kytos.core.interface import Interface
 from kytos.core.logs import LogManager
+from kytos.core.registry import EntityRegistry
+from kytos.core.switch import Switch
+from kytos.core.websocket import (CHANGES_EVENT, ChangePublisher,
+                                  coalesce_changes)
 
 
 class TestWebSocketLog(TestCase):
@@ -32,3 +37,128 @@ class TestWebSocketLog(TestCase):
 
         # Restore original state
         logging.root.handlers = handlers_bak
+
+
+class TestChangePublisher(TestCase):
+    """Test the push of the topology changes."""
+
+    def setUp(self):
+        """Create a registry with a switch and a publisher."""
+        self.registry = EntityRegistry()
+        self.switch = Switch('00:00:00:00:00:00:00:01')
+        self.interface = Interface('s1-eth1', 1, self.switch)
+        self.switch.update_interface(self.interface)
+        self.registry.add_switch(self.switch)
+        self.socketio = MagicMock()
+        self.publisher = ChangePublisher(self.socketio, self.registry,
+                                         interval=1.0,
+                                         room_intervals={'changes:link': 5})
+
+    def _messages(self):
+        """Return the messages emitted by room."""
+        messages = {}
+        for args, kwargs in self.socketio.emit.call_args_list:
+            self.assertEqual(args[0], CHANGES_EVENT)
+            messages[kwargs['room']] = args[1]
+        self.socketio.emit.reset_mock()
+        return messages
+
+    def test_publish(self):
+        """Test that each room receives the changes of its entities."""
+        version = self.registry.journal.version
+        self.switch.deactivate()
+        self.switch.activate()
+        self.switch.add_metadata('color', 'red')
+        self.interface.disable()
+
+        self.assertEqual(self.publisher.publish(now=10),
+                         ['changes', 'changes:switch', 'changes:interface'])
+        messages = self._messages()
+        switch_message = messages['changes:switch']
+        self.assertEqual(switch_message['since'], version)
+        self.assertFalse(switch_message['resync'])
+        self.assertEqual(switch_message['changes'], [{
+            'entity': 'switch', 'id': self.switch.id,
+            'version': version + 3,
+            'actions': {'deactivated': {}, 'activated': {},
+                        'metadata_added': {'keys': ['color']}},
+            'active': True, 'metadata': {'color': 'red'}}])
+        self.assertEqual(messages['changes:interface']['changes'][0]['id'],
+                         self.interface.id)
+        self.assertEqual(len(messages['changes']['changes']), 2)
+        self.assertEqual(messages['changes']['version'],
+                         self.registry.journal.version)
+
+        self.assertEqual(self.publisher.publish(now=20), [])
+
+    def test_publish__rate_limit(self):
+        """Test that a room receives at most one event per interval."""
+        self.switch.deactivate()
+        self.publisher.publish(now=10)
+        self.switch.activate()
+
+        self.assertEqual(self.publisher.publish(now=10.5), [])
+        self.assertEqual(self.publisher.publish(now=11),
+                         ['changes', 'changes:switch'])
+
+    def test_publish__resync(self):
+        """Test that rooms are told to resync when changes were lost."""
+        self.registry.journal.version += 10
+
+        self.publisher.publish(now=10)
+
+        message = self._messages()['changes']
+        self.assertTrue(message['resync'])
+        self.assertNotIn('changes', message)
+        self.assertEqual(message['version'], self.registry.journal.version)
+
+    @patch('kytos.core.websocket.ChangePublisher.publish')
+    def test_start_stop(self, mock_publish):
+        """Test that the thread publishes until it is stopped."""
+        self.publisher.interval = 0.01
+        self.publisher.start()
+        thread = self.publisher._thread  # pylint: disable=protected-access
+        thread.join(0.1)
+        self.publisher.stop()
+        thread.join(1)
+
+        self.assertFalse(thread.is_alive())
+        mock_publish.assert_called()
+
+
+class TestCoalesceChanges(TestCase):
+    """Test the merging of the changes of each entity."""
+
+    def test_coalesce_changes(self):
+        """Test that repeated actions are merged and states are kept."""
+        changes = [
+            {'version': 1, 'entity': 'switch', 'id': 's1',
+             'action': 'interface_added', 'data': {'interface': 's1:1'}},
+            {'version': 2, 'entity': 'link', 'id': 'l1',
+             'action': 'enabled', 'data': {}},
+            {'version': 3, 'entity': 'switch', 'id': 's1',
+             'action': 'interface_added', 'data': {'interface': 's1:2'}},
+            {'version': 4, 'entity': 'link', 'id': 'l1',
+             'action': 'disabled', 'data': {}},
+        ]
+
+        self.assertEqual(coalesce_changes(changes), [
+            {'entity': 'switch', 'id': 's1', 'version': 3,
+             'actions': {'interface_added': {'interface': ['s1:1', 's1:2']}}},
+            {'entity': 'link', 'id': 'l1', 'version': 4,
+             'actions': {'enabled': {}, 'disabled': {}},
+             'enabled': False}])
+
+    def test_coalesce_changes__connection(self):
+        """Test that the final connection state of a switch is kept."""
+        changes = [
+            {'version': 1, 'entity': 'switch', 'id': 's1',
+             'action': 'disconnected', 'data': {}},
+            {'version': 2, 'entity': 'switch', 'id': 's1',
+             'action': 'reconnected', 'data': {}},
+        ]
+
+        self.assertEqual(coalesce_changes(changes), [
+            {'entity': 'switch', 'id': 's1', 'version': 2,
+             'actions': {'disconnected': {}, 'reconnected': {}},
+             'connected': True}])